@@ -0,0 +1,106 @@
+"""
+Compara insert_many/search_many/delete_many con un bucle de operaciones sueltas.
+
+Para cada tipo de clave (int y str) construye dos tablas con las mismas N
+claves: una con un bucle de insert y otra con insert_many. Después mide
+las búsquedas y los borrados de ambas formas y comprueba que los resultados
+coinciden. Con NumPy instalado, h1/h2 de las claves int se calculan de forma
+vectorizada; sin él, el lote usa Python puro.
+
+Uso:
+    python benchmarks/bench_batch.py [--keys 200000] [--seed 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing import hash_table_double_hashing
+from src.hashing.hash_table_double_hashing import HashTable
+
+
+def timed(func, *args):
+    """
+    Ejecuta func(*args) y devuelve (resultado, segundos).
+    
+    Args:
+        func: Función a medir.
+        *args: Argumentos de la función.
+    
+    Returns:
+        Tupla (resultado, tiempo transcurrido).
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(keys: list) -> dict:
+    """
+    Mide las tres operaciones en bucle y por lotes sobre las mismas claves.
+    
+    Args:
+        keys: Claves únicas a insertar (la mitad de las búsquedas fallan).
+    
+    Returns:
+        Diccionario operación -> (segundos en bucle, segundos por lotes).
+    """
+    items = [(key, i) for i, key in enumerate(keys)]
+    lookups = keys[::2] + [f"missing{i}" if isinstance(keys[0], str) else -1 - i
+                           for i in range(len(keys) // 2)]
+
+    loop_table = HashTable(11)
+    batch_table = HashTable(11)
+
+    def insert_loop():
+        return [loop_table.insert(key, value) for key, value in items]
+
+    def search_loop():
+        return [loop_table.search(key) for key in lookups]
+
+    def delete_loop():
+        return [loop_table.delete(key) for key in keys]
+
+    results = {}
+    for name, loop, batch, arg in (
+        ('insert', insert_loop, batch_table.insert_many, items),
+        ('search', search_loop, batch_table.search_many, lookups),
+        ('delete', delete_loop, batch_table.delete_many, keys),
+    ):
+        expected, loop_time = timed(loop)
+        got, batch_time = timed(batch, arg)
+        if got != expected:
+            raise AssertionError(f"{name}_many no coincide con el bucle de {name}")
+        results[name] = (loop_time, batch_time)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--keys', type=int, default=200_000, help='claves por prueba')
+    parser.add_argument('--seed', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    int_keys = rng.sample(range(10 * args.keys), args.keys)
+    str_keys = [f"user{key}" for key in int_keys]
+
+    numpy_state = "sí" if hash_table_double_hashing._np is not None else "no (Python puro)"
+    print(f"N = {args.keys} claves; NumPy disponible: {numpy_state}\n")
+    print(f"{'Claves':<7} | {'Operación':<9} | {'Bucle (s)':>10} | {'Lote (s)':>10} | {'Aceleración':>11}")
+    print("-" * 60)
+    for label, keys in (('int', int_keys), ('str', str_keys)):
+        for name, (loop_time, batch_time) in run(keys).items():
+            print(f"{label:<7} | {name:<9} | {loop_time:>10.3f} | {batch_time:>10.3f} | "
+                  f"{loop_time / batch_time:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Mide bulk_build frente a la carga con insert, por número de procesos.
+
+Genera N usuarios y construye la tabla de cuatro formas: un insert por
+usuario, insert_many, y bulk_build con 1, 2, 4... procesos (hasta
+os.cpu_count()). Comprueba que cada tabla de bulk_build es idéntica a la
+de insert_many y muestra el tiempo y la aceleración de cada variante.
+
+Con un solo proceso la ganancia viene de colocar las claves sin pasar por
+el camino general de insert; con más, de repartir el hash de las claves.
+La colocación sigue siendo secuencial, así que la aceleración con P
+procesos queda por debajo de P.
+
+Uso:
+    python benchmarks/bench_bulk_build.py [--users 1000000] [--hash siphash] [--workers 1 2 4 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.bulk_build import bulk_build
+from src.hashing.hash_functions import HASH_FUNCTIONS
+from src.hashing.hash_table_double_hashing import HashTable
+
+
+STORE_FIELDS = ('size', 'status', 'cursor', 'back', 'hashes', 'dist', 'keys', 'values',
+                'free_head', 'occupied', 'deleted', 'probe_sum', 'probe_hist')
+
+
+def identical(a: HashTable, b: HashTable) -> bool:
+    """
+    Compara la disposición completa de dos tablas.
+    
+    Args:
+        a: Primera tabla.
+        b: Segunda tabla.
+    
+    Returns:
+        True si todos los arrays y contadores coinciden.
+    """
+    for table in (a, b):
+        if table._old is not None:
+            table._advance_migration(table._old.size)
+    return all(getattr(a._store, field) == getattr(b._store, field) for field in STORE_FIELDS)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--users', type=int, default=1_000_000, help='usuarios a cargar')
+    parser.add_argument('--hash', default='siphash', choices=list(HASH_FUNCTIONS), help='función hash')
+    parser.add_argument('--workers', type=int, nargs='+', help='procesos a probar (por defecto 1, 2, 4... hasta cpu_count)')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    workers = args.workers or [2 ** p for p in range(cpus.bit_length()) if 2 ** p <= cpus]
+    options = {'hash_function': args.hash, 'hash_seed': b'bulk-build-bench'}
+    items = [(f"user{i}", {'password': f"pw{i}"}) for i in range(args.users)]
+    print(f"{args.users} usuarios, hash {args.hash}, {cpus} CPU\n")
+
+    start = time.perf_counter()
+    table = HashTable(**options)
+    for key, value in items:
+        table.insert(key, value)
+    single = time.perf_counter() - start
+    del table
+
+    start = time.perf_counter()
+    reference = HashTable(**options)
+    reference.insert_many(items)
+    batch = time.perf_counter() - start
+
+    print(f"{'Variante':<22} | {'Tiempo (s)':>10} | {'vs insert':>9} | {'Idéntica':>8}")
+    print("-" * 58)
+    print(f"{'insert (uno a uno)':<22} | {single:>10.2f} | {'1.00x':>9} | {'-':>8}")
+    print(f"{'insert_many':<22} | {batch:>10.2f} | {single / batch:>8.2f}x | {'-':>8}")
+    for count in workers:
+        start = time.perf_counter()
+        table = bulk_build(items, workers=count, **options)
+        elapsed = time.perf_counter() - start
+        same = 'sí' if identical(table, reference) else 'NO'
+        del table
+        label = f"bulk_build ({count} proc.)"
+        print(f"{label:<22} | {elapsed:>10.2f} | {single / elapsed:>8.2f}x | {same:>8}")
+
+
+if __name__ == "__main__":
+    main()
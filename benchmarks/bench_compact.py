@@ -0,0 +1,113 @@
+"""
+Muestra cómo los DELETED degradan las búsquedas y cómo compact() lo corrige.
+
+Llena al 50% una tabla de tamaño fijo (sin crecimiento ni compactación
+automática), aplica rondas de churn (borrar claves y registrar otras nuevas,
+como altas y bajas de usuarios) y mide los probes medios de búsquedas
+fallidas y el tiempo de búsqueda antes y después de compactar. También compacta por lotes con
+compact_step() y mide la pausa máxima de un paso.
+
+Uso:
+    python benchmarks/bench_compact.py [--keys 50000] [--rounds 6]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, next_prime
+
+
+def churn(keys: int, rounds: int, seed: int) -> HashTable:
+    """
+    Construye una tabla con muchos DELETED tras varias rondas de altas y bajas.
+    
+    Args:
+        keys: Claves vivas en cada momento.
+        rounds: Rondas en las que se sustituye la mitad de las claves.
+        seed: Semilla del generador.
+    
+    Returns:
+        Tabla resultante.
+    """
+    rng = random.Random(seed)
+    table = HashTable(next_prime(2 * keys), max_load_factor=None, max_tombstone_ratio=None)
+    live = [f"user{i}" for i in range(keys)]
+    table.insert_many((key, None) for key in live)
+    next_id = keys
+    for _ in range(rounds):
+        rng.shuffle(live)
+        half = len(live) // 2
+        fresh = [f"user{next_id + i}" for i in range(half)]
+        next_id += half
+        for old_key, new_key in zip(live[:half], fresh):
+            table.delete(old_key)
+            table.insert(new_key, None)
+        live = live[half:] + fresh
+    return table
+
+
+def measure(table: HashTable, misses: list) -> tuple:
+    """
+    Mide probes medios y µs por búsqueda fallida.
+    
+    Args:
+        table: Tabla a medir.
+        misses: Claves que no están en la tabla.
+    
+    Returns:
+        Tupla (probes medios, µs por búsqueda).
+    """
+    probes = sum(table.probe_count(key) for key in misses) / len(misses)
+    start = time.perf_counter()
+    for key in misses:
+        table.search(key)
+    return probes, (time.perf_counter() - start) / len(misses) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--keys', type=int, default=50_000, help='claves vivas')
+    parser.add_argument('--rounds', type=int, default=6, help='rondas de churn')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    misses = [f"ghost{i}" for i in range(10_000)]
+    table = churn(args.keys, args.rounds, args.seed)
+    stats = table.get_statistics()
+    print(f"Tras el churn: {stats['occupied']} ocupados, {stats['deleted']} DELETED "
+          f"de {stats['total_slots']} slots")
+    probes, micros = measure(table, misses)
+    print(f"  Búsqueda fallida: {probes:.2f} probes, {micros:.2f} µs")
+
+    start = time.perf_counter()
+    reclaimed = table.compact()
+    elapsed = time.perf_counter() - start
+    probes, micros = measure(table, misses)
+    print(f"\ncompact(): {reclaimed} DELETED recuperados en {elapsed * 1e3:.1f} ms")
+    print(f"  Búsqueda fallida: {probes:.2f} probes, {micros:.2f} µs")
+
+    table = churn(args.keys, args.rounds, args.seed)
+    table.compact(incremental=True)
+    steps = 0
+    worst = 0.0
+    while True:
+        start = time.perf_counter()
+        done = table.compact_step(256)
+        worst = max(worst, time.perf_counter() - start)
+        steps += 1
+        if done:
+            break
+    print(f"\ncompact(incremental=True): {steps} pasos de 256 slots, "
+          f"pausa máxima {worst * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compara el rendimiento multihilo de ConcurrentHashTable con un lock global.
+
+Ambas tablas sirven la misma carga (por defecto 95% búsquedas y 5%
+inserts/deletes) desde 1, 2, 4 y 8 hilos. La referencia es una HashTable
+con un único threading.Lock alrededor de cada operación, también de las
+búsquedas; ConcurrentHashTable sólo serializa a los escritores.
+
+Con el GIL de CPython los hilos no ejecutan bytecode en paralelo, así que
+la diferencia viene de no tomar ni esperar el lock en las búsquedas. En un
+intérprete sin GIL (free-threaded) las búsquedas escalan con los núcleos.
+
+Uso:
+    python benchmarks/bench_concurrent.py [--users 100000] [--ops 50000] [--writes 0.05]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Optional, Union
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.concurrent_table import ConcurrentHashTable
+from src.hashing.hash_table_double_hashing import HashTable
+
+
+class GlobalLockTable(HashTable):
+    """HashTable con un único lock para todas las operaciones."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        self._lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        with self._lock:
+            return super().search(key)
+
+    def insert(self, key: Union[int, str], value: Any) -> bool:
+        with self._lock:
+            return super().insert(key, value)
+
+    def delete(self, key: Union[int, str]) -> bool:
+        with self._lock:
+            return super().delete(key)
+
+
+def worker(table: HashTable, seed: int, users: int, ops: int, writes: float,
+           barrier: threading.Barrier) -> None:
+    """
+    Ejecuta ops operaciones mezcladas sobre la tabla.
+    
+    Args:
+        table: Tabla compartida.
+        seed: Semilla del hilo.
+        users: Usuarios precargados (claves de las búsquedas).
+        ops: Operaciones a realizar.
+        writes: Proporción de escrituras.
+        barrier: Barrera para arrancar todos los hilos a la vez.
+    """
+    rng = random.Random(seed)
+    plan = [(rng.random() < writes, rng.randrange(users)) for _ in range(ops)]
+    barrier.wait()
+    for is_write, i in plan:
+        if is_write:
+            key = f"tmp{seed}-{i}"
+            if not table.delete(key):
+                table.insert(key, i)
+        else:
+            table.search(f"user{i}")
+
+
+def throughput(table_cls: type, users: int, threads: int, ops: int, writes: float) -> float:
+    """
+    Mide las operaciones por segundo de una clase de tabla.
+    
+    Args:
+        table_cls: GlobalLockTable o ConcurrentHashTable.
+        users: Usuarios precargados.
+        threads: Número de hilos.
+        ops: Operaciones por hilo.
+        writes: Proporción de escrituras.
+    
+    Returns:
+        Operaciones por segundo sumando todos los hilos.
+    """
+    table = table_cls(11)
+    table.insert_many((f"user{i}", {'password': f"pw{i}"}) for i in range(users))
+    barrier = threading.Barrier(threads + 1)
+    workers = [threading.Thread(target=worker, args=(table, t, users, ops, writes, barrier))
+               for t in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return threads * ops / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--users', type=int, default=100_000, help='usuarios precargados')
+    parser.add_argument('--ops', type=int, default=50_000, help='operaciones por hilo')
+    parser.add_argument('--writes', type=float, default=0.05, help='proporción de escrituras')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8], help='hilos a probar')
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]} ({'con' if gil else 'sin'} GIL), "
+          f"{args.writes:.0%} escrituras")
+    print(f"{'Hilos':>5} | {'Lock global':>12} | {'Concurrent':>12} | {'Mejora':>7}")
+    print("-" * 46)
+    for threads in args.threads:
+        baseline = throughput(GlobalLockTable, args.users, threads, args.ops, args.writes)
+        concurrent = throughput(ConcurrentHashTable, args.users, threads, args.ops, args.writes)
+        print(f"{threads:>5} | {baseline:>12.0f} | {concurrent:>12.0f} | {concurrent / baseline:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
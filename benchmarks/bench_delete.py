@@ -0,0 +1,88 @@
+"""
+Prueba de estrés de delete: borra N claves y comprueba que el coste total es lineal.
+
+Para cada N inserta N claves enteras, las borra todas en orden aleatorio y
+mide el tiempo total de los borrados. Con delete O(1) el tiempo por borrado
+se mantiene constante al crecer N (antes era O(n) por el recorrido completo
+de la tabla para reparar cursores, es decir, O(n²) en total).
+
+Al terminar verifica que la tabla quedó vacía y que la free_list enlaza
+exactamente los slots DELETED.
+
+Uso:
+    python benchmarks/bench_delete.py [--max 1000000] [--steps 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, STATUS_DELETED
+
+
+def run(n: int, seed: int) -> float:
+    """
+    Inserta y luego borra n claves; devuelve los segundos que tardan los borrados.
+    
+    Args:
+        n: Número de claves.
+        seed: Semilla para el orden de borrado.
+    
+    Returns:
+        Tiempo total de los n borrados.
+    """
+    table = HashTable(11)
+    keys = list(range(0, 3 * n, 3))
+    for key in keys:
+        table.insert(key, key)
+
+    random.Random(seed).shuffle(keys)
+    start = time.perf_counter()
+    for key in keys:
+        if not table.delete(key):
+            raise AssertionError(f"No se pudo borrar la clave {key}")
+    elapsed = time.perf_counter() - start
+
+    stats = table.get_statistics()
+    if stats['occupied'] != 0:
+        raise AssertionError(f"Quedaron {stats['occupied']} claves tras borrar todo")
+    free_slots = 0
+    cursor = table.free_list
+    while cursor is not None:
+        if table.table[cursor]['status'] != STATUS_DELETED:
+            raise AssertionError(f"El slot {cursor} de la free_list no está DELETED")
+        free_slots += 1
+        cursor = table.table[cursor]['cursor']
+    if free_slots != stats['deleted']:
+        raise AssertionError(f"free_list con {free_slots} slots, pero hay {stats['deleted']} DELETED")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--max', type=int, default=1_000_000, help='mayor número de claves')
+    parser.add_argument('--steps', type=int, default=4, help='tamaños a medir (dividiendo entre 2)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    sizes = sorted(args.max >> i for i in range(args.steps))
+    print(f"{'N':>10} | {'Total (s)':>10} | {'ns/delete':>10} | {'Total / N anterior':>18}")
+    print("-" * 58)
+    previous = None
+    for n in sizes:
+        elapsed = run(n, args.seed)
+        ratio = f"{elapsed / previous:.2f}x" if previous else "-"
+        print(f"{n:>10} | {elapsed:>10.3f} | {elapsed / n * 1e9:>10.0f} | {ratio:>18}")
+        previous = elapsed
+    print("\nCon coste lineal, duplicar N duplica el tiempo total (≈2.00x).")
+
+
+if __name__ == "__main__":
+    main()
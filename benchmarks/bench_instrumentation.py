@@ -0,0 +1,154 @@
+"""
+Mide el coste de la instrumentación de probes y tiempos de HashTable.
+
+Construye dos tablas iguales y cronometra búsquedas (existentes e
+inexistentes) y actualizaciones en cuatro estados: una tabla en la que
+nunca se activó la instrumentación y la otra activada midiendo todas las
+operaciones, activada con muestreo y desactivada de nuevo. Cada ronda
+mide los cuatro estados, una en orden y la siguiente al revés, y el coste
+de cada estado es la mediana de su cociente con la tabla original en la
+misma ronda: así el ruido de la máquina afecta a todos por igual.
+
+El estado desactivado debe costar lo mismo que el original: la tabla no
+puede conservar ningún método envuelto y la diferencia no puede superar
+--tolerance; si no, el script termina con código 1. Al final muestra el
+histograma de probes de las búsquedas medidas.
+
+Uso:
+    python benchmarks/bench_instrumentation.py [--users 50000] [--load 0.8] [--sample-every 64]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, next_prime
+
+
+def build_table(users: int, load: float, probing: str) -> HashTable:
+    """
+    Crea una tabla con users usuarios sin crecimiento automático.
+    
+    Args:
+        users: Usuarios a insertar.
+        load: Factor de carga resultante.
+        probing: Modo de sondeo.
+    
+    Returns:
+        La tabla llena.
+    """
+    table = HashTable(next_prime(int(users / load)), max_load_factor=None, probing=probing)
+    table.insert_many((f"usuario{i}", i) for i in range(users))
+    return table
+
+
+def time_operations(table: HashTable, keys: list, existing: list) -> tuple:
+    """
+    Cronometra search de keys e insert (actualización) de existing.
+    
+    Args:
+        table: Tabla a medir.
+        keys: Claves a buscar.
+        existing: Claves presentes, que se reescriben con el valor 0.
+    
+    Returns:
+        Tupla (ns por search, ns por insert).
+    """
+    search = table.search
+    start = time.perf_counter()
+    for key in keys:
+        search(key)
+    search_ns = (time.perf_counter() - start) / len(keys) * 1e9
+    insert = table.insert
+    start = time.perf_counter()
+    for key in existing:
+        insert(key, 0)
+    return search_ns, (time.perf_counter() - start) / len(existing) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--users', type=int, default=50_000, help='usuarios en la tabla')
+    parser.add_argument('--load', type=float, default=0.8, help='factor de carga de la tabla')
+    parser.add_argument('--lookups', type=int, default=10_000, help='operaciones por medición')
+    parser.add_argument('--sample-every', type=int, default=64, help='período del modo muestreado')
+    parser.add_argument('--rounds', type=int, default=10, help='rondas de medición')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='sobrecoste máximo admitido con la instrumentación desactivada')
+    parser.add_argument('--probing', default='double', help='double o robin_hood')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pristine = build_table(args.users, args.load, args.probing)
+    table = build_table(args.users, args.load, args.probing)
+    keys = [f"usuario{rng.randrange(args.users)}" if rng.random() < 0.5 else f"usuaro{rng.randrange(10 ** 9)}"
+            for _ in range(args.lookups)]
+    existing = [key for key in keys if key.startswith('usuario')]
+    print(f"{args.users} usuarios en {pristine.size} slots ({args.probing}), "
+          f"{args.lookups} operaciones, {args.rounds} rondas\n")
+
+    states = [
+        ('nunca activada', pristine, lambda: None),
+        ('activada', table, table.enable_instrumentation),
+        (f"1 de cada {args.sample_every}", table,
+         lambda: table.enable_instrumentation(sample_every=args.sample_every)),
+        ('desactivada', table, table.disable_instrumentation),
+    ]
+    timings = {label: [] for label, _, _ in states}
+    for round_index in range(args.rounds):
+        order = states if round_index % 2 == 0 else states[::-1]
+        for label, target, prepare in order:
+            prepare()
+            timings[label].append(time_operations(target, keys, existing))
+
+    base = timings['nunca activada']
+    overheads = {}
+    print(f"{'Instrumentación':<16} | {'search ns':>9} | {'coste':>7} | {'insert ns':>9} | {'coste':>7}")
+    print("-" * 60)
+    for label, measured in timings.items():
+        search_cost = statistics.median(m[0] / b[0] for m, b in zip(measured, base)) - 1
+        insert_cost = statistics.median(m[1] / b[1] for m, b in zip(measured, base)) - 1
+        overheads[label] = max(search_cost, insert_cost)
+        print(f"{label:<16} | {statistics.median(m[0] for m in measured):>9.0f} | {search_cost:>+7.1%} | "
+              f"{statistics.median(m[1] for m in measured):>9.0f} | {insert_cost:>+7.1%}")
+
+    instrumentation = table.enable_instrumentation()
+    for key in keys:
+        table.search(key)
+    table.disable_instrumentation()
+    search = instrumentation.snapshot()['search']
+    print(f"\nProbes por search: media {search['mean_probes']:.2f}, "
+          f"p99 {search['p99_probes']}, máximo {search['max_probes']}")
+    tail = 0
+    for probes, count in search['probe_histogram'].items():
+        if probes > search['p99_probes']:
+            tail += count
+            continue
+        print(f"  {probes:>5} | {count / search['samples']:>6.1%} {'#' * round(40 * count / search['samples'])}")
+    if tail:
+        print(f"  >{search['p99_probes']:<4} | {tail / search['samples']:>6.1%}")
+
+    wrapped = [name for name in ('_insert_hashed', '_search_hashed', '_delete_hashed')
+               if getattr(getattr(table, name), '__func__', None) is not getattr(HashTable, name)]
+    if wrapped:
+        print(f"\nDesactivada conserva métodos envueltos: {', '.join(wrapped)}")
+        sys.exit(1)
+    overhead = overheads['desactivada']
+    if overhead > args.tolerance:
+        print(f"\nDesactivada cuesta {overhead:+.1%} (> {args.tolerance:.0%}): repetir con más --rounds "
+              f"o revisar la ruta sin instrumentar")
+        sys.exit(1)
+    print(f"\nDesactivada: {overhead:+.1%} respecto a nunca activada (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
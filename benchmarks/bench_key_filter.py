@@ -0,0 +1,102 @@
+"""
+Mide el filtro cuckoo en búsquedas de usuarios inexistentes y existentes.
+
+Llena una tabla de nombres de usuario hasta un factor de carga alto sin
+crecer (max_load_factor=None) y borra una parte para dejar DELETED, el
+peor caso para una búsqueda fallida: recorre probes hasta dar con un
+EMPTY. Después busca nombres que no existen (erratas, bots) y nombres
+que sí, con y sin filtro, y muestra el tiempo por búsqueda, la tasa de
+falsos positivos observada y la memoria del filtro.
+
+Uso:
+    python benchmarks/bench_key_filter.py [--users 50000] [--load 0.9] [--fpr 0.001] [--hash fnv1a]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, next_prime
+
+
+def time_searches(table: HashTable, keys: list) -> float:
+    """
+    Busca todas las claves y devuelve los nanosegundos por búsqueda.
+    
+    Args:
+        table: Tabla en la que buscar.
+        keys: Claves a buscar.
+    
+    Returns:
+        Tiempo medio por búsqueda en ns.
+    """
+    search = table.search
+    start = time.perf_counter()
+    for key in keys:
+        search(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--users', type=int, default=50_000, help='usuarios en la tabla')
+    parser.add_argument('--load', type=float, default=0.9,
+                        help='fracción de slots usados (OCCUPIED + DELETED)')
+    parser.add_argument('--deleted', type=float, default=0.2,
+                        help='fracción de los usuarios insertados que se borran')
+    parser.add_argument('--fpr', type=float, default=0.001, help='tasa de falsos positivos objetivo')
+    parser.add_argument('--lookups', type=int, default=100_000, help='búsquedas por medición')
+    parser.add_argument('--hash', default='fnv1a', help='función hash de la tabla')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inserted = int(args.users / (1 - args.deleted))
+    size = next_prime(int(inserted / args.load))
+    table = HashTable(size, max_load_factor=None, max_tombstone_ratio=None, hash_function=args.hash)
+    names = [f"usuario{i}" for i in range(inserted)]
+    table.insert_many((name, i) for i, name in enumerate(names))
+    removed = set(rng.sample(range(inserted), inserted - args.users))
+    table.delete_many(names[i] for i in removed)
+    present = [names[i] for i in range(inserted) if i not in removed]
+
+    missing = [f"usuaro{rng.randrange(10 ** 9)}" for _ in range(args.lookups)]
+    hits = [present[rng.randrange(len(present))] for _ in range(args.lookups)]
+    stats = table.get_statistics()
+    print(f"{args.users} usuarios, {stats['deleted']} DELETED, {stats['total_slots']} slots "
+          f"({(stats['occupied'] + stats['deleted']) / stats['total_slots']:.0%} usados)\n")
+
+    plain_missing = time_searches(table, missing)
+    plain_hits = time_searches(table, hits)
+    start = time.perf_counter()
+    table.enable_filter(args.fpr)
+    build = time.perf_counter() - start
+    filtered_missing = time_searches(table, missing)
+    filtered_hits = time_searches(table, hits)
+
+    print(f"{'Búsqueda':<14} | {'Sin filtro ns':>13} | {'Con filtro ns':>13} | {'Mejora':>7}")
+    print("-" * 56)
+    print(f"{'inexistente':<14} | {plain_missing:>13.0f} | {filtered_missing:>13.0f} | "
+          f"{plain_missing / filtered_missing:>6.2f}x")
+    print(f"{'existente':<14} | {plain_hits:>13.0f} | {filtered_hits:>13.0f} | "
+          f"{plain_hits / filtered_hits:>6.2f}x")
+
+    key_filter = table.get_statistics()['key_filter']
+    print(f"\nFiltro: {key_filter['fingerprint_bits']} bits por huella, "
+          f"{key_filter['memory_bytes'] / 1024:.0f} KiB ({key_filter['bits_per_entry']:.1f} bits por usuario), "
+          f"construido en {build * 1000:.0f} ms")
+    print(f"Falsos positivos: {key_filter['observed_false_positive_rate']:.4%} observados, "
+          f"{key_filter['expected_false_positive_rate']:.4%} esperados, {args.fpr:.4%} objetivo")
+    if not table.get_statistics(full_audit=True)['audit']['consistent']:
+        raise AssertionError("El filtro no coincide con el contenido de la tabla")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compara el arranque y las búsquedas de un snapshot frente a la tabla mapeada.
+
+Construye una HashTable con N usuarios, la guarda con save() y la exporta
+con MappedHashTable.build(). Después mide cuánto tarda cada formato en
+estar listo para buscar (HashTable.load frente a abrir el mmap) y el coste
+por búsqueda de cada uno.
+
+Uso:
+    python benchmarks/bench_mapped.py [--users 1000000] [--dir /tmp]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable
+from src.hashing.mapped_table import MappedHashTable
+
+
+def time_searches(table, keys: list) -> float:
+    """
+    Mide los µs medios por búsqueda.
+    
+    Args:
+        table: HashTable o MappedHashTable.
+        keys: Claves a buscar.
+    
+    Returns:
+        Microsegundos por búsqueda.
+    """
+    start = time.perf_counter()
+    for key in keys:
+        table.search(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--users', type=int, default=1_000_000, help='usuarios en la tabla')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='directorio de los ficheros')
+    args = parser.parse_args()
+
+    snapshot_path = os.path.join(args.dir, 'bench_users.snapshot')
+    mapped_path = os.path.join(args.dir, 'bench_users.mapped')
+
+    print(f"Construyendo una tabla con {args.users} usuarios...")
+    table = HashTable(11, hash_function='siphash')
+    table.insert_many((f"user{i}", {'password': f"pw{i}"}) for i in range(args.users))
+    table.save(snapshot_path)
+    start = time.perf_counter()
+    MappedHashTable.build(table, mapped_path)
+    build_time = time.perf_counter() - start
+    del table
+
+    rng = random.Random(5)
+    lookups = [f"user{rng.randrange(args.users)}" for _ in range(20_000)]
+
+    start = time.perf_counter()
+    loaded = HashTable.load(snapshot_path)
+    load_time = time.perf_counter() - start
+    loaded_us = time_searches(loaded, lookups)
+    del loaded
+
+    start = time.perf_counter()
+    mapped = MappedHashTable(mapped_path)
+    open_time = time.perf_counter() - start
+    mapped_us = time_searches(mapped, lookups)
+    mapped.close()
+
+    print(f"\n{'Formato':<22} | {'Tamaño (MB)':>11} | {'Arranque (s)':>12} | {'µs/búsqueda':>11}")
+    print("-" * 66)
+    print(f"{'snapshot + load()':<22} | {os.path.getsize(snapshot_path) / 1e6:>11.1f} | "
+          f"{load_time:>12.3f} | {loaded_us:>11.2f}")
+    print(f"{'MappedHashTable':<22} | {os.path.getsize(mapped_path) / 1e6:>11.1f} | "
+          f"{open_time:>12.6f} | {mapped_us:>11.2f}")
+    print(f"\nExportar con build(): {build_time:.2f} s")
+
+    os.remove(snapshot_path)
+    os.remove(mapped_path)
+
+
+if __name__ == "__main__":
+    main()
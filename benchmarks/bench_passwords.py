@@ -0,0 +1,72 @@
+"""
+Mide los logins por segundo según el tamaño del pool de PasswordHasher.
+
+Crea los hashes de un grupo de usuarios y verifica un lote de intentos
+de login (90% contraseñas correctas) con verify_many, para un pool de 0
+procesos (verificación en el propio proceso) y de 1, 2, 4... hasta
+os.cpu_count(). PBKDF2 y scrypt son puramente de CPU: con P procesos el
+límite es P veces la velocidad de un núcleo.
+
+Uso:
+    python benchmarks/bench_passwords.py [--logins 200] [--algorithm scrypt] [--work-factor 14] [--workers 0 1 2 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.passwords import DEFAULT_WORK_FACTORS, PBKDF2_SHA256, PasswordHasher
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--logins', type=int, default=200, help='intentos de login por prueba')
+    parser.add_argument('--users', type=int, default=50, help='usuarios distintos')
+    parser.add_argument('--algorithm', default=PBKDF2_SHA256, choices=list(DEFAULT_WORK_FACTORS))
+    parser.add_argument('--work-factor', type=int, help='factor de trabajo (por defecto el del algoritmo)')
+    parser.add_argument('--workers', type=int, nargs='+', help='tamaños de pool (por defecto 0, 1, 2, 4... hasta cpu_count)')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    pools = args.workers or [0] + [2 ** p for p in range(cpus.bit_length()) if 2 ** p <= cpus]
+    work_factor = args.work_factor or DEFAULT_WORK_FACTORS[args.algorithm]
+
+    with PasswordHasher(workers=cpus, algorithm=args.algorithm, work_factor=work_factor) as hasher:
+        passwords = [f"clave-{i}" for i in range(args.users)]
+        records = [future.result() for future in [hasher.submit_hash(pw) for pw in passwords]]
+
+    rng = random.Random(4)
+    attempts = []
+    for _ in range(args.logins):
+        i = rng.randrange(args.users)
+        password = passwords[i] if rng.random() < 0.9 else "incorrecta"
+        attempts.append((password, records[i]))
+    expected = [password == passwords[records.index(record)] for password, record in attempts]
+
+    print(f"{args.algorithm}, factor {work_factor}, {args.logins} logins, {cpus} CPU\n")
+    print(f"{'Procesos':>8} | {'logins/s':>9} | {'ms/login':>8} | {'vs 0':>6}")
+    print("-" * 41)
+    baseline = None
+    for workers in pools:
+        with PasswordHasher(workers=workers, algorithm=args.algorithm, work_factor=work_factor) as hasher:
+            # Arrancar los procesos fuera de la medición
+            hasher.verify_many(attempts[:max(1, workers)])
+            start = time.perf_counter()
+            results = hasher.verify_many(attempts)
+            elapsed = time.perf_counter() - start
+        if results != expected:
+            raise AssertionError("verify_many devolvió resultados incorrectos")
+        rate = args.logins / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} | {rate:>9.1f} | {elapsed / args.logins * 1000:>8.2f} | {rate / baseline:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compara la inserción normal con el modo Robin Hood a distintas cargas.
+
+Para cada factor de carga llena una tabla de tamaño fijo con nombres de
+usuario en ambos modos y mide la distancia de probe de las claves (media,
+varianza, p99 y máximo) y los probes de búsquedas fallidas, que en modo
+Robin Hood se detienen antes.
+
+Uso:
+    python benchmarks/bench_robin_hood.py [--size 100003] [--loads 0.5 0.75 0.9]
+"""
+
+import argparse
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, PROBING_MODES
+
+
+def measure(probing: str, size: int, load: float) -> dict:
+    """
+    Llena una tabla hasta `load` y recoge las métricas de probes.
+    
+    Args:
+        probing: Modo de inserción ('double' o 'robin_hood').
+        size: Tamaño de la tabla (primo).
+        load: Factor de carga a alcanzar.
+    
+    Returns:
+        Diccionario con las métricas.
+    """
+    table = HashTable(size, max_load_factor=min(1.0, load + 0.01),
+                      max_tombstone_ratio=None, probing=probing)
+    keys = [f"user{i}" for i in range(int(size * load))]
+    table.insert_many((key, None) for key in keys)
+
+    analysis = table.analyze_collisions()
+    distances = analysis['probe_distances']
+    p99_rank = 0.99 * (len(keys) - 1)
+    seen = 0
+    p99 = 0
+    for distance, n in distances.items():
+        seen += n
+        if seen > p99_rank:
+            p99 = distance
+            break
+
+    misses = [f"ghost{i}" for i in range(5000)]
+    return {
+        'mean': analysis['mean_probe_distance'],
+        'variance': analysis['probe_distance_variance'],
+        'p99': p99,
+        'max': analysis['max_probe_distance'],
+        'miss_probes': sum(table.probe_count(key) for key in misses) / len(misses),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--size', type=int, default=100_003, help='tamaño de la tabla (primo)')
+    parser.add_argument('--loads', type=float, nargs='+', default=[0.5, 0.75, 0.9])
+    args = parser.parse_args()
+
+    print(f"{'Carga':>6} | {'Modo':<11} | {'Media':>6} | {'Varianza':>8} | {'p99':>4} | "
+          f"{'Máx':>4} | {'Probes fallo':>12}")
+    print("-" * 70)
+    for load in args.loads:
+        for probing in PROBING_MODES:
+            r = measure(probing, args.size, load)
+            print(f"{load:>6.2f} | {probing:<11} | {r['mean']:>6.2f} | {r['variance']:>8.2f} | "
+                  f"{r['p99']:>4} | {r['max']:>4} | {r['miss_probes']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Suite de benchmarks: HashTable en cada configuración frente a dict.
+
+Recorre una matriz de casos (destino × tipo de clave × tamaño × factor de
+carga × proporción de DELETED) y en cada uno mide cinco cargas de trabajo,
+en nanosegundos por operación:
+
+    insert       llenar una tabla vacía hasta carga + DELETED
+    search_hit   buscar claves presentes
+    search_miss  buscar claves ausentes
+    churn        borrar una clave presente e insertar una nueva, en bucle
+    delete       borrar claves presentes
+
+Destinos: 'double' y 'robin_hood' (HashTable), 'filter' (doble hashing
+con filtro de claves ausentes) y 'dict' como referencia. Las HashTable se
+crean con max_load_factor=MAX_OCCUPANCY y sin compactación automática,
+así que la preparación no las redimensiona y la carga es la pedida. Los
+DELETED se obtienen insertando claves de más y borrándolas; en dict dejan
+entradas vacías igual que en la tabla. En churn cada inserción que ocupa
+un EMPTY gasta un slot, y al superar MAX_OCCUPANCY la tabla crece como lo
+haría en uso real.
+
+Cada caso se repite --repeats veces desde cero y se guarda la mediana. Los
+resultados se escriben en JSON junto con el commit, la versión de Python y
+los parámetros, para comparar entre commits con --compare: los casos más
+lentos que la referencia en más de --threshold se marcan y el script
+termina con código 1. --quick reduce la matriz para que tarde menos de un
+minuto.
+
+Uso:
+    python benchmarks/bench_suite.py [--quick] [--output bench_suite.json] [--compare anterior.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable, next_prime
+
+
+TARGETS = ('double', 'robin_hood', 'filter', 'dict')
+KEY_TYPES = ('int', 'str')
+WORKLOADS = ('insert', 'search_hit', 'search_miss', 'churn', 'delete')
+
+# Ocupación máxima (carga + DELETED) de un caso y max_load_factor de las
+# tablas; por encima los probes de una búsqueda fallida se disparan
+MAX_OCCUPANCY = 0.95
+
+# Matrices por defecto: completa y rápida (--quick)
+FULL = {
+    'sizes': [10_007, 100_003],
+    'loads': [0.25, 0.5, 0.75, 0.9],
+    'tombstones': [0.0, 0.2],
+    'ops': 20_000,
+    'repeats': 3,
+}
+QUICK = {
+    'sizes': [4_093, 32_749],
+    'loads': [0.5, 0.75, 0.9],
+    'tombstones': [0.0, 0.2],
+    'ops': 3_000,
+    'repeats': 1,
+}
+
+# Campos que identifican un caso al comparar dos ficheros de resultados
+CASE_FIELDS = ('target', 'key_type', 'size', 'load', 'tombstones', 'workload')
+
+
+# -------------------------
+# Claves y destinos
+# -------------------------
+def make_keys(key_type: str, count: int, rng: random.Random, absent: bool = False) -> list:
+    """
+    Genera claves distintas del tipo pedido.
+    
+    Args:
+        key_type: 'int' (enteros de 40 bits) o 'str' (nombres de usuario).
+        count: Número de claves.
+        rng: Generador aleatorio.
+        absent: Si es True, las claves salen de un rango disjunto del
+                normal (para búsquedas fallidas).
+    
+    Returns:
+        Lista de claves en orden aleatorio.
+    """
+    offset = 1 << 40 if absent else 0
+    numbers = rng.sample(range(offset, offset + (1 << 40)), count)
+    if key_type == 'int':
+        return numbers
+    prefix = 'invitado' if absent else 'usuario'
+    return [f"{prefix}{n}" for n in numbers]
+
+
+def make_target(target: str, size: int) -> Tuple[object, Callable, Callable, Callable]:
+    """
+    Crea un destino vacío y devuelve sus operaciones.
+    
+    Args:
+        target: Uno de TARGETS.
+        size: Número de slots (las HashTable sólo crecen por encima de
+              MAX_OCCUPANCY).
+    
+    Returns:
+        Tupla (estructura, insert(key, value), search(key), delete(key)).
+    """
+    if target == 'dict':
+        table = {}
+        return table, table.__setitem__, table.get, table.__delitem__
+    probing = 'robin_hood' if target == 'robin_hood' else 'double'
+    table = HashTable(size, max_load_factor=MAX_OCCUPANCY, max_tombstone_ratio=None, probing=probing)
+    if target == 'filter':
+        table.enable_filter()
+    return table, table.insert, table.search, table.delete
+
+
+def timed(operation: Callable, keys: list, *extra) -> float:
+    """
+    Aplica operation a cada clave y devuelve los ns por operación.
+    
+    Args:
+        operation: Función de un argumento (o dos, con extra).
+        keys: Claves.
+        *extra: Segundo argumento fijo (el valor de insert).
+    
+    Returns:
+        Nanosegundos por llamada.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    if extra:
+        value = extra[0]
+        for key in keys:
+            operation(key, value)
+    else:
+        for key in keys:
+            operation(key)
+    return (time.perf_counter() - start) / max(1, len(keys)) * 1e9
+
+
+# -------------------------
+# Un caso
+# -------------------------
+def run_case(target: str, key_type: str, size: int, load: float, tombstones: float,
+             ops: int, rng: random.Random) -> Dict[str, float]:
+    """
+    Prepara el estado del caso y mide las cinco cargas de trabajo una vez.
+    
+    Las de búsqueda no modifican la tabla; churn mantiene el número de
+    claves y delete va la última porque lo reduce.
+    
+    Args:
+        target: Destino.
+        key_type: Tipo de clave.
+        size: Slots de la tabla.
+        load: Fracción de slots con clave.
+        tombstones: Fracción de slots DELETED.
+        ops: Operaciones por carga de trabajo (búsquedas y churn).
+        rng: Generador aleatorio.
+    
+    Returns:
+        {carga de trabajo: ns por operación}, más 'avg_probe_length' en
+        las HashTable.
+    """
+    live_count = int(size * load)
+    dead_count = int(size * tombstones)
+    keys = make_keys(key_type, live_count + dead_count + ops, rng)
+    live, dead, fresh = keys[:live_count], keys[live_count:live_count + dead_count], keys[live_count + dead_count:]
+    misses = make_keys(key_type, ops, rng, absent=True)
+    hits = [live[rng.randrange(live_count)] for _ in range(ops)]
+
+    table, insert, search, delete = make_target(target, size)
+    # Vivas y muertas intercaladas: los DELETED quedan repartidos por la tabla
+    fill = live + dead
+    rng.shuffle(fill)
+    result = {'insert': timed(insert, fill, 0)}
+    for key in dead:
+        delete(key)
+    if isinstance(table, HashTable):
+        result['avg_probe_length'] = table.get_statistics()['avg_probe_length']
+
+    result['search_hit'] = timed(search, hits)
+    result['search_miss'] = timed(search, misses)
+
+    victims = [rng.randrange(live_count) for _ in range(ops)]
+    gc.collect()
+    start = time.perf_counter()
+    for index, key in zip(victims, fresh):
+        delete(live[index])
+        insert(key, 0)
+        live[index] = key
+    result['churn'] = (time.perf_counter() - start) / ops * 1e9
+
+    result['delete'] = timed(delete, rng.sample(live, min(ops, live_count // 2)))
+    return result
+
+
+def run_suite(matrix: dict, targets: List[str], key_types: List[str], seed: int,
+              progress: Callable[[str], None]) -> List[dict]:
+    """
+    Ejecuta todos los casos de la matriz.
+    
+    Args:
+        matrix: sizes, loads, tombstones, ops y repeats.
+        targets: Destinos a medir.
+        key_types: Tipos de clave.
+        seed: Semilla; cada caso usa la misma en todos los destinos.
+        progress: Función que recibe una línea de progreso por caso.
+    
+    Returns:
+        Una fila por (caso, carga de trabajo) con la mediana en ns_per_op,
+        min_ns y max_ns de las repeticiones y ratio_vs_dict (si se midió
+        dict).
+    """
+    rows = []
+    for size in matrix['sizes']:
+        size = next_prime(size)
+        for load in matrix['loads']:
+            for tombstones in matrix['tombstones']:
+                if load + tombstones > MAX_OCCUPANCY:
+                    continue
+                for key_type in key_types:
+                    medians = {}
+                    for target in targets:
+                        runs = [run_case(target, key_type, size, load, tombstones, matrix['ops'],
+                                         random.Random(f"{seed}-{size}-{load}-{tombstones}-{key_type}-{repeat}"))
+                                for repeat in range(matrix['repeats'])]
+                        for workload in WORKLOADS:
+                            values = [run[workload] for run in runs]
+                            medians[target, workload] = statistics.median(values)
+                            row = {
+                                'target': target, 'key_type': key_type, 'size': size, 'load': load,
+                                'tombstones': tombstones, 'workload': workload,
+                                'ns_per_op': medians[target, workload],
+                                'min_ns': min(values), 'max_ns': max(values),
+                            }
+                            if 'avg_probe_length' in runs[0]:
+                                row['avg_probe_length'] = runs[0]['avg_probe_length']
+                            rows.append(row)
+                    for row in rows[-len(targets) * len(WORKLOADS):]:
+                        if ('dict', row['workload']) in medians:
+                            row['ratio_vs_dict'] = row['ns_per_op'] / medians['dict', row['workload']]
+                    progress(f"  {size:>7} slots  carga {load:.2f}  DELETED {tombstones:.2f}  {key_type:<3}")
+    return rows
+
+
+# -------------------------
+# Salida
+# -------------------------
+def git_commit() -> Optional[str]:
+    """Commit actual del repositorio, o None si no se puede obtener."""
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=parent_dir,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def print_table(rows: List[dict]) -> None:
+    """
+    Muestra los resultados agrupados por caso, un destino por columna.
+    
+    Args:
+        rows: Filas de run_suite.
+    """
+    targets = list(dict.fromkeys(row['target'] for row in rows))
+    cells = {tuple(row[field] for field in CASE_FIELDS): row['ns_per_op'] for row in rows}
+    cases = list(dict.fromkeys(tuple(row[field] for field in CASE_FIELDS[1:]) for row in rows))
+    header = f"{'Clave':<5} | {'Slots':>7} | {'Carga':>5} | {'DEL':>4} | {'Operación':<11}"
+    print(header + "".join(f" | {target:>10}" for target in targets) + "   (ns/op)")
+    print("-" * (len(header) + 13 * len(targets) + 10))
+    for key_type, size, load, tombstones, workload in cases:
+        line = f"{key_type:<5} | {size:>7} | {load:>5.2f} | {tombstones:>4.2f} | {workload:<11}"
+        for target in targets:
+            value = cells.get((target, key_type, size, load, tombstones, workload))
+            line += f" | {value:>10.0f}" if value is not None else f" | {'-':>10}"
+        print(line)
+
+
+def compare(rows: List[dict], baseline_path: str, threshold: float) -> int:
+    """
+    Compara con un fichero de resultados anterior y lista las regresiones.
+    
+    Args:
+        rows: Filas de esta ejecución.
+        baseline_path: JSON escrito por una ejecución anterior.
+        threshold: Aumento relativo de ns_per_op que cuenta como regresión.
+    
+    Returns:
+        Número de regresiones.
+    """
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+    previous = {tuple(row[field] for field in CASE_FIELDS): row['ns_per_op'] for row in baseline['results']}
+    ratios = []
+    regressions = []
+    for row in rows:
+        old = previous.get(tuple(row[field] for field in CASE_FIELDS))
+        if old is None or row['target'] == 'dict':
+            continue
+        ratio = row['ns_per_op'] / old
+        ratios.append(ratio)
+        if ratio > 1 + threshold:
+            regressions.append((ratio, row))
+
+    commit = baseline['meta'].get('commit') or baseline_path
+    if not ratios:
+        print(f"\nNingún caso en común con {commit}")
+        return 0
+    print(f"\nFrente a {commit}: mediana {statistics.median(ratios):.2f}x en {len(ratios)} casos "
+          f"(dict excluido)")
+    for ratio, row in sorted(regressions, key=lambda item: item[0], reverse=True):
+        print(f"  más lento {ratio:.2f}x: {row['target']} {row['key_type']} {row['size']} slots "
+              f"carga {row['load']} DELETED {row['tombstones']} {row['workload']}")
+    if not regressions:
+        print(f"  sin regresiones por encima de {threshold:.0%}")
+    return len(regressions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--quick', action='store_true', help='matriz reducida (menos de un minuto)')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS))
+    parser.add_argument('--key-types', nargs='+', choices=KEY_TYPES, default=list(KEY_TYPES))
+    parser.add_argument('--sizes', type=int, nargs='+', help='slots (se redondean al primo siguiente)')
+    parser.add_argument('--loads', type=float, nargs='+', help='factores de carga')
+    parser.add_argument('--tombstones', type=float, nargs='+', help='fracciones de slots DELETED')
+    parser.add_argument('--ops', type=int, help='operaciones por carga de trabajo')
+    parser.add_argument('--repeats', type=int, help='repeticiones de cada caso (se toma la mediana)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='bench_suite.json', help='fichero JSON de resultados')
+    parser.add_argument('--compare', metavar='JSON', help='resultados anteriores con los que comparar')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='aumento de ns/op que cuenta como regresión en --compare')
+    args = parser.parse_args()
+
+    matrix = dict(QUICK if args.quick else FULL)
+    for name in ('sizes', 'loads', 'tombstones', 'ops', 'repeats'):
+        if getattr(args, name) is not None:
+            matrix[name] = getattr(args, name)
+
+    print(f"Destinos: {', '.join(args.targets)}; claves: {', '.join(args.key_types)}; "
+          f"{matrix['ops']} operaciones, {matrix['repeats']} repeticiones")
+    start = time.perf_counter()
+    rows = run_suite(matrix, args.targets, args.key_types, args.seed,
+                     lambda line: print(line, file=sys.stderr))
+    elapsed = time.perf_counter() - start
+    print()
+    print_table(rows)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+            'seed': args.seed,
+            'matrix': matrix,
+            'seconds': elapsed,
+        },
+        'results': rows,
+    }
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=1)
+    print(f"\n{len(rows)} resultados en {args.output} ({elapsed:.0f} s)")
+
+    if args.compare and compare(rows, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
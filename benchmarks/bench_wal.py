@@ -0,0 +1,172 @@
+"""
+Mide el coste del write-ahead log y la velocidad de recuperación.
+
+1. Registro: inserta N usuarios con el log adjunto para distintos valores
+   de sync_every (group commit) y mide operaciones por segundo.
+2. Recuperación: escribe un log de N operaciones (80% inserts, 20% deletes)
+   y mide cuántos registros por segundo reaplica HashTable.recover().
+3. Fallos de append: provoca un valor que pickle no serializa y un fsync
+   con disco lleno, y comprueba que la operación fallida no cambia la
+   tabla ni avisa a los listeners, y que search y recover() coinciden.
+
+Uso:
+    python benchmarks/bench_wal.py [--ops 100000] [--dir /tmp]
+"""
+
+import argparse
+import errno
+import os
+import random
+import sys
+import tempfile
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable
+
+
+def remove(*paths: str) -> None:
+    """Borra los ficheros que existan."""
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def logging_rate(ops: int, sync_every: int, wal_path: str) -> float:
+    """
+    Inserta ops usuarios con el log adjunto.
+    
+    Args:
+        ops: Número de inserts.
+        sync_every: Registros por fsync.
+        wal_path: Ruta del log.
+    
+    Returns:
+        Operaciones por segundo.
+    """
+    remove(wal_path)
+    table = HashTable(11)
+    table.attach_wal(wal_path, sync_every=sync_every)
+    start = time.perf_counter()
+    for i in range(ops):
+        table.insert(f"user{i}", i)
+    table.detach_wal()
+    return ops / (time.perf_counter() - start)
+
+
+def failed_append_check(wal_path: str, snapshot_path: str) -> None:
+    """
+    Comprueba que un append fallido deja la tabla y el log como estaban.
+    
+    Args:
+        wal_path: Ruta del log.
+        snapshot_path: Ruta del snapshot (no debe existir).
+    
+    Raises:
+        AssertionError: Si la tabla, los listeners o recover() no coinciden.
+    """
+    remove(wal_path, snapshot_path)
+    table = HashTable(11)
+    table.attach_wal(wal_path)
+    notified = []
+    table.add_listener(lambda op, key, value: notified.append(key))
+    table.insert('a', 1)
+    table.insert('b', 2)
+
+    def disk_full() -> None:
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    # (descripción, operación, error esperado); pickle lanza PicklingError
+    # o AttributeError según dónde esté definida la función
+    failures = [
+        ("insert con valor no serializable", lambda: table.insert('c', lambda: 0), Exception),
+        ("update con valor no serializable", lambda: table.insert('a', lambda: 0), Exception),
+        ("insert con fsync fallido", lambda: table.insert('d', 4), OSError),
+        ("delete con fsync fallido", lambda: table.delete('b'), OSError),
+    ]
+    table.wal._sync = disk_full
+    for name, operation, error in failures:
+        try:
+            operation()
+        except error:
+            continue
+        raise AssertionError(f"{name}: no falló")
+    del table.wal._sync
+
+    expected = {'a': 1, 'b': 2}
+    found = {key: table.search(key) for key in 'abcd'}
+    if {key: value for key, value in found.items() if value is not None} != expected:
+        raise AssertionError(f"La tabla cambió con appends fallidos: {found}")
+    if notified != ['a', 'b']:
+        raise AssertionError(f"Listeners avisados de operaciones fallidas: {notified}")
+    table.insert('e', 5)
+    table.detach_wal()
+
+    expected['e'] = 5
+    recovered = HashTable.recover(snapshot_path, wal_path)
+    found = {key: recovered.search(key) for key in 'abcde'}
+    recovered.detach_wal()
+    if {key: value for key, value in found.items() if value is not None} != expected:
+        raise AssertionError(f"recover() no coincide con la tabla: {found}")
+    print(f"\nFallos de append: {len(failures)} operaciones fallidas sin efecto; "
+          f"search y recover() coinciden")
+    remove(wal_path, snapshot_path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--ops', type=int, default=100_000, help='operaciones por prueba')
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help='directorio de los ficheros')
+    args = parser.parse_args()
+
+    wal_path = os.path.join(args.dir, 'bench.wal')
+    snapshot_path = os.path.join(args.dir, 'bench.snapshot')
+
+    start = time.perf_counter()
+    table = HashTable(11)
+    for i in range(args.ops):
+        table.insert(f"user{i}", i)
+    baseline = args.ops / (time.perf_counter() - start)
+
+    print(f"{'sync_every':>10} | {'ops/s':>10} | {'vs sin log':>10}")
+    print("-" * 37)
+    print(f"{'sin log':>10} | {baseline:>10.0f} | {'1.00x':>10}")
+    for sync_every in (1, 10, 100, 1000):
+        # Con fsync por operación basta una muestra más pequeña
+        ops = args.ops if sync_every > 1 else min(args.ops, 2000)
+        rate = logging_rate(ops, sync_every, wal_path)
+        print(f"{sync_every:>10} | {rate:>10.0f} | {rate / baseline:>9.2f}x")
+
+    remove(wal_path, snapshot_path)
+    rng = random.Random(9)
+    table = HashTable(11)
+    table.attach_wal(wal_path, sync_every=1000)
+    live = []
+    for i in range(args.ops):
+        if live and rng.random() < 0.2:
+            table.delete(live.pop(rng.randrange(len(live))))
+        else:
+            key = f"user{i}"
+            table.insert(key, {'password': f"pw{i}"})
+            live.append(key)
+    table.detach_wal()
+
+    start = time.perf_counter()
+    recovered = HashTable.recover(snapshot_path, wal_path)
+    elapsed = time.perf_counter() - start
+    if recovered.get_statistics()['occupied'] != len(live):
+        raise AssertionError("La tabla recuperada no coincide con la original")
+    recovered.detach_wal()
+    print(f"\nRecuperación: {args.ops} registros en {elapsed:.2f} s "
+          f"({args.ops / elapsed:.0f} registros/s, log de {os.path.getsize(wal_path) / 1e6:.1f} MB)")
+    remove(wal_path, snapshot_path)
+
+    failed_append_check(wal_path, snapshot_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Generador de carga para el servidor de autenticación (src/auth_server.py).
+
+Abre varias conexiones y, en cada una, mantiene varias peticiones en
+curso a la vez (pipelining). Primero registra los usuarios y después
+lanza una mezcla de logins (90% con la contraseña correcta) y peticiones
+de estadísticas. Mide la latencia de cada petición y muestra el
+rendimiento y los percentiles p50/p90/p99/p99.9.
+
+Sin --connect arranca un servidor en este mismo proceso (puerto libre de
+127.0.0.1, tabla en memoria sin ficheros) con un factor de trabajo bajo
+para que la prueba sea rápida; con --connect ataca un servidor ya en marcha.
+
+Uso:
+    python benchmarks/load_auth_server.py [--connections 8] [--pipeline 16] [--requests 5000]
+    python benchmarks/load_auth_server.py --connect 127.0.0.1:8765
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import List, Optional
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.auth_server import AuthClient, AuthServer
+from src.hashing.hash_table_double_hashing import HashTable
+from src.login import make_auth_cache
+from src.passwords import PasswordHasher
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Percentil por el método del rango más cercano.
+    
+    Args:
+        sorted_values: Valores ordenados.
+        fraction: Percentil en [0, 1].
+    
+    Returns:
+        El valor del percentil.
+    """
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def run_phase(clients: List[AuthClient], pipeline: int, requests: list) -> List[float]:
+    """
+    Envía todas las peticiones repartidas entre conexiones y en pipeline.
+    
+    Args:
+        clients: Conexiones abiertas.
+        pipeline: Peticiones en curso por conexión.
+        requests: Tuplas (op, campos, ok esperado o None).
+    
+    Returns:
+        Latencia de cada petición en segundos.
+    """
+    queue = iter(requests)
+    latencies: List[float] = []
+    failures = []
+
+    async def worker(client: AuthClient) -> None:
+        for op, fields, expected in queue:
+            start = time.perf_counter()
+            response = await client.request(op, **fields)
+            latencies.append(time.perf_counter() - start)
+            if expected is not None and response.get('ok') != expected:
+                failures.append((op, fields.get('username'), response))
+
+    await asyncio.gather(*(worker(client) for client in clients for _ in range(pipeline)))
+    if failures:
+        raise AssertionError(f"{len(failures)} respuestas inesperadas, p. ej. {failures[0]}")
+    return latencies
+
+
+def report(name: str, latencies: List[float], elapsed: float) -> None:
+    """Imprime rendimiento y percentiles de una fase."""
+    values = sorted(latencies)
+    cells = " | ".join(f"{percentile(values, p) * 1000:>7.2f}" for p in (0.5, 0.9, 0.99, 0.999))
+    print(f"{name:<10} | {len(values):>7} | {len(values) / elapsed:>8.0f} | {cells} | {values[-1] * 1000:>7.2f}")
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    server: Optional[AuthServer] = None
+    hasher: Optional[PasswordHasher] = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        port = int(port)
+    else:
+        hasher = PasswordHasher(workers=args.workers, work_factor=args.work_factor)
+        table = HashTable(11, hash_function='siphash')
+        server = AuthServer(table, hasher, cache=make_auth_cache(table, args.cache))
+        listener = await server.start('127.0.0.1', 0)
+        host, port = listener.sockets[0].getsockname()[:2]
+
+    clients = [await AuthClient().connect(host, port) for _ in range(args.connections)]
+    rng = random.Random(6)
+    prefix = f"carga{rng.randrange(10 ** 9)}-"
+    users = [(f"{prefix}{i}", f"clave-{i}") for i in range(args.users)]
+    registrations = [('register', {'username': u, 'password': p}, True) for u, p in users]
+    mix = []
+    for _ in range(args.requests):
+        if rng.random() < 0.1:
+            mix.append(('stats', {}, True))
+        else:
+            username, password = users[rng.randrange(len(users))]
+            correct = rng.random() < 0.9
+            mix.append(('authenticate', {'username': username,
+                                         'password': password if correct else 'incorrecta'}, correct))
+
+    print(f"{args.connections} conexiones × {args.pipeline} en curso, servidor {host}:{port}\n")
+    print(f"{'Fase':<10} | {'Pet.':>7} | {'pet./s':>8} | {'p50 ms':>7} | {'p90 ms':>7} | "
+          f"{'p99 ms':>7} | {'p99.9 ms':>7} | {'máx ms':>7}")
+    print("-" * 86)
+    for name, requests in (('register', registrations), ('mezcla', mix)):
+        start = time.perf_counter()
+        latencies = await run_phase(clients, args.pipeline, requests)
+        report(name, latencies, time.perf_counter() - start)
+    if server is not None and server.cache is not None:
+        cache = server.cache.get_statistics()
+        print(f"\nCaché: {cache['hits']} aciertos, {cache['misses']} fallos ({cache['hit_rate']:.1%})")
+
+    for username, password in users:
+        await clients[0].request('delete', username=username, password=password)
+    for client in clients:
+        await client.close()
+    if server is not None:
+        await server.close()
+        hasher.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--connect', help='host:puerto de un servidor en marcha')
+    parser.add_argument('--connections', type=int, default=8, help='conexiones simultáneas')
+    parser.add_argument('--pipeline', type=int, default=16, help='peticiones en curso por conexión')
+    parser.add_argument('--users', type=int, default=500, help='usuarios a registrar')
+    parser.add_argument('--requests', type=int, default=5000, help='peticiones de la fase mezcla')
+    parser.add_argument('--workers', type=int, help='procesos del servidor local (por defecto cpu_count)')
+    parser.add_argument('--work-factor', type=int, default=1000,
+                        help='iteraciones PBKDF2 del servidor local')
+    parser.add_argument('--cache', type=int, default=0,
+                        help='entradas de la caché de autenticaciones del servidor local (0 = sin caché)')
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Prueba de estrés multihilo de ConcurrentHashTable.
+
+Varios hilos escritores insertan, actualizan y borran claves de rangos
+disjuntos (cada uno sabe qué debe haber en el suyo) mientras varios
+lectores buscan sin parar:
+
+- claves estables, insertadas antes de empezar y nunca borradas, cuyo
+  valor debe encontrarse siempre;
+- claves de los escritores, cuyo valor, si aparece, debe ser uno que el
+  escritor llegó a escribir para esa clave.
+
+La tabla empieza pequeña y con umbral de tombstones bajo, así que durante
+la prueba hay redimensionamientos y compactaciones incrementales. Al
+terminar se compara el contenido con lo esperado y se ejecuta la
+auditoría completa de contadores.
+
+Uso:
+    python benchmarks/stress_concurrent.py [--writers 4] [--readers 4] [--seconds 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.concurrent_table import ConcurrentHashTable
+from src.hashing.hash_table_double_hashing import PROBING_MODES
+
+
+STABLE_KEYS = 2000
+WRITER_KEYS = 3000
+
+
+def writer(table: ConcurrentHashTable, wid: int, deadline: float, expected: dict,
+           errors: list) -> None:
+    """
+    Inserta, actualiza y borra claves propias, anotando el estado esperado.
+    
+    Args:
+        table: Tabla compartida.
+        wid: Identificador del escritor (define su rango de claves).
+        deadline: Instante (time.monotonic) en que parar.
+        expected: Diccionario clave -> valor que debe quedar en la tabla.
+        errors: Lista compartida donde anotar fallos.
+    """
+    rng = random.Random(wid)
+    version = 0
+    while time.monotonic() < deadline:
+        key = f"w{wid}-{rng.randrange(WRITER_KEYS)}"
+        if rng.random() < 0.6:
+            version += 1
+            value = (key, version)
+            if not table.insert(key, value):
+                errors.append(f"insert({key!r}) devolvió False")
+            expected[key] = value
+        else:
+            deleted = table.delete(key)
+            if deleted != (key in expected):
+                errors.append(f"delete({key!r}) devolvió {deleted}")
+            expected.pop(key, None)
+
+
+def reader(table: ConcurrentHashTable, rid: int, writers: int, deadline: float,
+           counter: list, errors: list) -> None:
+    """
+    Busca claves estables y de escritores comprobando los valores.
+    
+    Args:
+        table: Tabla compartida.
+        rid: Identificador del lector (semilla).
+        writers: Número de escritores.
+        deadline: Instante en que parar.
+        counter: Lista de un elemento donde sumar las búsquedas hechas.
+        errors: Lista compartida donde anotar fallos.
+    """
+    rng = random.Random(1000 + rid)
+    reads = 0
+    while time.monotonic() < deadline:
+        i = rng.randrange(STABLE_KEYS)
+        value = table.search(f"stable{i}")
+        if value != i:
+            errors.append(f"search('stable{i}') devolvió {value!r}")
+        key = f"w{rng.randrange(writers)}-{rng.randrange(WRITER_KEYS)}"
+        value = table.search(key)
+        if value is not None and (value[0] != key or value[1] < 1):
+            errors.append(f"search({key!r}) devolvió {value!r}")
+        reads += 2
+    counter[0] += reads
+
+
+def run(probing: str, writers: int, readers: int, seconds: float) -> bool:
+    """
+    Ejecuta una ronda de la prueba en un modo de probing.
+    
+    Args:
+        probing: 'double' o 'robin_hood'.
+        writers: Hilos escritores.
+        readers: Hilos lectores.
+        seconds: Duración de la ronda.
+    
+    Returns:
+        True si no hubo ningún fallo.
+    """
+    table = ConcurrentHashTable(11, max_tombstone_ratio=0.1, migration_batch=2, probing=probing)
+    for i in range(STABLE_KEYS):
+        table.insert(f"stable{i}", i)
+
+    deadline = time.monotonic() + seconds
+    errors: list = []
+    expected = [{} for _ in range(writers)]
+    reads = [0]
+    threads = [threading.Thread(target=writer, args=(table, w, deadline, expected[w], errors))
+               for w in range(writers)]
+    threads += [threading.Thread(target=reader, args=(table, r, writers, deadline, reads, errors))
+                for r in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    final = {f"stable{i}": i for i in range(STABLE_KEYS)}
+    for state in expected:
+        final.update(state)
+    stats = table.get_statistics(full_audit=True)
+    if stats['occupied'] != len(final):
+        errors.append(f"occupied={stats['occupied']}, se esperaban {len(final)}")
+    if not stats['audit']['consistent']:
+        errors.append(f"auditoría inconsistente: {stats['audit']['mismatches']}")
+    for key, value in final.items():
+        if table.search(key) != value:
+            errors.append(f"valor final de {key!r} incorrecto")
+            break
+
+    print(f"{probing:<11} | {reads[0]:>9} búsquedas | {stats['total_slots']:>6} slots | "
+          f"{'OK' if not errors else f'{len(errors)} FALLOS'}")
+    for error in errors[:10]:
+        print(f"    {error}")
+    return not errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--writers', type=int, default=4, help='hilos escritores')
+    parser.add_argument('--readers', type=int, default=4, help='hilos lectores')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duración de cada ronda')
+    args = parser.parse_args()
+
+    # Cambios de hilo mucho más frecuentes para provocar entrelazados
+    sys.setswitchinterval(1e-5)
+    ok = all([run(probing, args.writers, args.readers, args.seconds) for probing in PROBING_MODES])
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
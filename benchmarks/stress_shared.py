@@ -0,0 +1,154 @@
+"""
+Prueba de estrés multiproceso de SharedHashTable.
+
+El proceso principal crea la tabla compartida con usuarios estables y,
+mientras varios procesos lectores buscan sin parar, inserta, actualiza y
+borra usuarios volátiles. La tabla empieza pequeña, con poco heap y umbral
+de tombstones bajo, así que durante la prueba el escritor reconstruye y
+publica generaciones nuevas. Los lectores comprueban que:
+
+- los usuarios estables, nunca borrados, se encuentran siempre con su valor;
+- un usuario volátil, si aparece, tiene un valor que el escritor llegó a
+  escribir para él.
+
+Al terminar se compara el contenido con lo esperado y se muestran las
+búsquedas por segundo de cada lector, la memoria compartida y la que
+ocuparía una HashTable por proceso.
+
+Uso:
+    python benchmarks/stress_shared.py [--readers 4] [--seconds 5] [--start fork]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable
+from src.hashing.shared_table import SharedHashTable
+
+
+STABLE_KEYS = 20_000
+VOLATILE_KEYS = 5_000
+
+
+def reader(table: SharedHashTable, rid: int, seconds: float, results: multiprocessing.Queue) -> None:
+    """
+    Busca usuarios estables y volátiles comprobando los valores.
+    
+    Args:
+        table: Tabla compartida (se adjunta como lector al recibirla).
+        rid: Identificador del lector (semilla).
+        seconds: Duración de la prueba.
+        results: Cola donde dejar (búsquedas, segundos, errores, generaciones vistas).
+    """
+    rng = random.Random(1000 + rid)
+    errors = []
+    reads = 0
+    generations = set()
+    start = time.monotonic()
+    deadline = start + seconds
+    while time.monotonic() < deadline:
+        i = rng.randrange(STABLE_KEYS)
+        value = table.search(f"stable{i}")
+        if value != i:
+            errors.append(f"search('stable{i}') devolvió {value!r}")
+        key = f"volatile{rng.randrange(VOLATILE_KEYS)}"
+        value = table.search(key)
+        if value is not None and (value[0] != key or value[1] < 1):
+            errors.append(f"search({key!r}) devolvió {value!r}")
+        reads += 2
+        if reads % 1024 == 0:
+            generations.add(table.get_statistics()['generation'])
+    results.put((reads, time.monotonic() - start, errors[:10], len(generations)))
+    table.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--readers', type=int, default=4, help='procesos lectores')
+    parser.add_argument('--seconds', type=float, default=5.0, help='duración de la prueba')
+    parser.add_argument('--start', default='fork', choices=multiprocessing.get_all_start_methods(),
+                        help='método de arranque de los procesos')
+    args = parser.parse_args()
+
+    table = SharedHashTable.create(size=1009, heap_bytes=64 * 1024, max_tombstone_ratio=0.05)
+    try:
+        for i in range(STABLE_KEYS):
+            table.insert(f"stable{i}", i)
+        initial = table.get_statistics()
+
+        context = multiprocessing.get_context(args.start)
+        results = context.Queue()
+        processes = [context.Process(target=reader, args=(table, r, args.seconds, results))
+                     for r in range(args.readers)]
+        for process in processes:
+            process.start()
+
+        rng = random.Random(0)
+        expected = {}
+        errors = []
+        version = 0
+        deadline = time.monotonic() + args.seconds
+        while time.monotonic() < deadline:
+            key = f"volatile{rng.randrange(VOLATILE_KEYS)}"
+            if rng.random() < 0.6:
+                version += 1
+                if not table.insert(key, (key, version)):
+                    errors.append(f"insert({key!r}) devolvió False")
+                expected[key] = (key, version)
+            else:
+                if table.delete(key) != (key in expected):
+                    errors.append(f"delete({key!r}) no coincide con lo esperado")
+                expected.pop(key, None)
+
+        reports = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+            if process.exitcode:
+                errors.append(f"un lector terminó con código {process.exitcode}")
+
+        final = {f"stable{i}": i for i in range(STABLE_KEYS)}
+        final.update(expected)
+        stats = table.get_statistics()
+        if stats['occupied'] != len(final):
+            errors.append(f"occupied={stats['occupied']}, se esperaban {len(final)}")
+        for key, value in final.items():
+            if table.search(key) != value:
+                errors.append(f"valor final de {key!r} incorrecto")
+                break
+
+        print(f"{args.readers} lectores ({args.start}), escritor con {version} inserts, "
+              f"{stats['generation'] - initial['generation']} generaciones publicadas\n")
+        print(f"{'Lector':>6} | {'búsquedas/s':>11} | {'generaciones vistas':>19}")
+        print("-" * 44)
+        for rid, (reads, elapsed, reader_errors, seen) in enumerate(reports):
+            errors.extend(reader_errors)
+            print(f"{rid:>6} | {reads / elapsed:>11,.0f} | {seen:>19}")
+        total = sum(reads / elapsed for reads, elapsed, _, _ in reports)
+        print(f"{'total':>6} | {total:>11,.0f} |")
+
+        copy = HashTable(11)
+        copy.insert_many(final.items())
+        per_process = copy.get_statistics()['memory_bytes']
+        print(f"\nMemoria compartida: {stats['shared_bytes'] / 1024:,.0f} KiB para todos los procesos "
+              f"({stats['total_slots']} slots, heap {stats['heap_used'] / 1024:,.0f} KiB)")
+        print(f"Una HashTable por proceso: {per_process / 1024:,.0f} KiB x {args.readers + 1} procesos")
+    finally:
+        table.unlink()
+
+    print(f"\n{'OK' if not errors else f'{len(errors)} FALLOS'}")
+    for error in errors[:10]:
+        print(f"    {error}")
+    sys.exit(0 if not errors else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Caché de autenticaciones correctas con expulsión LRU y caducidad (TTL).
+
+Verificar una contraseña cuesta cientos de milisegundos a propósito (ver
+passwords.py). Cuando las mismas cuentas se autentican una y otra vez,
+AuthCache recuerda durante ttl segundos que (usuario, contraseña) fue
+correcto y la siguiente comprobación no toca la tabla ni el pool.
+
+Qué se guarda: por usuario, un HMAC-SHA256 de la contraseña con una clave
+aleatoria que sólo vive en la memoria del proceso, y el instante de
+caducidad. Nunca la contraseña ni su hash lento. Sólo se cachean
+verificaciones correctas: una contraseña incorrecta se verifica siempre
+con la función lenta, así que la caché no abarata los ataques por fuerza
+bruta.
+
+Límites: max_entries entradas y max_bytes de memoria estimada. Al
+superarse se expulsa la entrada usada hace más tiempo (LRU). Las entradas
+caducadas se descartan al consultarlas.
+
+Coherencia: attach(tabla) registra un listener en la tabla (ver
+HashTable.add_listener). Cualquier insert o delete de un usuario, como un
+cambio de contraseña, un borrado o la actualización del hash, invalida
+su entrada.
+
+No es segura para varios hilos: está pensada para el menú, el modo batch
+y el bucle de eventos de auth_server.py.
+"""
+
+import hashlib
+import hmac
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Tuple, Union
+
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+DEFAULT_TTL = 300.0
+
+# Memoria aproximada de una entrada sin contar el nombre: nodo del
+# OrderedDict, tupla (digest, caducidad), digest de 32 bytes y float
+_ENTRY_OVERHEAD = 240
+
+
+class AuthCache:
+    """
+    Caché LRU/TTL de pares (usuario, contraseña) verificados.
+    
+    Args:
+        max_entries: Número máximo de entradas (>= 1).
+        max_bytes: Memoria estimada máxima en bytes (>= 1).
+        ttl: Segundos que una verificación sigue siendo válida (> 0).
+        clock: Reloj monotónico en segundos (para pruebas).
+    
+    Raises:
+        ValueError: Si algún límite no es positivo.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL, clock: Callable[[], float] = time.monotonic):
+        """
+        Crea una caché vacía con una clave HMAC nueva.
+        
+        Args:
+            max_entries: Número máximo de entradas.
+            max_bytes: Memoria estimada máxima.
+            ttl: Validez de cada verificación en segundos.
+            clock: Reloj monotónico.
+        
+        Raises:
+            ValueError: Si algún límite no es positivo.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries debe ser mayor a 0. Recibido: {max_entries}")
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes debe ser mayor a 0. Recibido: {max_bytes}")
+        if ttl <= 0:
+            raise ValueError(f"ttl debe ser mayor a 0. Recibido: {ttl}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._key = os.urandom(32)
+        # usuario -> (digest, caducidad); el orden es el de uso (LRU al principio)
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _digest(self, password: str) -> bytes:
+        """HMAC-SHA256 de la contraseña con la clave del proceso."""
+        return hmac.new(self._key, password.encode('utf-8'), hashlib.sha256).digest()
+
+    @staticmethod
+    def _entry_size(username: str) -> int:
+        """Memoria estimada de la entrada de username."""
+        return sys.getsizeof(username) + _ENTRY_OVERHEAD
+
+    # -------------------------
+    # Consulta y alta
+    # -------------------------
+    def check(self, username: str, password: str) -> bool:
+        """
+        Indica si (username, password) se verificó hace menos de ttl segundos.
+        
+        Un acierto mueve la entrada al final de la cola LRU.
+        
+        Args:
+            username: Nombre de usuario.
+            password: Contraseña en claro.
+        
+        Returns:
+            True si hay una entrada vigente con esa contraseña.
+        """
+        entry = self._entries.get(username)
+        if entry is None:
+            self.misses += 1
+            return False
+        digest, expires = entry
+        if self._clock() >= expires:
+            self._discard(username)
+            self.expirations += 1
+            self.misses += 1
+            return False
+        if not hmac.compare_digest(digest, self._digest(password)):
+            self.misses += 1
+            return False
+        self._entries.move_to_end(username)
+        self.hits += 1
+        return True
+
+    def put(self, username: str, password: str) -> None:
+        """
+        Recuerda que password es la contraseña correcta de username.
+        
+        Args:
+            username: Nombre de usuario.
+            password: Contraseña recién verificada.
+        """
+        if username in self._entries:
+            self._discard(username)
+        self._entries[username] = (self._digest(password), self._clock() + self.ttl)
+        self._bytes += self._entry_size(username)
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    # -------------------------
+    # Invalidación
+    # -------------------------
+    def invalidate(self, username: str) -> bool:
+        """
+        Olvida la entrada de username.
+        
+        Args:
+            username: Nombre de usuario.
+        
+        Returns:
+            True si había una entrada.
+        """
+        if username not in self._entries:
+            return False
+        self._discard(username)
+        self.invalidations += 1
+        return True
+
+    def clear(self) -> None:
+        """Olvida todas las entradas (los contadores se conservan)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _discard(self, username: str) -> None:
+        """Quita la entrada de username y descuenta su memoria."""
+        del self._entries[username]
+        self._bytes -= self._entry_size(username)
+
+    def _on_change(self, op: int, key: Union[int, str], value: Any) -> None:
+        """Listener de la tabla: un insert o delete del usuario lo invalida."""
+        if isinstance(key, str):
+            self.invalidate(key)
+
+    def attach(self, hash_table: Any) -> 'AuthCache':
+        """
+        Invalida las entradas cuando cambia su usuario en hash_table.
+        
+        Args:
+            hash_table: HashTable (o cualquier tabla con add_listener).
+        
+        Returns:
+            La propia caché.
+        """
+        hash_table.add_listener(self._on_change)
+        return self
+
+    def detach(self, hash_table: Any) -> None:
+        """
+        Deja de escuchar los cambios de hash_table.
+        
+        Args:
+            hash_table: Tabla pasada a attach.
+        """
+        hash_table.remove_listener(self._on_change)
+
+    # -------------------------
+    # Estadísticas
+    # -------------------------
+    def get_statistics(self) -> dict:
+        """
+        Devuelve los contadores de la caché.
+        
+        Returns:
+            Diccionario con:
+                - entries, bytes: Ocupación actual (bytes estimados)
+                - max_entries, max_bytes, ttl: Límites
+                - hits, misses, hit_rate: Consultas y proporción de aciertos
+                - evictions: Expulsiones LRU por los límites
+                - expirations: Entradas descartadas por caducidad
+                - invalidations: Entradas invalidadas por cambios en la tabla
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations,
+        }
+
+
+__all__ = ['DEFAULT_MAX_BYTES', 'DEFAULT_MAX_ENTRIES', 'DEFAULT_TTL', 'AuthCache']
@@ -0,0 +1,463 @@
+"""
+Servicio TCP de autenticación (asyncio) sobre la tabla hash de usuarios.
+
+Usa la misma HashTable, el mismo User y los mismos ficheros (snapshot y
+write-ahead log) que login.py, pero atiende a muchos clientes a la vez.
+
+Protocolo: JSON Lines en UTF-8, un objeto por línea en cada sentido.
+
+    petición  : {"id": 7, "op": "authenticate", "username": "ana", "password": "..."}
+    respuesta : {"id": 7, "ok": true}
+
+Operaciones:
+    - register     (username, password): ok=false con error "exists" si ya existe
+    - authenticate (username, password): ok indica si la contraseña es correcta
+    - delete       (username, password): borra el usuario si la contraseña es correcta
+    - stats        : ok=true y "stats" con HashTable.get_statistics()
+
+Las peticiones mal formadas reciben ok=false y un código en "error"
+(invalid_json, bad_request, unknown_op, line_too_long, internal). El
+"id" se devuelve tal cual: un cliente puede enviar varias peticiones sin
+esperar respuesta (pipelining) y las respuestas llegan según terminan,
+no en el orden de envío. Como mucho se procesan max_pipeline peticiones
+a la vez por conexión; las siguientes esperan a que termine alguna.
+
+Las peticiones sobre un mismo usuario (de cualquier conexión) se ejecutan
+de una en una y en orden de llegada: un register seguido sin esperar de
+un authenticate del mismo nombre ve el usuario ya registrado. Las de
+usuarios distintos avanzan en paralelo.
+
+La tabla sólo se toca desde el bucle de eventos (un único hilo), así que
+no necesita locks. Los hashes de contraseñas, que son lo caro, se
+calculan en el pool de procesos de PasswordHasher sin bloquear el bucle.
+Con --cache, las autenticaciones correctas repetidas se resuelven en la
+caché LRU/TTL de auth_cache.py sin llegar al pool.
+
+Uso:
+    python src/auth_server.py [--host 127.0.0.1] [--port 8765] [--workers 4] [--cache 10000]
+"""
+
+import argparse
+import asyncio
+import hmac
+import itertools
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+# Ajustar el path para que funcione desde cualquier ubicación
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+from src.hashing.hash_table_double_hashing import HashTable
+from src.auth_cache import AuthCache
+from src.login import AUTH_CACHE_ENTRIES, AUTH_CACHE_TTL, User, close_users, load_users, make_auth_cache
+from src.passwords import DEFAULT_WORK_FACTORS, PBKDF2_SHA256, PasswordHash, PasswordHasher
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Peticiones en curso por conexión antes de dejar de leer del socket
+DEFAULT_MAX_PIPELINE = 64
+
+# Longitud máxima de una línea de petición
+MAX_LINE_BYTES = 64 * 1024
+
+
+class AuthServer:
+    """
+    Servidor asyncio que expone registro, login, borrado y estadísticas.
+    
+    Args:
+        hash_table: Tabla hash de usuarios (claves: nombre, valores: User).
+        hasher: Calcula y verifica los hashes de contraseñas.
+        max_pipeline: Peticiones en curso por conexión.
+        cache: Caché de autenticaciones correctas suscrita a hash_table, o None.
+    """
+
+    def __init__(self, hash_table: HashTable, hasher: PasswordHasher,
+                 max_pipeline: int = DEFAULT_MAX_PIPELINE, cache: Optional[AuthCache] = None):
+        self.hash_table = hash_table
+        self.hasher = hasher
+        self.max_pipeline = max_pipeline
+        self.cache = cache
+        self._dummy: Optional[PasswordHash] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        # Lock y número de peticiones en curso de cada usuario
+        self._user_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
+    # -------------------------
+    # Ciclo de vida
+    # -------------------------
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """
+        Empieza a aceptar conexiones.
+        
+        Args:
+            host: Dirección en la que escuchar.
+            port: Puerto (0 elige uno libre).
+        
+        Returns:
+            El servidor de asyncio (ver sockets para el puerto real).
+        """
+        # Hash de relleno para los usuarios inexistentes (ver _authenticate)
+        self._dummy = await self._run(self.hasher.submit_hash(os.urandom(16).hex()))
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=MAX_LINE_BYTES)
+        return self._server
+
+    async def close(self) -> None:
+        """Deja de aceptar conexiones y cierra las que siguen abiertas."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # Cerrar el transporte hace que readline devuelva EOF: cada conexión
+        # termina sus peticiones en curso y sale por el camino normal
+        connections = list(self._connections.items())
+        for _, writer in connections:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in connections), return_exceptions=True)
+
+    @asynccontextmanager
+    async def _user_lock(self, username: str) -> AsyncIterator[None]:
+        """
+        Serializa las peticiones de un usuario en orden de llegada.
+        
+        asyncio.Lock despierta a quien espera en orden FIFO. El lock se
+        descarta cuando no queda ninguna petición del usuario.
+        
+        Args:
+            username: Nombre de usuario.
+        """
+        lock, users = self._user_locks.get(username, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._user_locks[username] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._user_locks[username]
+            if users == 1:
+                del self._user_locks[username]
+            else:
+                self._user_locks[username] = (lock, users - 1)
+
+    @staticmethod
+    async def _run(future: Any) -> Any:
+        """Espera un concurrent.futures.Future desde el bucle de eventos."""
+        return await asyncio.wrap_future(future)
+
+    # -------------------------
+    # Conexiones
+    # -------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """
+        Lee peticiones de una conexión y las atiende concurrentemente.
+        
+        Args:
+            reader: Flujo de entrada.
+            writer: Flujo de salida.
+        """
+        connection = asyncio.current_task()
+        self._connections[connection] = writer
+        slots = asyncio.Semaphore(self.max_pipeline)
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(_encode({'id': None, 'ok': False, 'error': 'line_too_long'}))
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await slots.acquire()
+                task = asyncio.create_task(self._respond(line, writer, slots))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+            self._connections.pop(connection, None)
+
+    async def _respond(self, line: bytes, writer: asyncio.StreamWriter,
+                       slots: asyncio.Semaphore) -> None:
+        """
+        Atiende una petición y escribe su respuesta.
+        
+        Args:
+            line: Línea JSON recibida.
+            writer: Flujo de salida de la conexión.
+            slots: Semáforo de peticiones en curso de la conexión.
+        """
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {'id': None, 'ok': False, 'error': 'invalid_json'}
+            else:
+                try:
+                    response = await self.handle(request)
+                except Exception:
+                    response = {'id': request.get('id') if isinstance(request, dict) else None,
+                                'ok': False, 'error': 'internal'}
+            if not writer.is_closing():
+                writer.write(_encode(response))
+                await writer.drain()
+        finally:
+            slots.release()
+
+    # -------------------------
+    # Operaciones
+    # -------------------------
+    async def handle(self, request: Any) -> Dict[str, Any]:
+        """
+        Ejecuta una petición ya decodificada.
+        
+        Args:
+            request: Objeto JSON de la petición.
+        
+        Returns:
+            Objeto JSON de la respuesta (con el mismo id).
+        """
+        if not isinstance(request, dict):
+            return {'id': None, 'ok': False, 'error': 'bad_request'}
+        response: Dict[str, Any] = {'id': request.get('id')}
+        op = request.get('op')
+        if op == 'stats':
+            response.update(ok=True, stats=self.hash_table.get_statistics())
+            if self.cache is not None:
+                response['cache'] = self.cache.get_statistics()
+            return response
+        if op not in ('register', 'authenticate', 'delete'):
+            response.update(ok=False, error='unknown_op')
+            return response
+
+        username = request.get('username')
+        password = request.get('password')
+        if not isinstance(username, str) or not username or not isinstance(password, str) or not password:
+            response.update(ok=False, error='bad_request')
+            return response
+
+        async with self._user_lock(username):
+            if op == 'register':
+                error = await self._register(username, password)
+                response.update(ok=error is None)
+                if error is not None:
+                    response['error'] = error
+            elif op == 'authenticate':
+                response.update(ok=await self._authenticate(username, password))
+            else:
+                response.update(ok=await self._authenticate(username, password)
+                                and self.hash_table.delete(username))
+        return response
+
+    async def _register(self, username: str, password: str) -> Optional[str]:
+        """
+        Registra un usuario nuevo.
+        
+        Args:
+            username: Nombre de usuario.
+            password: Contraseña en claro.
+        
+        Returns:
+            None si se registró, o el código de error ('exists', 'full').
+        """
+        if self.hash_table.search(username) is not None:
+            return 'exists'
+        record = await self._run(self.hasher.submit_hash(password))
+        if not self.hash_table.insert(username, User(username, record)):
+            return 'full'
+        return None
+
+    async def _authenticate(self, username: str, password: str) -> bool:
+        """
+        Verifica la contraseña y actualiza hashes antiguos (ver login._check_password).
+        
+        Args:
+            username: Nombre de usuario.
+            password: Contraseña en claro.
+        
+        Returns:
+            True si el usuario existe y la contraseña es correcta.
+        """
+        if self.cache is not None and self.cache.check(username, password):
+            return True
+
+        stored_user = self.hash_table.search(username)
+        if not isinstance(stored_user, User):
+            await self._run(self.hasher.submit_verify(password, self._dummy))
+            return False
+
+        record = getattr(stored_user, 'password_hash', None)
+        if record is None:
+            legacy = getattr(stored_user, 'password', '')
+            valid = hmac.compare_digest(legacy.encode('utf-8'), password.encode('utf-8'))
+        else:
+            valid = await self._run(self.hasher.submit_verify(password, record))
+
+        if valid and (record is None or self.hasher.needs_upgrade(record)):
+            upgraded = await self._run(self.hasher.submit_hash(password))
+            self.hash_table.insert(username, User(username, upgraded))
+        if valid and self.cache is not None:
+            self.cache.put(username, password)
+        return valid
+
+
+class AuthClient:
+    """
+    Cliente asyncio del protocolo, con pipelining.
+    
+    Cada request() envía una línea y devuelve su respuesta cuando llega;
+    se pueden tener muchas en curso a la vez sobre la misma conexión.
+    """
+
+    def __init__(self) -> None:
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._listener: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> 'AuthClient':
+        """
+        Abre la conexión.
+        
+        Args:
+            host: Dirección del servidor.
+            port: Puerto del servidor.
+        
+        Returns:
+            El propio cliente.
+        """
+        self._reader, self._writer = await asyncio.open_connection(host, port, limit=MAX_LINE_BYTES)
+        self._listener = asyncio.create_task(self._listen())
+        return self
+
+    async def _listen(self) -> None:
+        """Reparte las respuestas entre las peticiones pendientes por id."""
+        error: Exception = ConnectionError("Conexión cerrada por el servidor")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            error = e
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Envía una petición y espera su respuesta.
+        
+        Args:
+            op: Operación ('register', 'authenticate', 'delete', 'stats').
+            **fields: Resto de campos (username, password).
+        
+        Returns:
+            Objeto JSON de la respuesta.
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(_encode({'id': request_id, 'op': op, **fields}))
+        await self._writer.drain()
+        return await future
+
+    async def close(self) -> None:
+        """Cierra la conexión."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+        if self._listener is not None:
+            await self._listener
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Serializa un mensaje como una línea JSON."""
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+async def serve(host: str, port: int, workers: Optional[int], algorithm: str,
+                work_factor: Optional[int], cache_entries: int = AUTH_CACHE_ENTRIES,
+                cache_ttl: float = AUTH_CACHE_TTL) -> None:
+    """
+    Carga los usuarios y atiende peticiones hasta que se cancele.
+    
+    Al terminar guarda un checkpoint, igual que la opción Salir de login.py.
+    
+    Args:
+        host: Dirección en la que escuchar.
+        port: Puerto.
+        workers: Procesos para los hashes de contraseñas.
+        algorithm: Algoritmo de los hashes nuevos.
+        work_factor: Factor de trabajo de los hashes nuevos.
+        cache_entries: Entradas de la caché de autenticaciones (0 = sin caché).
+        cache_ttl: Segundos de validez de cada entrada de la caché.
+    """
+    hash_table = load_users()
+    cache = make_auth_cache(hash_table, cache_entries, cache_ttl)
+    with PasswordHasher(workers=workers, algorithm=algorithm, work_factor=work_factor) as hasher:
+        server = AuthServer(hash_table, hasher, cache=cache)
+        listener = await server.start(host, port)
+        address = listener.sockets[0].getsockname()
+        print(f"Servidor de autenticación escuchando en {address[0]}:{address[1]}")
+        try:
+            await listener.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await server.close()
+            close_users(hash_table)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--host', default=DEFAULT_HOST, help='dirección en la que escuchar')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='puerto')
+    parser.add_argument('--workers', type=int, help='procesos para los hashes (por defecto cpu_count)')
+    parser.add_argument('--algorithm', default=PBKDF2_SHA256, choices=list(DEFAULT_WORK_FACTORS))
+    parser.add_argument('--work-factor', type=int, help='factor de trabajo de los hashes nuevos')
+    parser.add_argument('--cache', type=int, default=AUTH_CACHE_ENTRIES,
+                        help='entradas de la caché de autenticaciones (0 = sin caché)')
+    parser.add_argument('--cache-ttl', type=float, default=AUTH_CACHE_TTL,
+                        help='segundos de validez de cada entrada de la caché')
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.algorithm, args.work_factor,
+                          args.cache, args.cache_ttl))
+    except KeyboardInterrupt:
+        pass
+    # asyncio.run convierte Ctrl+C en la cancelación de serve()
+    print("\nServidor detenido.")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,11 @@ Módulo de implementación de tablas hash.
 """
 
 from .hash_table_double_hashing import HashTable
+from .bulk_build import bulk_build
+from .concurrent_table import ConcurrentHashTable
+from .mapped_table import MappedHashTable
+from .shared_table import SharedHashTable
+from .sharded_table import ShardedHashTable
 
-__all__ = ['HashTable']
-
+__all__ = ['HashTable', 'ConcurrentHashTable', 'MappedHashTable', 'ShardedHashTable',
+           'SharedHashTable', 'bulk_build']
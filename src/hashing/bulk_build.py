@@ -0,0 +1,250 @@
+"""
+Construcción masiva de una HashTable a partir de un volcado de usuarios.
+
+Cargar millones de pares con insert cuesta sobre todo dos cosas: hashear
+cada clave (la función hash de strings es Python puro) y recorrer el
+camino general de insert (migración, free_list, comprobaciones de carga)
+para cada una. bulk_build separa ambas:
+
+1. Lee todos los pares y fija el tamaño final de la tabla igual que
+   insert_many (un único redimensionamiento para todo el lote).
+2. Reparte las claves en bloques y calcula en un ProcessPoolExecutor el
+   hash de 64 bits y h1/h2 de cada una para ese tamaño.
+3. Coloca las claves en orden en el proceso principal escribiendo los
+   slots directamente: en una tabla recién creada no hay DELETED ni
+   migración, así que cada clave va al primer EMPTY de su secuencia y el
+   cursor enlaza desde el slot anterior.
+
+El resultado es idéntico (mismos slots, cursores, back-cursors y
+contadores) al de table_class(**opciones).insert_many(pares). En modo
+Robin Hood o con validate_probes la colocación usa el camino general,
+con el hash y h1/h2 ya calculados.
+
+Formato de fichero de read_pairs: una línea por usuario, con el nombre y
+el registro separados por un tabulador (el registro es el resto de la
+línea, como str).
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from .hash_functions import hasher_from_id
+from .hash_table_double_hashing import HashTable, probe_plan
+from .slot_store import NIL, OCCUPIED
+
+
+# Claves por bloque enviado a cada proceso
+DEFAULT_CHUNK_SIZE = 50_000
+
+# Tablas auxiliares de cada proceso del pool, por (hash_id, semilla)
+_worker_tables: dict = {}
+
+
+def read_pairs(path: str, separator: str = '\t', encoding: str = 'utf-8') -> Iterator[Tuple[str, str]]:
+    """
+    Lee un volcado de texto con un par (usuario, registro) por línea.
+    
+    Las líneas vacías se ignoran.
+    
+    Args:
+        path: Ruta del fichero.
+        separator: Separador entre el nombre y el registro.
+        encoding: Codificación del fichero.
+    
+    Yields:
+        Tuplas (usuario, registro).
+    
+    Raises:
+        ValueError: Si una línea no contiene el separador.
+    """
+    with open(path, encoding=encoding) as stream:
+        for number, line in enumerate(stream, 1):
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            key, sep, record = line.partition(separator)
+            if not sep:
+                raise ValueError(f"{path}:{number}: falta el separador {separator!r}")
+            yield key, record
+
+
+def _plan_chunk(hash_id: int, seed: Optional[bytes], size: int,
+                keys: List[Union[int, str]]) -> Tuple[array, array, array]:
+    """
+    Hash de 64 bits y (h1, h2) de un bloque de claves (se ejecuta en el pool).
+    
+    Args:
+        hash_id: Función hash de la tabla (ver hash_functions).
+        seed: Semilla de la función hash.
+        size: Tamaño final de la tabla.
+        keys: Claves del bloque.
+    
+    Returns:
+        Tupla (hashes, bases, steps) como arrays de enteros sin signo.
+    """
+    table = _worker_tables.get((hash_id, seed))
+    if table is None:
+        table = _worker_tables[(hash_id, seed)] = HashTable(1, hash_function=hasher_from_id(hash_id, seed))
+    hashes = table._hash_many(keys)
+    bases, steps = probe_plan(hashes, size)
+    hash_list = hashes if isinstance(hashes, list) else hashes.tolist()
+    return array('Q', hash_list), array('Q', bases), array('Q', steps)
+
+
+def bulk_build(source: Union[str, Iterable[Tuple[Union[int, str], Any]]],
+               workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               table_class: Type[HashTable] = HashTable, **table_options: Any) -> HashTable:
+    """
+    Construye una tabla con todos los pares de source.
+    
+    Args:
+        source: Pares (key, value), o la ruta de un fichero para read_pairs.
+        workers: Procesos para hashear; por defecto os.cpu_count(). Con 1
+                 se hashea en el propio proceso, sin pool.
+        chunk_size: Claves por bloque enviado a cada proceso.
+        table_class: Clase de la tabla resultante (HashTable o una subclase).
+        **table_options: Argumentos del constructor (size, max_load_factor,
+                         hash_function, probing...).
+    
+    Returns:
+        La tabla, idéntica a table_class(**table_options).insert_many(pares).
+    
+    Raises:
+        ValueError: Si workers o chunk_size no son positivos.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers debe ser mayor a 0. Recibido: {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size debe ser mayor a 0. Recibido: {chunk_size}")
+
+    items = list(read_pairs(source) if isinstance(source, str) else source)
+    table = table_class(**table_options)
+    store = table._store
+    if (table.max_load_factor is not None and items
+            and len(items) > table.max_load_factor * table.size):
+        # Mismo tamaño que reservaría insert_many; la generación antigua
+        # está vacía, así que la migración termina sin mover nada
+        table._start_resize(table._rehash_size(grow=True, incoming=len(items)))
+        table._advance_migration(table._old.size)
+        store = table._store
+
+    size = store.size
+    hasher = table.hasher
+    chunks = [[key for key, _ in items[start:start + chunk_size]]
+              for start in range(0, len(items), chunk_size)]
+
+    # Las funciones hash personalizadas (hash_id < 0) no se pueden
+    # reconstruir en otro proceso: se hashea en este
+    if workers == 1 or len(chunks) <= 1 or hasher.hash_id < 0:
+        plans = (_local_plan(table, size, keys) for keys in chunks)
+        _place_all(table, items, plans, size, chunk_size)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            plans = pool.map(_plan_chunk, [hasher.hash_id] * len(chunks), [hasher.seed] * len(chunks),
+                             [size] * len(chunks), chunks)
+            _place_all(table, items, plans, size, chunk_size)
+    return table
+
+
+def _local_plan(table: HashTable, size: int, keys: List[Union[int, str]]) -> Tuple[list, list, list]:
+    """
+    Igual que _plan_chunk, con la función hash de la propia tabla.
+    
+    Args:
+        table: Tabla en construcción.
+        size: Tamaño final de la tabla.
+        keys: Claves del bloque.
+    
+    Returns:
+        Tupla (hashes, bases, steps).
+    """
+    hashes = table._hash_many(keys)
+    bases, steps = probe_plan(hashes, size)
+    return (hashes if isinstance(hashes, list) else hashes.tolist()), bases, steps
+
+
+def _place_all(table: HashTable, items: List[Tuple[Union[int, str], Any]],
+               plans: Iterable[Tuple[Any, Any, Any]], size: int, chunk_size: int) -> None:
+    """
+    Coloca los pares en orden a medida que llegan los planes de cada bloque.
+    
+    Args:
+        table: Tabla recién creada (sin DELETED ni migración).
+        items: Todos los pares.
+        plans: (hashes, bases, steps) de cada bloque, en orden.
+        size: Tamaño para el que se calcularon h1/h2.
+        chunk_size: Claves por bloque.
+    """
+    fast = not table._robin_hood and not table.validate_probes and table.max_load_factor is not None
+    for chunk, (hashes, bases, steps) in enumerate(plans):
+        batch = items[chunk * chunk_size:(chunk + 1) * chunk_size]
+        if fast:
+            _place_fresh(table, batch, hashes, bases, steps)
+            continue
+        for (key, value), key_hash, base, step in zip(batch, hashes, bases, steps):
+            start = (base, step) if table.size == size else None
+            table._insert_hashed(key, value, key_hash, start)
+
+
+def _place_fresh(table: HashTable, batch: List[Tuple[Union[int, str], Any]],
+                 hashes: Any, bases: Any, steps: Any) -> None:
+    """
+    Escribe los pares directamente en los arrays de una tabla sin DELETED.
+    
+    Reproduce lo que harían _probe y _write_slot: sin DELETED ni migración,
+    la clave va al primer EMPTY de su secuencia, el cursor del slot
+    OCCUPIED anterior pasa a apuntarla y una clave repetida sólo actualiza
+    su valor. El tamaño lo fijó bulk_build para que el lote quepa sin
+    superar max_load_factor.
+    
+    Args:
+        table: Tabla en construcción.
+        batch: Pares del bloque.
+        hashes: Hash de 64 bits de cada clave.
+        bases: h1 de cada clave.
+        steps: h2 de cada clave.
+    """
+    store = table._store
+    size = store.size
+    status = store.status
+    keys = store.keys
+    values = store.values
+    stored_hashes = store.hashes
+    cursor = store.cursor
+    back = store.back
+    dist = store.dist
+    record_probe = store.record_probe
+    occupied = store.occupied
+
+    for (key, value), key_hash, pos, step in zip(batch, hashes, bases, steps):
+        i = 0
+        prev = NIL
+        while status[pos] == OCCUPIED:
+            if stored_hashes[pos] == key_hash and keys[pos] == key:
+                values[pos] = value
+                break
+            prev = pos
+            pos = (pos + step) % size
+            i += 1
+        else:
+            keys[pos] = key
+            values[pos] = value
+            status[pos] = OCCUPIED
+            stored_hashes[pos] = key_hash
+            dist[pos] = i
+            occupied += 1
+            record_probe(i + 1)
+            if prev != NIL:
+                old_next = cursor[prev]
+                if old_next != NIL and back[old_next] == prev:
+                    back[old_next] = NIL
+                cursor[prev] = pos
+                back[pos] = prev
+
+    store.occupied = occupied
+
+
+__all__ = ['DEFAULT_CHUNK_SIZE', 'bulk_build', 'read_pairs']
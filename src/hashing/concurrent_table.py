@@ -0,0 +1,395 @@
+"""
+HashTable segura para varios hilos.
+
+Lectores optimistas (seqlock): search no toma ningún lock. Lee el número
+de secuencia, recorre los probes y vuelve a leer la secuencia; si un
+escritor ha cambiado algo entretanto (la secuencia es impar mientras
+escribe o ha avanzado), repite la búsqueda. Las búsquedas nunca se
+bloquean entre sí ni esperan a un escritor salvo que fallen varios
+intentos seguidos, en cuyo caso la última se hace con el lock tomado.
+
+Escritores: insert, delete, compactación, etc. se serializan en un único
+lock reentrante. Una inserción no se limita a los slots de su secuencia
+de probes: desengancha slots de la free_list, reescribe el cursor del
+eslabón anterior de la cadena, desplaza claves en modo Robin Hood,
+actualiza los contadores del store y puede iniciar o avanzar una
+migración que recorre toda la tabla. Ningún reparto de los slots en
+franjas cubre esas escrituras, así que cada operación de escritura es
+una sección crítica completa.
+
+Los métodos de visualización y análisis heredados (display, show_*,
+analyze_collisions...) no están sincronizados: son para diagnóstico con
+la tabla en reposo, o dentro de exclusive().
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .hash_table_double_hashing import SCAN_PAGE, HashTable
+from .instrumentation import TableInstrumentation
+
+
+# Intentos optimistas de una lectura antes de tomar el lock
+DEFAULT_READ_RETRIES = 8
+
+# Marca de lectura fallida (distinta de None, que es un resultado válido)
+_RETRY = object()
+
+
+class ConcurrentHashTable(HashTable):
+    """
+    HashTable con lectores sin lock (seqlock) y escritores serializados.
+    
+    Acepta los mismos argumentos que HashTable, más read_retries.
+    
+    Args:
+        *args: Argumentos de HashTable.
+        read_retries: Intentos optimistas de cada lectura antes de hacerla
+                      con el lock de escritura tomado (>= 1).
+        **kwargs: Argumentos con nombre de HashTable.
+    
+    Raises:
+        ValueError: Si read_retries < 1 o algún argumento de HashTable no es válido.
+    """
+
+    def __init__(self, *args: Any, read_retries: int = DEFAULT_READ_RETRIES, **kwargs: Any):
+        """
+        Inicializa la tabla y sus primitivas de sincronización.
+        
+        Args:
+            *args: Argumentos de HashTable.
+            read_retries: Intentos optimistas por lectura.
+            **kwargs: Argumentos con nombre de HashTable.
+        
+        Raises:
+            ValueError: Si read_retries < 1 o algún argumento no es válido.
+        """
+        if read_retries < 1:
+            raise ValueError(f"read_retries debe ser mayor a 0. Recibido: {read_retries}")
+        self.read_retries = read_retries
+        # Reentrante: delete puede lanzar compact() y _notify un checkpoint()
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._owner: Optional[int] = None
+        # Impar mientras un escritor modifica la tabla
+        self._seq = 0
+        super().__init__(*args, **kwargs)
+
+    # -------------------------
+    # Sincronización
+    # -------------------------
+    @contextmanager
+    def exclusive(self) -> Iterator['ConcurrentHashTable']:
+        """
+        Sección crítica de escritura.
+        
+        Sirve para agrupar varias operaciones de forma atómica (por ejemplo,
+        buscar y después insertar si no existe). Mientras dura, las lecturas
+        optimistas de otros hilos se reintentan.
+        
+        Yields:
+            La propia tabla.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._owner = threading.get_ident()
+                self._seq += 1
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._seq += 1
+                    self._owner = None
+
+    def _read(self, operation: Any, *args: Any) -> Any:
+        """
+        Ejecuta una lectura pura con el protocolo seqlock.
+        
+        Un intento es válido si la secuencia era par al empezar y no cambió
+        al terminar. Cualquier excepción durante un intento concurrente con
+        un escritor (índices de otra generación, arrays a medio crecer) sólo
+        significa que el intento no vale.
+        
+        Args:
+            operation: Función de lectura que no modifica la tabla.
+            *args: Argumentos de operation.
+        
+        Returns:
+            El resultado de operation.
+        """
+        if self._owner == threading.get_ident():
+            # Lectura dentro de exclusive() del propio hilo
+            return operation(*args)
+        for _ in range(self.read_retries):
+            seq = self._seq
+            if seq & 1:
+                # Escritor en curso: ceder el procesador y reintentar
+                time.sleep(0)
+                continue
+            try:
+                result = operation(*args)
+            except Exception:
+                result = _RETRY
+            if result is not _RETRY and self._seq == seq:
+                return result
+        with self._lock:
+            return operation(*args)
+
+    # -------------------------
+    # Lectura
+    # -------------------------
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        """
+        Busca key sin tomar locks (ver HashTable.search).
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            El valor asociado, o None si no está.
+        """
+        key_hash = self._hash(key)
+        # Primer intento en línea (el caso habitual sin escritores); los
+        # reintentos y la lectura dentro de exclusive() van por _read
+        seq = self._seq
+        if not seq & 1:
+            try:
+                result = self._search_hashed(key, key_hash)
+            except Exception:
+                result = _RETRY
+            if result is not _RETRY and self._seq == seq:
+                return result
+        return self._read(self._search_hashed, key, key_hash)
+
+    def search_many(self, keys: Iterable[Union[int, str]]) -> List[Optional[Any]]:
+        """
+        Busca muchas claves; cada una es una lectura optimista independiente.
+        
+        Args:
+            keys: Claves a buscar.
+        
+        Returns:
+            Lista con el valor de cada clave (None si no está), en el mismo orden.
+        """
+        keys = list(keys)
+        hashes = self._hash_many(keys)
+        hash_list = hashes if isinstance(hashes, list) else hashes.tolist()
+        read = self._read
+        search = self._search_hashed
+        return [read(search, key, key_hash) for key, key_hash in zip(keys, hash_list)]
+
+    def probe_count(self, key: Union[int, str]) -> int:
+        """
+        Cuenta los probes de search(key) (ver HashTable.probe_count).
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            Número de probes (>= 1).
+        """
+        return self._read(super().probe_count, key)
+
+    def scan(self, cursor: int = 0, count: int = SCAN_PAGE) -> Tuple[int, List[Tuple[Union[int, str], Any]]]:
+        """
+        Lee una página de scan sin tomar locks (ver HashTable.scan).
+        
+        Cada página es una lectura optimista: refleja la tabla en un único
+        instante, y items/keys/values (que leen por páginas) heredan las
+        garantías de scan entre una página y la siguiente.
+        
+        Args:
+            cursor: 0 para empezar, o el cursor de la llamada anterior.
+            count: Máximo de entradas de la página.
+        
+        Returns:
+            Tupla (cursor, entradas).
+        """
+        return self._read(super().scan, cursor, count)
+
+    def walk_chain(self, key: Union[int, str]) -> Iterator[Tuple[int, Union[int, str], Any]]:
+        """
+        Recorre la cadena de cursores de key en una sola lectura optimista.
+        
+        Args:
+            key: Clave por la que empieza la cadena (ver HashTable.walk_chain).
+        
+        Returns:
+            Iterador de tuplas (posición, clave, valor).
+        """
+        walk = super().walk_chain
+        return iter(self._read(lambda: list(walk(key))))
+
+    def get_statistics(self, full_audit: bool = False) -> dict:
+        """
+        Estadísticas coherentes entre sí (ver HashTable.get_statistics).
+        
+        Args:
+            full_audit: Si es True, recuenta todo con el lock tomado.
+        
+        Returns:
+            Diccionario de estadísticas.
+        """
+        if full_audit:
+            with self._lock:
+                return super().get_statistics(full_audit=True)
+        return self._read(super().get_statistics)
+
+    # -------------------------
+    # Escritura
+    # -------------------------
+    def insert(self, key: Union[int, str], value: Any) -> bool:
+        """
+        Inserta (key, value) en exclusión mutua (ver HashTable.insert).
+        
+        Args:
+            key: Clave del elemento.
+            value: Valor asociado.
+        
+        Returns:
+            True si se insertó, False si la tabla está llena.
+        """
+        key_hash = self._hash(key)
+        with self.exclusive():
+            return self._insert_hashed(key, value, key_hash)
+
+    def delete(self, key: Union[int, str]) -> bool:
+        """
+        Elimina key en exclusión mutua (ver HashTable.delete).
+        
+        Args:
+            key: Clave a eliminar.
+        
+        Returns:
+            True si se eliminó, False si no se encontró.
+        """
+        key_hash = self._hash(key)
+        with self.exclusive():
+            return self._delete_hashed(key, key_hash)
+
+    def insert_many(self, items: Iterable[Tuple[Union[int, str], Any]]) -> List[bool]:
+        """
+        Inserta un lote de forma atómica (ver HashTable.insert_many).
+        
+        Args:
+            items: Pares (key, value).
+        
+        Returns:
+            Resultado de insert para cada par, en el mismo orden.
+        """
+        items = list(items)
+        with self.exclusive():
+            return super().insert_many(items)
+
+    def delete_many(self, keys: Iterable[Union[int, str]]) -> List[bool]:
+        """
+        Elimina un lote de forma atómica (ver HashTable.delete_many).
+        
+        Args:
+            keys: Claves a eliminar.
+        
+        Returns:
+            Resultado de delete para cada clave, en el mismo orden.
+        """
+        keys = list(keys)
+        with self.exclusive():
+            return super().delete_many(keys)
+
+    def compact(self, incremental: bool = False) -> int:
+        """
+        Compacta en exclusión mutua (ver HashTable.compact).
+        
+        Args:
+            incremental: Si es True, sólo inicia la reconstrucción.
+        
+        Returns:
+            Número de slots DELETED que se recuperan.
+        """
+        with self.exclusive():
+            return super().compact(incremental)
+
+    def compact_step(self, max_slots: Optional[int] = None) -> bool:
+        """
+        Avanza la migración en exclusión mutua (ver HashTable.compact_step).
+        
+        Args:
+            max_slots: Slots antiguos a migrar.
+        
+        Returns:
+            True si ya no queda nada por migrar.
+        """
+        with self.exclusive():
+            return super().compact_step(max_slots)
+
+    def enable_filter(self, *args: Any, **kwargs: Any) -> None:
+        """Activa el filtro de claves ausentes en exclusión mutua (ver HashTable.enable_filter)."""
+        with self.exclusive():
+            super().enable_filter(*args, **kwargs)
+
+    def disable_filter(self) -> None:
+        """Descarta el filtro de claves ausentes en exclusión mutua."""
+        with self.exclusive():
+            super().disable_filter()
+
+    def enable_instrumentation(self, *args: Any, **kwargs: Any) -> TableInstrumentation:
+        """Empieza a medir las operaciones en exclusión mutua (ver HashTable.enable_instrumentation)."""
+        with self.exclusive():
+            return super().enable_instrumentation(*args, **kwargs)
+
+    def disable_instrumentation(self) -> None:
+        """Deja de medir las operaciones en exclusión mutua."""
+        with self.exclusive():
+            super().disable_instrumentation()
+
+    # -------------------------
+    # Persistencia
+    # -------------------------
+    def save(self, path: str) -> None:
+        """
+        Guarda un snapshot sin escritores concurrentes (ver HashTable.save).
+        
+        Las lecturas siguen sin bloquearse: guardar no modifica la tabla.
+        
+        Args:
+            path: Ruta del snapshot.
+        """
+        with self._lock:
+            super().save(path)
+
+    def attach_wal(self, wal_path: str, snapshot_path: Optional[str] = None,
+                   sync_every: int = 1, sync_interval: Optional[float] = None,
+                   checkpoint_every: Optional[int] = None) -> int:
+        """
+        Reaplica y adjunta un log en exclusión mutua (ver HashTable.attach_wal).
+        
+        Args:
+            wal_path: Ruta del log.
+            snapshot_path: Snapshot que escribe checkpoint().
+            sync_every: Registros por fsync.
+            sync_interval: Segundos máximos entre fsync, o None.
+            checkpoint_every: Registros entre checkpoints automáticos, o None.
+        
+        Returns:
+            Número de registros reaplicados.
+        """
+        with self.exclusive():
+            return super().attach_wal(wal_path, snapshot_path, sync_every=sync_every,
+                                      sync_interval=sync_interval,
+                                      checkpoint_every=checkpoint_every)
+
+    def detach_wal(self) -> None:
+        """Cierra el log adjunto sin escritores concurrentes."""
+        with self._lock:
+            super().detach_wal()
+
+    def checkpoint(self) -> None:
+        """Guarda snapshot y vacía el log sin escritores concurrentes."""
+        with self._lock:
+            super().checkpoint()
+
+
+__all__ = ['DEFAULT_READ_RETRIES', 'ConcurrentHashTable']
@@ -0,0 +1,281 @@
+"""
+Filtro cuckoo: descarta claves ausentes sin recorrer la tabla.
+
+Una búsqueda de una clave que no está recorre probes hasta dar con un
+EMPTY, y con un factor de carga alto o muchos DELETED el recorrido es
+largo. El filtro guarda una huella (fingerprint) de f bits de cada clave
+en una de dos posiciones posibles. Si la huella no está en ninguna, la
+clave seguro que no está en la tabla. Si está, puede ser un falso
+positivo con probabilidad aproximada 2 * bucket_size * ocupación / 2^f.
+
+Se usa un filtro cuckoo y no uno de Bloom porque admite borrados: quitar
+la huella de una clave borrada no afecta a las demás. Sólo se debe
+borrar una clave que se añadió antes (la tabla lo garantiza borrando
+únicamente tras un delete con éxito).
+
+Estructura:
+
+    slots : array -> buckets de bucket_size huellas (0 = hueco libre)
+
+El bucket i1 (bits altos) y la huella (los bits siguientes) salen de
+key_hash multiplicado por una constante impar (hashing de Fibonacci),
+así que el filtro trabaja con el mismo hash de 64 bits que guarda la
+tabla, no depende de h1/h2 y se reconstruye sin volver a hashear
+ninguna clave. La posición alternativa es
+i2 = i1 XOR mezcla(huella), de modo que se puede calcular desde cualquiera
+de las dos sin conocer la clave: al insertar en un bucket lleno se
+desaloja una huella a su otra posición, como en el cuckoo hashing.
+"""
+
+import math
+import random
+from array import array
+from typing import Dict, Tuple
+
+from .hash_functions import MASK64
+
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+DEFAULT_BUCKET_SIZE = 4
+
+# Ocupación máxima que alcanza cada tamaño de bucket antes de que las
+# inserciones empiecen a fallar (Fan et al., "Cuckoo Filter", 2014)
+MAX_LOAD = {2: 0.8, 4: 0.9, 8: 0.95}
+
+# Desalojos antes de dar el filtro por lleno
+MAX_KICKS = 500
+
+# Array más estrecho que admite cada ancho de huella
+_TYPECODES = ((8, 'B'), (16, 'H'), (32, 'I'))
+
+# Multiplicador de Fibonacci (2^64 / φ): mezcla los bits del hash hacia los altos
+_FIBONACCI = 0x9E3779B97F4A7C15
+
+# Constante de mezcla de la posición alternativa (MurmurHash2)
+_ALT_MULTIPLIER = 0x5BD1E995
+
+
+class CuckooFilter:
+    """
+    Filtro de pertenencia aproximada con borrado, sobre hashes de 64 bits.
+    
+    Args:
+        capacity: Huellas que debe admitir sin llenarse (>= 1).
+        false_positive_rate: Tasa de falsos positivos objetivo en (0, 1);
+                             fija el ancho de la huella y con él la memoria.
+        bucket_size: Huellas por bucket (2, 4 u 8). Buckets mayores admiten
+                     más ocupación pero necesitan huellas más anchas.
+    
+    Raises:
+        ValueError: Si algún parámetro está fuera de rango o la tasa pide
+                    huellas de más de 32 bits.
+    """
+
+    def __init__(self, capacity: int, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                 bucket_size: int = DEFAULT_BUCKET_SIZE):
+        """
+        Crea un filtro vacío.
+        
+        Args:
+            capacity: Huellas que debe admitir.
+            false_positive_rate: Tasa de falsos positivos objetivo.
+            bucket_size: Huellas por bucket.
+        
+        Raises:
+            ValueError: Si algún parámetro no es válido.
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity debe ser mayor a 0. Recibido: {capacity}")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"false_positive_rate debe estar en (0, 1). Recibido: {false_positive_rate}")
+        if bucket_size not in MAX_LOAD:
+            raise ValueError(f"bucket_size debe ser uno de {tuple(MAX_LOAD)}. Recibido: {bucket_size}")
+
+        # Una búsqueda compara con 2 * bucket_size huellas de 2^f - 1 posibles
+        bits = max(4, math.ceil(math.log2(2 * bucket_size / false_positive_rate)))
+        typecode = next((code for width, code in _TYPECODES if bits <= width), None)
+        if typecode is None:
+            raise ValueError(f"false_positive_rate={false_positive_rate} requiere huellas de "
+                             f"{bits} bits (máximo 32)")
+
+        index_bits = 0
+        while (1 << index_bits) * bucket_size * MAX_LOAD[bucket_size] < capacity:
+            index_bits += 1
+        buckets = 1 << index_bits
+
+        self.false_positive_rate = false_positive_rate
+        self.bucket_size = bucket_size
+        self.fingerprint_bits = bits
+        self.buckets = buckets
+        self.capacity = buckets * bucket_size
+        self.max_count = int(self.capacity * MAX_LOAD[bucket_size])
+        self.count = 0
+        self._fingerprint_mask = (1 << bits) - 1
+        self._bucket_mask = buckets - 1
+        # Bits del producto: [64 - index_bits, 64) para el bucket y los
+        # fingerprint_bits anteriores para la huella
+        self._index_shift = 64 - index_bits
+        self._fingerprint_shift = self._index_shift - bits
+        self.slots = array(typecode, bytes(array(typecode).itemsize * self.capacity))
+        # Determinista: el mismo lote de hashes deja el mismo filtro
+        self._rng = random.Random(0)
+
+        # Contadores que actualiza la tabla (ver HashTable._search_hashed)
+        self.negatives = 0
+        self.false_positives = 0
+
+    def _locate(self, key_hash: int) -> Tuple[int, int, int]:
+        """
+        Huella y buckets candidatos de un hash.
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave.
+        
+        Returns:
+            Tupla (huella, i1, i2); la huella nunca es 0.
+        """
+        mixed = (key_hash * _FIBONACCI) & MASK64
+        fingerprint = (mixed >> self._fingerprint_shift) & self._fingerprint_mask or 1
+        i1 = mixed >> self._index_shift
+        return fingerprint, i1, (i1 ^ fingerprint * _ALT_MULTIPLIER) & self._bucket_mask
+
+    def _alternate(self, index: int, fingerprint: int) -> int:
+        """Otro bucket posible de una huella que está (o va) en index."""
+        return (index ^ fingerprint * _ALT_MULTIPLIER) & self._bucket_mask
+
+    # -------------------------
+    # Operaciones
+    # -------------------------
+    def contains_hash(self, key_hash: int) -> bool:
+        """
+        Indica si la clave de key_hash puede estar en la tabla.
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave.
+        
+        Returns:
+            False si seguro que no está; True si puede estar.
+        """
+        # _locate en línea: esta es la ruta de cada search
+        mixed = (key_hash * _FIBONACCI) & MASK64
+        fingerprint = (mixed >> self._fingerprint_shift) & self._fingerprint_mask or 1
+        index = mixed >> self._index_shift
+        size = self.bucket_size
+        slots = self.slots
+        start = index * size
+        if fingerprint in slots[start:start + size]:
+            return True
+        start = ((index ^ fingerprint * _ALT_MULTIPLIER) & self._bucket_mask) * size
+        return fingerprint in slots[start:start + size]
+
+    def add_hash(self, key_hash: int) -> bool:
+        """
+        Añade la huella de una clave.
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave.
+        
+        Returns:
+            True si se añadió. False si el filtro está lleno: o bien se
+            alcanzó max_count (sin cambios), o bien tras MAX_KICKS
+            desalojos se perdió una huella. En ambos casos hay que
+            reconstruirlo con más capacidad.
+        """
+        if self.count >= self.max_count:
+            return False
+        fingerprint, i1, i2 = self._locate(key_hash)
+        if self._put(i1, fingerprint) or self._put(i2, fingerprint):
+            return True
+
+        size = self.bucket_size
+        slots = self.slots
+        index = i1 if self._rng.random() < 0.5 else i2
+        for _ in range(MAX_KICKS):
+            pos = index * size + self._rng.randrange(size)
+            fingerprint, slots[pos] = slots[pos], fingerprint
+            index = self._alternate(index, fingerprint)
+            if self._put(index, fingerprint):
+                return True
+        return False
+
+    def _put(self, index: int, fingerprint: int) -> bool:
+        """Guarda fingerprint en un hueco libre del bucket index, si lo hay."""
+        slots = self.slots
+        start = index * self.bucket_size
+        for pos in range(start, start + self.bucket_size):
+            if slots[pos] == 0:
+                slots[pos] = fingerprint
+                self.count += 1
+                return True
+        return False
+
+    def remove_hash(self, key_hash: int) -> bool:
+        """
+        Quita una huella de la clave (que debe haberse añadido antes).
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave.
+        
+        Returns:
+            True si se encontró y quitó la huella.
+        """
+        fingerprint, i1, i2 = self._locate(key_hash)
+        slots = self.slots
+        size = self.bucket_size
+        for index in (i1, i2):
+            start = index * size
+            for pos in range(start, start + size):
+                if slots[pos] == fingerprint:
+                    slots[pos] = 0
+                    self.count -= 1
+                    return True
+        return False
+
+    # -------------------------
+    # Estadísticas
+    # -------------------------
+    def expected_false_positive_rate(self) -> float:
+        """
+        Probabilidad de que una clave ausente pase el filtro con la ocupación actual.
+        
+        Returns:
+            1 - (1 - 1/(2^f - 1))^(2 * bucket_size * ocupación).
+        """
+        compared = 2 * self.bucket_size * self.count / self.capacity
+        return 1.0 - (1.0 - 1.0 / self._fingerprint_mask) ** compared
+
+    def get_statistics(self) -> Dict[str, float]:
+        """
+        Devuelve la configuración, la ocupación y los contadores del filtro.
+        
+        Returns:
+            Diccionario con:
+                - entries, capacity, load_factor: Huellas, huecos y ocupación
+                - fingerprint_bits, bucket_size: Configuración
+                - memory_bytes, bits_per_entry: Memoria de las huellas
+                - target_false_positive_rate: Tasa pedida
+                - expected_false_positive_rate: Tasa teórica con la ocupación actual
+                - negatives: Búsquedas descartadas por el filtro
+                - false_positives: Búsquedas que pasaron el filtro sin estar la clave
+                - observed_false_positive_rate: false_positives / búsquedas de
+                  claves ausentes
+        """
+        memory = self.slots.itemsize * len(self.slots)
+        absent = self.negatives + self.false_positives
+        return {
+            'entries': self.count,
+            'capacity': self.capacity,
+            'load_factor': self.count / self.capacity,
+            'fingerprint_bits': self.fingerprint_bits,
+            'bucket_size': self.bucket_size,
+            'memory_bytes': memory,
+            'bits_per_entry': memory * 8 / self.count if self.count else 0.0,
+            'target_false_positive_rate': self.false_positive_rate,
+            'expected_false_positive_rate': self.expected_false_positive_rate(),
+            'negatives': self.negatives,
+            'false_positives': self.false_positives,
+            'observed_false_positive_rate': self.false_positives / absent if absent else 0.0,
+        }
+
+
+__all__ = ['DEFAULT_BUCKET_SIZE', 'DEFAULT_FALSE_POSITIVE_RATE', 'MAX_KICKS', 'MAX_LOAD', 'CuckooFilter']
@@ -0,0 +1,257 @@
+"""
+Funciones hash de strings intercambiables para HashTable.
+
+Todas convierten un string en un entero de 64 bits sin signo. Cada una tiene
+un nombre y un identificador numérico estable (hash_id) para poder guardarla
+junto a una tabla y reconstruirla después.
+
+Funciones incluidas:
+    - 'legacy'     : Σ (i+1)·ord(c), la conversión original del proyecto.
+                     Es el string_to_int de los cálculos de h1 de TEST.md; las
+                     permutaciones de un mismo nombre colisionan con facilidad.
+    - 'fnv1a'      : FNV-1a de 64 bits sobre los bytes UTF-8. Rápida y con
+                     buena dispersión; es la opción por defecto.
+    - 'siphash'    : SipHash-2-4 con una semilla secreta de 16 bytes. Un
+                     atacante que no conoce la semilla no puede fabricar
+                     nombres que colisionen (hash-flooding).
+    - 'polynomial' : hash polinómico (rolling hash) módulo 2^61 - 1.
+"""
+
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple, Type, Union
+
+
+MASK64 = (1 << 64) - 1
+
+
+class StringHasher(ABC):
+    """
+    Clase base: un callable str -> int de 64 bits con nombre e identificador.
+    
+    Las subclases con clave (keyed = True) reciben la semilla en el
+    constructor y la guardan en seed, que se persiste junto a la tabla; en
+    las demás seed es None.
+    """
+
+    name = 'custom'
+    hash_id = -1
+    keyed = False
+
+    def __init__(self) -> None:
+        self.seed: Optional[bytes] = None
+
+    @abstractmethod
+    def __call__(self, text: str) -> int:
+        """Hash de 64 bits sin signo de text."""
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"
+
+
+class LegacyHasher(StringHasher):
+    """Conversión original: suma de (posición + 1) × código del carácter."""
+
+    name = 'legacy'
+    hash_id = 0
+
+    def __call__(self, text: str) -> int:
+        total = 0
+        for i, ch in enumerate(text):
+            total += (i + 1) * ord(ch)
+        return total
+
+
+class FNV1aHasher(StringHasher):
+    """FNV-1a de 64 bits sobre la codificación UTF-8 del string."""
+
+    name = 'fnv1a'
+    hash_id = 1
+
+    OFFSET_BASIS = 0xcbf29ce484222325
+    PRIME = 0x100000001b3
+
+    def __call__(self, text: str) -> int:
+        h = self.OFFSET_BASIS
+        prime = self.PRIME
+        for byte in text.encode('utf-8'):
+            h = ((h ^ byte) * prime) & MASK64
+        return h
+
+
+class SipHasher(StringHasher):
+    """
+    SipHash-2-4 con semilla de 16 bytes (se genera una aleatoria si no se da).
+    
+    Args:
+        seed: Clave secreta de exactamente 16 bytes, o None.
+    
+    Raises:
+        ValueError: Si la semilla no tiene 16 bytes.
+    """
+
+    name = 'siphash'
+    hash_id = 2
+    keyed = True
+
+    def __init__(self, seed: Optional[bytes] = None):
+        if seed is None:
+            seed = os.urandom(16)
+        if len(seed) != 16:
+            raise ValueError(f"La semilla de SipHash debe tener 16 bytes. Recibido: {len(seed)}")
+        super().__init__()
+        self.seed = bytes(seed)
+        self._k0, self._k1 = struct.unpack('<QQ', self.seed)
+
+    def __call__(self, text: str) -> int:
+        return siphash24(self._k0, self._k1, text.encode('utf-8'))
+
+
+class PolynomialHasher(StringHasher):
+    """Hash polinómico h = Σ c_i · B^(n-1-i) mod (2^61 - 1)."""
+
+    name = 'polynomial'
+    hash_id = 3
+
+    MODULUS = (1 << 61) - 1
+    BASE = 1_000_003
+
+    def __call__(self, text: str) -> int:
+        h = 0
+        base = self.BASE
+        modulus = self.MODULUS
+        for ch in text:
+            h = (h * base + ord(ch)) % modulus
+        return h
+
+
+def _rotl(x: int, b: int) -> int:
+    return ((x << b) | (x >> (64 - b))) & MASK64
+
+
+def _sipround(v0: int, v1: int, v2: int, v3: int) -> Tuple[int, int, int, int]:
+    v0 = (v0 + v1) & MASK64
+    v1 = _rotl(v1, 13) ^ v0
+    v0 = _rotl(v0, 32)
+    v2 = (v2 + v3) & MASK64
+    v3 = _rotl(v3, 16) ^ v2
+    v0 = (v0 + v3) & MASK64
+    v3 = _rotl(v3, 21) ^ v0
+    v2 = (v2 + v1) & MASK64
+    v1 = _rotl(v1, 17) ^ v2
+    v2 = _rotl(v2, 32)
+    return v0, v1, v2, v3
+
+
+def siphash24(k0: int, k1: int, data: bytes) -> int:
+    """
+    SipHash-2-4 (Aumasson & Bernstein) en Python puro.
+    
+    Args:
+        k0: Primera mitad de la clave (64 bits, little-endian).
+        k1: Segunda mitad de la clave.
+        data: Mensaje a hashear.
+    
+    Returns:
+        Hash de 64 bits.
+    """
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+
+    length = len(data)
+    tail = length - (length % 8)
+    blocks = [int.from_bytes(data[off:off + 8], 'little') for off in range(0, tail, 8)]
+    blocks.append(((length & 0xff) << 56) | int.from_bytes(data[tail:], 'little'))
+
+    for m in blocks:
+        v3 ^= m
+        for _ in range(2):
+            v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+        v0 ^= m
+
+    v2 ^= 0xff
+    for _ in range(4):
+        v0, v1, v2, v3 = _sipround(v0, v1, v2, v3)
+
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+class _CallableHasher(StringHasher):
+    """Adapta un callable arbitrario str -> int (no persistible)."""
+
+    def __init__(self, func: Callable[[str], int]):
+        super().__init__()
+        self._func = func
+        self.name = getattr(func, '__name__', 'custom')
+
+    def __call__(self, text: str) -> int:
+        return self._func(text)
+
+
+# Funciones incorporadas, por nombre
+HASH_FUNCTIONS: Dict[str, Type[StringHasher]] = {
+    cls.name: cls for cls in (LegacyHasher, FNV1aHasher, SipHasher, PolynomialHasher)
+}
+
+
+def _build(cls: Type[StringHasher], seed: Optional[bytes]) -> StringHasher:
+    """Instancia cls pasándole seed sólo si es una función con clave."""
+    return cls(seed) if cls.keyed else cls()
+
+
+def make_hasher(spec: Union[str, StringHasher, Callable[[str], int]],
+                seed: Optional[bytes] = None) -> StringHasher:
+    """
+    Construye la función hash indicada.
+    
+    Args:
+        spec: Nombre de una función incorporada, una instancia de StringHasher
+              o cualquier callable str -> int.
+        seed: Semilla para las funciones con clave (ignorada por las demás).
+    
+    Returns:
+        Instancia de StringHasher lista para usar.
+    
+    Raises:
+        ValueError: Si el nombre no corresponde a ninguna función incorporada.
+        TypeError: Si spec no es un nombre ni un callable.
+    """
+    if isinstance(spec, StringHasher):
+        return spec
+    if isinstance(spec, str):
+        if spec not in HASH_FUNCTIONS:
+            raise ValueError(f"Función hash desconocida: {spec!r}. "
+                             f"Opciones: {', '.join(HASH_FUNCTIONS)}")
+        return _build(HASH_FUNCTIONS[spec], seed)
+    if callable(spec):
+        return _CallableHasher(spec)
+    raise TypeError(f"hash_function debe ser un nombre o un callable. Recibido: {type(spec).__name__}")
+
+
+def hasher_from_id(hash_id: int, seed: Optional[bytes] = None) -> StringHasher:
+    """
+    Reconstruye una función incorporada a partir de su hash_id.
+    
+    Args:
+        hash_id: Identificador guardado junto a la tabla.
+        seed: Semilla guardada (para 'siphash').
+    
+    Returns:
+        Instancia de StringHasher.
+    
+    Raises:
+        ValueError: Si el identificador no existe.
+    """
+    for cls in HASH_FUNCTIONS.values():
+        if cls.hash_id == hash_id:
+            return _build(cls, seed)
+    raise ValueError(f"Identificador de función hash desconocido: {hash_id}")
+
+
+__all__ = [
+    'MASK64', 'StringHasher', 'LegacyHasher', 'FNV1aHasher', 'SipHasher',
+    'PolynomialHasher', 'HASH_FUNCTIONS', 'make_hasher', 'hasher_from_id', 'siphash24'
+]
@@ -5,22 +5,52 @@ Implementación de una tabla hash que utiliza doble hashing para resolver colisi
 con un sistema de cursores para mantener referencias entre elementos relacionados
 y una lista de espacios libres para reutilizar slots eliminados.
 
-Estructura interna:
-    self.table: lista de diccionarios con campos:
-        - 'key'    : la clave original (int o str) almacenada
-        - 'value'  : el objeto/valor asociado
-        - 'status' : 'EMPTY' | 'OCCUPIED' | 'DELETED'
-        - 'cursor' : índice al siguiente elemento en la "cadena" (simula punteros)
+Estructura interna (ver slot_store.SlotStore):
+    self._store: arrays paralelos, uno por campo del slot:
+        - keys   : la clave original (int o str) almacenada
+        - values : el objeto/valor asociado
+        - status : bytearray con EMPTY | OCCUPIED | DELETED
+        - cursor : array('l') con el índice al siguiente elemento en la
+                   "cadena" (simula punteros); NIL (-1) equivale a None
     self.free_list: índice (cursor) al primer espacio libre (reciclado por borrados)
+    self.table: vista de solo lectura que expone cada slot como diccionario
+
+Redimensionamiento incremental:
+    Cuando el factor de carga (contando también los DELETED) supera
+    max_load_factor, o la proporción de DELETED supera max_tombstone_ratio,
+    se crea una tabla nueva de tamaño primo y la anterior se conserva como
+    "generación antigua". Cada insert/delete migra un número acotado de slots
+    de la generación antigua a la nueva, de modo que ninguna operación paga
+    el rehash completo. Mientras dura la migración, las búsquedas consultan
+    ambas generaciones.
 
 Principios:
 - Doble hashing: h(k, i) = (h1(k) + i * h2(k)) % size
-- h1 y h2 trabajan sobre una representación numérica de la clave
-- string_to_int convierte strings a enteros sin librerías externas
+- h1 y h2 trabajan sobre una representación numérica de 64 bits de la clave
+- string_to_int convierte strings a enteros con una función hash intercambiable
+  (ver hash_functions: 'fnv1a' por defecto, 'siphash', 'polynomial', 'legacy')
 - insert/search/delete respetan estados y actualizan cursores mínimamente
 """
 
-from typing import Optional, Union, Any
+import os
+import sys
+from math import gcd
+from typing import Optional, Union, Any, Callable, Iterable, Iterator, List, Tuple
+
+try:
+    import numpy as _np
+except ImportError:  # NumPy es opcional: sin él, las operaciones por lotes usan Python puro
+    _np = None
+
+from .cuckoo_filter import DEFAULT_BUCKET_SIZE, DEFAULT_FALSE_POSITIVE_RATE, CuckooFilter
+from .hash_functions import MASK64, StringHasher, make_hasher
+from .instrumentation import Hook, TableInstrumentation
+from .persistence import load_table, save_table
+from .wal import OP_DELETE, OP_INSERT, WriteAheadLog
+from .slot_store import (
+    DELETED, DICT_SLOT_BYTES, EMPTY, NIL, OCCUPIED, STATUS_NAMES,
+    SlotStore, TableView, cursor_or_none
+)
 
 
 # Constantes para los estados de las entradas
@@ -28,6 +58,139 @@ STATUS_EMPTY = 'EMPTY'
 STATUS_OCCUPIED = 'OCCUPIED'
 STATUS_DELETED = 'DELETED'
 
+# Políticas de inserción (parámetro probing)
+PROBING_DOUBLE = 'double'
+PROBING_ROBIN_HOOD = 'robin_hood'
+PROBING_MODES = (PROBING_DOUBLE, PROBING_ROBIN_HOOD)
+
+# Recorrido (ver scan): entradas por página de items/keys/values y bits de
+# la posición dentro del cursor (el resto es el número de generación)
+SCAN_PAGE = 256
+_CURSOR_POS_BITS = 32
+
+# Diagnóstico (display, show_collisions, show_double_hashing_process): filas
+# por página por defecto y filtros de slots
+DISPLAY_PAGE = 100
+DISPLAY_ALL = 'all'
+DISPLAY_OCCUPIED = 'occupied'
+DISPLAY_COLLIDED = 'collided'
+DISPLAY_FILTERS = (DISPLAY_ALL, DISPLAY_OCCUPIED, DISPLAY_COLLIDED)
+
+
+def is_prime(n: int) -> bool:
+    """
+    Indica si n es primo (división por tentativa, suficiente para tamaños de tabla).
+    
+    Args:
+        n: Entero a comprobar.
+    
+    Returns:
+        True si n es primo.
+    """
+    if n < 2:
+        return False
+    if n < 4:
+        return True
+    if n % 2 == 0:
+        return False
+    d = 3
+    while d * d <= n:
+        if n % d == 0:
+            return False
+        d += 2
+    return True
+
+
+def probe_step(k: int, size: int) -> int:
+    """
+    Salto del doble hashing para la clave numérica k en una tabla de tamaño size.
+    
+    Usa los bits de k que h1 no consume (k // size) para repartir el salto
+    en [1, size-1]. Si size no es primo, avanza hasta el siguiente valor
+    coprimo con size: con gcd(step, size) = 1 la secuencia
+    (h1 + i·step) % size visita los size slots exactamente una vez.
+    
+    Args:
+        k: Representación numérica de la clave.
+        size: Tamaño de la tabla (generación) sobre la que se sondea.
+    
+    Returns:
+        Salto en [1, max(1, size-1)], coprimo con size.
+    """
+    if size <= 2:
+        return 1
+    step = 1 + (k // size) % (size - 1)
+    while gcd(step, size) != 1:
+        step = step + 1 if step < size - 1 else 1
+    return step
+
+
+def probe_attempt(pos: int, base_index: int, step: int, size: int) -> int:
+    """
+    Intento i en que la secuencia (base_index + i·step) % size pasa por pos.
+    
+    Resuelve i·step ≡ pos - base_index (mod size) con el inverso modular de
+    step, que existe porque probe_step lo elige coprimo con size: cuesta
+    O(log size) en lugar de recorrer la secuencia.
+    
+    Args:
+        pos: Slot de la tabla.
+        base_index: Posición base (h1) de la clave.
+        step: Salto (h2) de la clave.
+        size: Tamaño de la generación.
+    
+    Returns:
+        El intento i en [0, size).
+    """
+    return (pos - base_index) * pow(step, -1, size) % size
+
+
+def probe_plan(key_hashes: Union[list, Any], size: int) -> Tuple[List[int], List[int]]:
+    """
+    Calcula h1 y h2 de muchas claves a la vez para una tabla de tamaño size.
+    
+    Si key_hashes es un array uint64 de NumPy, el cálculo es vectorizado;
+    si es una lista, se hace clave a clave. El resultado es idéntico.
+    
+    Args:
+        key_hashes: Hashes de 64 bits (lista de int o array uint64).
+        size: Tamaño de la generación sobre la que se sondea.
+    
+    Returns:
+        Tupla (bases, steps) de listas de int, en el orden de key_hashes.
+    """
+    if _np is None or isinstance(key_hashes, list):
+        return ([k % size for k in key_hashes],
+                [probe_step(k, size) for k in key_hashes])
+
+    n = _np.uint64(size)
+    bases = (key_hashes % n).tolist()
+    if size <= 2:
+        return bases, [1] * len(bases)
+    steps = _np.uint64(1) + (key_hashes // n) % _np.uint64(size - 1)
+    # Con size primo todos los saltos son coprimos; si no, se corrigen uno a uno
+    steps = steps.tolist()
+    if not is_prime(size):
+        for idx in _np.flatnonzero(_np.gcd(_np.asarray(steps, dtype=_np.int64), size) != 1).tolist():
+            steps[idx] = probe_step(int(key_hashes[idx]), size)
+    return bases, steps
+
+
+def next_prime(n: int) -> int:
+    """
+    Devuelve el menor primo mayor o igual que n.
+    
+    Args:
+        n: Cota inferior.
+    
+    Returns:
+        Primo p >= n.
+    """
+    candidate = max(2, n)
+    while not is_prime(candidate):
+        candidate += 1
+    return candidate
+
 
 class HashTable:
     """
@@ -38,361 +201,1581 @@ class HashTable:
     y una lista de espacios libres para reutilizar slots eliminados.
     
     Args:
-        size: Tamaño de la tabla (debe ser un número primo para mejor distribución).
+        size: Tamaño inicial de la tabla (debe ser un número primo para mejor distribución).
               Por defecto es 11.
+        max_load_factor: Proporción máxima de slots usados (OCCUPIED + DELETED)
+              antes de crecer al siguiente primo. None desactiva el crecimiento
+              automático (insert devuelve False cuando la tabla se llena).
+        max_tombstone_ratio: Proporción máxima de slots DELETED
+              (deleted / total_slots) antes de compactar automáticamente la
+              tabla de forma incremental (ver compact). None lo desactiva.
+        migration_batch: Número mínimo de slots de la generación antigua que
+              se migran en cada insert/delete durante un redimensionamiento.
+        hash_function: Función para convertir strings a enteros: nombre de una
+              función incorporada ('fnv1a', 'siphash', 'polynomial', 'legacy')
+              o cualquier callable str -> int.
+        hash_seed: Semilla de 16 bytes para 'siphash' (aleatoria si es None).
+        validate_probes: Si es True, cada inserción comprueba que la secuencia
+              de probes de la clave cubre todos los slots (modo depuración, O(size)).
+        probing: 'double' (por defecto) o 'robin_hood'. En modo Robin Hood una
+              clave que llega con más probes desplaza a la residente que tiene
+              menos y sigue insertando a la desplazada, lo que acota la
+              varianza de las longitudes de probe; las búsquedas se detienen
+              al ver un slot con distancia menor que el intento actual.
     
     Raises:
-        ValueError: Si el tamaño es menor o igual a 0.
+        ValueError: Si el tamaño es menor o igual a 0 o algún umbral es inválido.
     """
     
-    def __init__(self, size: int = 11):
+    def __init__(self, size: int = 11, max_load_factor: Optional[float] = 0.75,
+                 max_tombstone_ratio: Optional[float] = 0.25, migration_batch: int = 8,
+                 hash_function: Union[str, Callable[[str], int]] = 'fnv1a',
+                 hash_seed: Optional[bytes] = None, validate_probes: bool = False,
+                 probing: str = PROBING_DOUBLE):
         """
         Inicializa la tabla hash.
         
         Args:
-            size: Tamaño de la tabla (idealmente primo).
+            size: Tamaño inicial de la tabla (idealmente primo).
+            max_load_factor: Umbral de crecimiento en (0, 1], o None.
+            max_tombstone_ratio: Umbral de DELETED en (0, 1), o None.
+            migration_batch: Slots migrados por operación (>= 1).
+            hash_function: Función hash de strings (nombre o callable).
+            hash_seed: Semilla para funciones con clave.
+            validate_probes: Activa la verificación de cobertura de probes.
+            probing: Política de inserción ('double' o 'robin_hood').
         
         Raises:
-            ValueError: Si size <= 0.
+            ValueError: Si size <= 0, algún parámetro está fuera de rango,
+                        la función hash no existe o probing no es válido.
         """
         if size <= 0:
             raise ValueError(f"El tamaño de la tabla debe ser mayor a 0. Recibido: {size}")
+        if max_load_factor is not None and not 0 < max_load_factor <= 1:
+            raise ValueError(f"max_load_factor debe estar en (0, 1]. Recibido: {max_load_factor}")
+        if max_tombstone_ratio is not None and not 0 < max_tombstone_ratio < 1:
+            raise ValueError(f"max_tombstone_ratio debe estar en (0, 1). Recibido: {max_tombstone_ratio}")
+        if migration_batch <= 0:
+            raise ValueError(f"migration_batch debe ser mayor a 0. Recibido: {migration_batch}")
+        if probing not in PROBING_MODES:
+            raise ValueError(f"probing debe ser uno de {PROBING_MODES}. Recibido: {probing!r}")
+        # Robin Hood desplaza claves hasta dar con un EMPTY, que sólo está
+        # garantizado si la tabla crece antes de llenarse
+        if probing == PROBING_ROBIN_HOOD and max_load_factor is None:
+            raise ValueError("probing='robin_hood' requiere un max_load_factor")
+        
+        self.max_load_factor = max_load_factor
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.migration_batch = migration_batch
+        self.hasher: StringHasher = make_hasher(hash_function, hash_seed)
+        self.validate_probes = validate_probes
+        self.probing = probing
+        self._robin_hood = probing == PROBING_ROBIN_HOOD
+
+        # Arrays paralelos con key, value, status y cursor de cada slot.
+        # El inicio de la lista de espacios libres vive en store.free_head y
+        # los contadores (occupied, deleted, probes) en el propio store.
+        self._store = SlotStore(size)
+
+        # Generación antigua durante un redimensionamiento incremental.
+        # Sólo se drena: los slots migrados se marcan DELETED sin mantener
+        # cursores ni free_list, porque la tabla se descarta al terminar.
+        self._old: Optional[SlotStore] = None
+        self._migration_pos = 0
+        # Número de la generación actual; la antigua, si existe, es la
+        # anterior. Empieza en 1 para que esa anterior nunca sea negativa.
+        self._generation = 1
+        self._migration_step = migration_batch
+
+        # Write-ahead log opcional (ver attach_wal)
+        self.wal: Optional[WriteAheadLog] = None
+        self.snapshot_path: Optional[str] = None
+        self.checkpoint_every: Optional[int] = None
+
+        # Funciones avisadas tras cada insert/delete con éxito (ver add_listener)
+        self._listeners: List[Callable[[int, Union[int, str], Any], None]] = []
+
+        # Filtro cuckoo opcional para descartar claves ausentes (ver enable_filter)
+        self.key_filter: Optional[CuckooFilter] = None
+
+        # Medición opcional de probes y tiempos (ver enable_instrumentation)
+        self.instrumentation: Optional[TableInstrumentation] = None
+
+    @property
+    def _pending(self) -> int:
+        """Claves que siguen en la generación antigua (0 si no hay migración)."""
+        return self._old.occupied if self._old is not None else 0
+
+    @property
+    def size(self) -> int:
+        """Tamaño de la generación actual de la tabla."""
+        return self._store.size
+
+    @property
+    def free_list(self) -> Optional[int]:
+        """Cursor (índice) del primer espacio libre, o None si no hay."""
+        return cursor_or_none(self._store.free_head)
+
+    @property
+    def table(self) -> TableView:
+        """Vista de solo lectura de los slots como diccionarios key/value/status/cursor."""
+        return TableView(self._store)
+
+    # -------------------------
+    # Utilidades para claves
+    # -------------------------
+    def string_to_int(self, text: str) -> int:
+        """
+        Convierte un string a un entero usando la función hash configurada.
+        
+        Args:
+            text: String a convertir.
+        
+        Returns:
+            Entero de 64 bits que representa el string.
+        """
+        return self.hasher(text)
+
+    def normalize_numeric_key(self, key: Union[int, str]) -> int:
+        """
+        Devuelve la representación numérica de la clave.
+        
+        Args:
+            key: Clave que puede ser int o str.
+        
+        Returns:
+            Representación numérica de la clave.
+        
+        Raises:
+            TypeError: Si la clave no es int ni str.
+        """
+        if isinstance(key, str):
+            return self.string_to_int(key)
+        elif isinstance(key, int):
+            return int(key)
+        else:
+            raise TypeError(f"La clave debe ser int o str. Recibido: {type(key).__name__}")
+
+    def _hash(self, key: Union[int, str]) -> int:
+        """
+        Hash de 64 bits sin signo de la clave (el que se guarda en cada slot).
+        
+        Es normalize_numeric_key reducida a 64 bits; para enteros no negativos
+        menores que 2^64 coincide con la propia clave.
+        
+        Args:
+            key: Clave int o str.
+        
+        Returns:
+            Entero en [0, 2^64).
+        """
+        return self.normalize_numeric_key(key) & MASK64
+
+    def _hash_many(self, keys: List[Union[int, str]]) -> Union[list, Any]:
+        """
+        Hash de 64 bits de una lista de claves.
+        
+        Si NumPy está disponible y todas las claves son int, devuelve un array
+        uint64 (para que probe_plan vectorice h1/h2); en otro caso, una lista.
+        
+        Args:
+            keys: Claves int o str.
+        
+        Returns:
+            Array uint64 o lista de int con el hash de cada clave.
+        """
+        if _np is not None and keys and all(type(key) is int for key in keys):
+            try:
+                # int64 -> uint64 reinterpreta los negativos igual que & MASK64
+                return _np.array(keys, dtype=_np.int64).view(_np.uint64)
+            except OverflowError:
+                try:
+                    return _np.array(keys, dtype=_np.uint64)
+                except OverflowError:
+                    pass
+        return [self._hash(key) for key in keys]
+
+    # -------------------------
+    # Funciones hash h1 y h2
+    # -------------------------
+    def h1(self, key: Union[int, str]) -> int:
+        """
+        Primera función hash que devuelve la posición base.
+        
+        Calcula la posición inicial en la tabla usando el módulo del tamaño.
+        
+        Args:
+            key: Clave (int o str) a hashear.
+        
+        Returns:
+            Posición base en la tabla (0 a size-1).
+        """
+        return self._h1_for(self._hash(key), self.size)
+
+    def h2(self, key: Union[int, str]) -> int:
+        """
+        Segunda función hash para obtener el salto (step) en caso de colisión.
         
-        self.size = size
+        El salto está en [1, size-1] y es coprimo con size, así la secuencia
+        de probes recorre todos los slots antes de repetirse (ver probe_step).
+        
+        Args:
+            key: Clave (int o str) a hashear.
+        
+        Returns:
+            Valor del salto para resolver colisiones (siempre > 0).
+        """
+        return self._h2_for(self._hash(key), self.size)
+
+    @staticmethod
+    def _h1_for(k: int, size: int) -> int:
+        """
+        h1 para una clave ya normalizada y un tamaño dado.
+        
+        Args:
+            k: Representación numérica de la clave.
+            size: Tamaño de la tabla (generación) sobre la que se sondea.
+        
+        Returns:
+            Posición base (0 a size-1).
+        """
+        return k % size
+
+    # h2 para una clave ya normalizada y un tamaño dado
+    _h2_for = staticmethod(probe_step)
+
+    def hash_key(self, key: Union[int, str], i: int) -> int:
+        """
+        Hash completo para doble hashing.
+        
+        Calcula la posición usando la fórmula:
+            h(key, i) = (h1(key) + i * h2(key)) % size
+        
+        Args:
+            key: Clave a hashear.
+            i: Número de intento (0 para posición inicial, 1, 2, ... para colisiones).
+        
+        Returns:
+            Posición calculada en la tabla.
+        """
+        return (self.h1(key) + i * self.h2(key)) % self.size
+
+    def check_probe_coverage(self, key: Union[int, str]) -> bool:
+        """
+        Comprueba que la secuencia de probes de key visita todos los slots.
+        
+        Args:
+            key: Clave a comprobar.
+        
+        Returns:
+            True si (h1 + i·h2) % size, para i en [0, size), toca cada slot una vez.
+        """
+        return self._covers_all_slots(self._hash(key), self.size)
+
+    def _covers_all_slots(self, key_hash: int, size: int) -> bool:
+        """
+        Recorre la secuencia de probes completa y cuenta las posiciones distintas.
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave.
+            size: Tamaño de la generación.
+        
+        Returns:
+            True si se visitan los size slots.
+        """
+        base_index = self._h1_for(key_hash, size)
+        step = self._h2_for(key_hash, size)
+        visited = bytearray(size)
+        for i in range(size):
+            visited[(base_index + i * step) % size] = 1
+        return visited.count(1) == size
+
+    def _probe(self, store: SlotStore, key: Union[int, str], key_hash: int,
+               start: Optional[Tuple[int, int]] = None) -> Tuple[Optional[int], Optional[int], int]:
+        """
+        Recorre la secuencia de probes de key en una generación de la tabla.
+        
+        Se detiene al encontrar la clave o un EMPTY. Recuerda el primer DELETED
+        visto, que es donde insert debe reutilizar espacio.
+        
+        Args:
+            store: Generación a sondear (actual o antigua).
+            key: Clave original buscada.
+            key_hash: Hash de 64 bits de key (ver _hash).
+            start: (h1, h2) ya calculados para store.size, o None.
+        
+        Returns:
+            Tupla (found_pos, insert_pos, insert_i):
+                - found_pos: posición de la clave, o None si no está.
+                - insert_pos: posición donde insertarla (primer DELETED o EMPTY),
+                  o None si la secuencia no tiene huecos.
+                - insert_i: número de intento correspondiente a insert_pos.
+        """
+        if self._robin_hood:
+            return self._probe_robin_hood(store, key, key_hash, start)
+
+        size = store.size
+        status = store.status
+        hashes = store.hashes
+        keys = store.keys
+        if start is None:
+            base_index = self._h1_for(key_hash, size)
+            step = self._h2_for(key_hash, size)
+        else:
+            base_index, step = start
+
+        first_deleted_index = None
+        first_deleted_i = 0
+
+        for i in range(size):
+            pos = (base_index + i * step) % size
+            slot_status = status[pos]
+
+            if slot_status == OCCUPIED:
+                # Comparar el hash guardado evita la mayoría de comparaciones de strings
+                if hashes[pos] == key_hash and keys[pos] == key:
+                    return pos, None, 0
+                # Si ocupado con otra clave, seguimos sondando
+                continue
+
+            # Si encontramos un espacio DELETED, lo recordamos
+            if slot_status == DELETED:
+                if first_deleted_index is None:
+                    first_deleted_index = pos
+                    first_deleted_i = i
+                continue
+
+            # EMPTY puro: la clave no está más adelante
+            if first_deleted_index is not None:
+                return None, first_deleted_index, first_deleted_i
+            return None, pos, i
+
+        # Sin EMPTY en toda la secuencia; si hubo DELETED lo usamos
+        if first_deleted_index is not None:
+            return None, first_deleted_index, first_deleted_i
+        return None, None, 0
+
+    def _probe_robin_hood(self, store: SlotStore, key: Union[int, str], key_hash: int,
+                          start: Optional[Tuple[int, int]] = None) -> Tuple[Optional[int], Optional[int], int]:
+        """
+        Variante de _probe para el modo Robin Hood.
+        
+        Cada slot guarda en dist el intento con el que se colocó su clave, y
+        un DELETED conserva la del elemento borrado. Las inserciones nunca
+        bajan la distancia de un slot, de modo que si la clave buscada
+        estuviera más adelante, todos los slots anteriores de su secuencia
+        tendrían dist >= intento. Al ver dist < i la búsqueda puede parar.
+        
+        Un DELETED sólo se reutiliza con el mismo intento que guarda; un
+        OCCUPIED con dist < i es donde la clave nueva desplaza a la residente.
+        
+        Args:
+            store: Generación a sondear.
+            key: Clave original buscada.
+            key_hash: Hash de 64 bits de key.
+            start: (h1, h2) ya calculados para store.size, o None.
+        
+        Returns:
+            Igual que _probe; insert_pos puede ser un slot OCCUPIED que
+            _place tendrá que desalojar.
+        """
+        size = store.size
+        status = store.status
+        dist = store.dist
+        hashes = store.hashes
+        keys = store.keys
+        if start is None:
+            base_index = self._h1_for(key_hash, size)
+            step = self._h2_for(key_hash, size)
+        else:
+            base_index, step = start
 
-        # Cada entrada es un dict con: key, value, status, cursor
-        self.table = [
-            {
-                'key': None,
-                'value': None,
-                'status': STATUS_EMPTY,
-                'cursor': None
-            }
-            for _ in range(size)
-        ]
+        candidate_pos = None
+        candidate_i = 0
+        for i in range(size):
+            pos = (base_index + i * step) % size
+            slot_status = status[pos]
+            if slot_status == EMPTY or dist[pos] < i:
+                # La clave no puede estar más adelante
+                if candidate_pos is None:
+                    return None, pos, i
+                return None, candidate_pos, candidate_i
+            if slot_status == OCCUPIED:
+                if hashes[pos] == key_hash and keys[pos] == key:
+                    return pos, None, 0
+            elif candidate_pos is None and dist[pos] == i:
+                candidate_pos = pos
+                candidate_i = i
+        return None, candidate_pos, candidate_i
+
+    def _robin_hood_slot(self, key_hash: int, first_i: int) -> Tuple[int, int]:
+        """
+        Busca dónde recolocar una clave desplazada, desde el intento first_i.
+        
+        Args:
+            key_hash: Hash de 64 bits de la clave desplazada.
+            first_i: Intento siguiente al que tenía.
+        
+        Returns:
+            Tupla (pos, i): EMPTY, DELETED con dist <= i u OCCUPIED con dist < i.
+        
+        Raises:
+            RuntimeError: Si la secuencia no tiene hueco (no ocurre mientras
+                          la carga esté por debajo de max_load_factor).
+        """
+        store = self._store
+        size = store.size
+        base_index = self._h1_for(key_hash, size)
+        step = self._h2_for(key_hash, size)
+        for i in range(first_i, size):
+            pos = (base_index + i * step) % size
+            slot_status = store.status[pos]
+            if slot_status == EMPTY or store.dist[pos] < i or (
+                    slot_status == DELETED and store.dist[pos] == i):
+                return pos, i
+        raise RuntimeError("No hay hueco para recolocar la clave desplazada")
 
-        # Cursor (índice) del inicio de la lista de espacios libres (por eliminaciones)
-        # Si no hay libres, es None
-        self.free_list: Optional[int] = None
+    # -------------------------
+    # Inserción
+    # -------------------------
+    def insert(self, key: Union[int, str], value: Any) -> bool:
+        """
+        Inserta (key, value) en la tabla usando double hashing y actualizando cursores.
+        
+        Si la clave ya existe, actualiza el valor. Si hay colisiones, utiliza
+        doble hashing para encontrar una posición libre. Reutiliza espacios DELETED
+        cuando es posible. Si la inserción supera max_load_factor, inicia un
+        redimensionamiento incremental al siguiente primo.
+        
+        Args:
+            key: Clave del elemento (puede ser str o int).
+            value: Valor asociado a la clave.
+        
+        Returns:
+            True si se insertó exitosamente, False si la tabla está llena
+            (sólo posible con max_load_factor=None).
+        """
+        return self._insert_hashed(key, value, self._hash(key))
+
+    def _insert_hashed(self, key: Union[int, str], value: Any, key_hash: int,
+                       start: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Cuerpo de insert con el hash (y opcionalmente h1/h2) ya calculados.
+        
+        Args:
+            key: Clave del elemento.
+            value: Valor asociado.
+            key_hash: Hash de 64 bits de key.
+            start: (h1, h2) para el tamaño actual, o None.
+        
+        Returns:
+            Igual que insert.
+        """
+        self._advance_migration()
+
+        found_pos, insert_pos, insert_i = self._probe(self._store, key, key_hash, start)
+
+        # Si la clave ya existe, actualizamos el valor
+        if found_pos is not None:
+            self._log_ahead(OP_INSERT, key, value)
+            self._store.values[found_pos] = value
+            self._notify(OP_INSERT, key, value)
+            return True
+
+        # Redimensionar no cambia el contenido: puede ir antes del log
+        if self._needs_growth(insert_pos):
+            self._start_resize(self._rehash_size(grow=True))
+            _, insert_pos, insert_i = self._probe(self._store, key, key_hash)
+
+        if insert_pos is None:
+            return False
+
+        # Una clave vive en una sola generación: si sigue en la antigua,
+        # la retiramos de allí y se inserta en la actual con el nuevo valor.
+        old_pos = None
+        if self._old is not None:
+            old_pos = self._probe(self._old, key, key_hash)[0]
+
+        self._log_ahead(OP_INSERT, key, value)
+        if old_pos is not None:
+            self._drain_old_slot(old_pos)
+        self._place(key, value, key_hash, insert_pos, insert_i)
+        # Una clave traída de la generación antigua ya tenía su huella
+        if self.key_filter is not None and old_pos is None and not self.key_filter.add_hash(key_hash):
+            self._rebuild_filter()
+        self._notify(OP_INSERT, key, value)
+        return True
+
+    def _place(self, key: Union[int, str], value: Any, key_hash: int,
+               insert_pos: int, insert_i: int) -> None:
+        """
+        Escribe (key, value) en insert_pos de la generación actual.
+        
+        Si el slot era DELETED lo desengancha de la free_list antes de
+        sobrescribir su cursor, y enlaza el elemento previo de la secuencia
+        de probes hacia la nueva posición. En modo Robin Hood insert_pos
+        puede estar OCCUPIED: su clave se desaloja y se recoloca.
+        
+        Args:
+            key: Clave original.
+            value: Valor asociado.
+            key_hash: Hash de 64 bits de key.
+            insert_pos: Posición devuelta por _probe.
+            insert_i: Número de intento de insert_pos.
+        """
+        store = self._store
+        if self.validate_probes and not self._covers_all_slots(key_hash, store.size):
+            raise RuntimeError(f"La secuencia de probes de {key!r} no cubre los {store.size} slots")
+
+        # Modo Robin Hood: la residente tiene menos probes; se la desaloja y
+        # se recoloca siguiendo su propia secuencia (puede desalojar a otra)
+        displaced = self._evict(insert_pos) if store.status[insert_pos] == OCCUPIED else None
+        self._write_slot(key, value, key_hash, insert_pos, insert_i)
+        while displaced is not None:
+            key, value, key_hash, prev_i = displaced
+            insert_pos, insert_i = self._robin_hood_slot(key_hash, prev_i + 1)
+            displaced = self._evict(insert_pos) if store.status[insert_pos] == OCCUPIED else None
+            self._write_slot(key, value, key_hash, insert_pos, insert_i)
+
+    def _evict(self, pos: int) -> Tuple[Union[int, str], Any, int, int]:
+        """
+        Saca la clave del slot OCCUPIED pos para que otra ocupe su lugar.
+        
+        Args:
+            pos: Posición en la generación actual.
+        
+        Returns:
+            Tupla (key, value, key_hash, intento) de la clave desalojada.
+        """
+        store = self._store
+        self._unlink_from_chain(pos)
+        store.occupied -= 1
+        store.forget_probe(store.dist[pos] + 1)
+        return store.keys[pos], store.values[pos], store.hashes[pos], store.dist[pos]
+
+    def _write_slot(self, key: Union[int, str], value: Any, key_hash: int,
+                    insert_pos: int, insert_i: int) -> None:
+        """
+        Escribe la entrada en un slot libre (o recién desalojado) y la enlaza.
+        
+        Args:
+            key: Clave original.
+            value: Valor asociado.
+            key_hash: Hash de 64 bits de key.
+            insert_pos: Posición destino.
+            insert_i: Número de intento de insert_pos.
+        """
+        store = self._store
+        if store.status[insert_pos] == DELETED:
+            self._remove_from_free_list(insert_pos)
+            store.deleted -= 1
+
+        store.keys[insert_pos] = key
+        store.values[insert_pos] = value
+        store.status[insert_pos] = OCCUPIED
+        store.cursor[insert_pos] = NIL
+        store.back[insert_pos] = NIL
+        store.hashes[insert_pos] = key_hash
+        store.dist[insert_pos] = insert_i
+        store.occupied += 1
+        store.record_probe(insert_i + 1)
+
+        # Actualizar cursor del elemento previo en la secuencia de probes (si existe)
+        if insert_i > 0:
+            base_index = self._h1_for(key_hash, store.size)
+            step = self._h2_for(key_hash, store.size)
+            self._update_previous_cursor(base_index, step, insert_i, insert_pos)
+
+    def _remove_from_free_list(self, pos: int) -> None:
+        """
+        Remueve un slot de la lista de espacios libres.
+        
+        Debe llamarse antes de sobrescribir la entrada, porque su cursor
+        es el enlace al siguiente espacio libre. O(1) gracias al back-cursor.
+        
+        Args:
+            pos: Posición a remover de la free_list.
+        """
+        store = self._store
+        prev_free = store.back[pos]
+        next_free = store.cursor[pos]
+        if prev_free == NIL:
+            # Si es el inicio de la lista, actualizamos el inicio
+            store.free_head = next_free
+        else:
+            store.cursor[prev_free] = next_free
+        if next_free != NIL:
+            store.back[next_free] = prev_free
+
+    def _push_free_list(self, pos: int) -> None:
+        """
+        Agrega un slot recién marcado DELETED al inicio de la free_list.
+        
+        Args:
+            pos: Posición a agregar.
+        """
+        store = self._store
+        head = store.free_head
+        store.cursor[pos] = head
+        store.back[pos] = NIL
+        if head != NIL:
+            store.back[head] = pos
+        store.free_head = pos
+
+    def _update_previous_cursor(self, base_index: int, step: int, current_i: int, insert_pos: int) -> None:
+        """
+        Actualiza el cursor del elemento previo en la secuencia de probes.
+        
+        Args:
+            base_index: Índice base calculado con h1.
+            step: Paso calculado con h2.
+            current_i: Índice actual en la secuencia de probes.
+            insert_pos: Posición donde se insertó el nuevo elemento.
+        """
+        store = self._store
+        j = current_i - 1
+        while j >= 0:
+            prev_pos = (base_index + j * step) % store.size
+            if store.status[prev_pos] == OCCUPIED:
+                # El antiguo sucesor de prev_pos se queda sin predecesor
+                old_next = store.cursor[prev_pos]
+                if old_next != NIL and store.back[old_next] == prev_pos:
+                    store.back[old_next] = NIL
+                store.cursor[prev_pos] = insert_pos
+                store.back[insert_pos] = prev_pos
+                break
+            j -= 1
+
+    # -------------------------
+    # Redimensionamiento incremental
+    # -------------------------
+    def _needs_growth(self, insert_pos: Optional[int]) -> bool:
+        """
+        Indica si insertar una clave nueva en insert_pos supera max_load_factor.
+        
+        Reutilizar un DELETED no aumenta los slots usados, así que sólo
+        cuenta la ocupación de un EMPTY, el desalojo de Robin Hood (la clave
+        desplazada acabará en otro hueco) o la falta total de hueco.
+        
+        Args:
+            insert_pos: Posición elegida por _probe (None si no hay hueco).
+        
+        Returns:
+            True si hay que redimensionar antes de insertar.
+        """
+        if self.max_load_factor is None:
+            return False
+        if insert_pos is None:
+            return True
+        if self._store.status[insert_pos] == DELETED:
+            return False
+        used = self._store.occupied + self._store.deleted + 1
+        return used > self.max_load_factor * self.size
+
+    def _rehash_size(self, grow: bool, incoming: int = 1) -> int:
+        """
+        Calcula el tamaño primo de la nueva generación.
+        
+        Al crecer, deja la carga en la mitad de max_load_factor; al limpiar
+        DELETED conserva el tamaño (o el siguiente primo si no lo era).
+        
+        Args:
+            grow: True si el motivo es la carga, False si son los DELETED.
+            incoming: Claves nuevas que se van a insertar (insert_many reserva
+                      espacio para todo el lote de una vez).
+        
+        Returns:
+            Nuevo tamaño (primo).
+        """
+        if not grow:
+            return next_prime(self.size)
+        occupied = self._store.occupied + self._pending
+        needed = int(2 * (occupied + incoming) / self.max_load_factor) + 1
+        return next_prime(max(self.size + 1, needed))
+
+    def _start_resize(self, new_size: int) -> None:
+        """
+        Convierte la tabla actual en generación antigua y crea una vacía.
+        
+        Si ya había una migración en curso, se completa primero. El ritmo de
+        migración se ajusta para que la generación antigua quede vacía antes
+        de que la nueva pueda alcanzar su propio umbral.
+        
+        Args:
+            new_size: Tamaño de la nueva generación.
+        """
+        if self._old is not None:
+            self._advance_migration(self._old.size)
+
+        self._old = self._store
+        self._migration_pos = 0
+        self._store = SlotStore(new_size)
+        self._generation += 1
+
+        limit = self.max_load_factor if self.max_load_factor is not None else 1.0
+        headroom = max(1, int(limit * new_size) - self._old.occupied)
+        self._migration_step = max(self.migration_batch, -(-self._old.size // headroom))
+
+    def _advance_migration(self, max_slots: Optional[int] = None) -> None:
+        """
+        Migra un lote acotado de slots de la generación antigua a la actual.
+        
+        Args:
+            max_slots: Slots a recorrer; por defecto el ritmo calculado en
+                       _start_resize.
+        """
+        old = self._old
+        if old is None:
+            return
+
+        end = min(old.size, self._migration_pos + (max_slots or self._migration_step))
+        for pos in range(self._migration_pos, end):
+            if old.status[pos] == OCCUPIED:
+                key, value, key_hash = old.keys[pos], old.values[pos], old.hashes[pos]
+                self._drain_old_slot(pos)
+                _, insert_pos, insert_i = self._probe(self._store, key, key_hash)
+                if insert_pos is None:
+                    raise RuntimeError("No hay espacio en la nueva generación durante la migración")
+                self._place(key, value, key_hash, insert_pos, insert_i)
+        self._migration_pos = end
+
+        if end >= old.size:
+            self._old = None
+
+    def _drain_old_slot(self, pos: int) -> None:
+        """
+        Retira una entrada de la generación antigua dejando un DELETED.
+        
+        El DELETED mantiene válidas las secuencias de probes de las claves
+        antiguas que aún no se han migrado.
+        
+        Args:
+            pos: Posición en la generación antigua.
+        """
+        old = self._old
+        old.status[pos] = DELETED
+        old.keys[pos] = None
+        old.values[pos] = None
+        old.cursor[pos] = NIL
+        old.back[pos] = NIL
+        old.occupied -= 1
+        old.deleted += 1
+        old.forget_probe(old.dist[pos] + 1)
+
+    # -------------------------
+    # Búsqueda
+    # -------------------------
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        """
+        Busca y retorna el value asociado a key.
+        
+        Sigue la misma secuencia de probes que insert. Si encuentra un espacio
+        EMPTY, significa que la clave no está en la tabla. Durante un
+        redimensionamiento consulta también la generación antigua.
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            El valor asociado a la clave si existe, None en caso contrario.
+        """
+        return self._search_hashed(key, self._hash(key))
+
+    def _search_hashed(self, key: Union[int, str], key_hash: int,
+                       start: Optional[Tuple[int, int]] = None) -> Optional[Any]:
+        """
+        Cuerpo de search con el hash (y opcionalmente h1/h2) ya calculados.
+        
+        Args:
+            key: Clave a buscar.
+            key_hash: Hash de 64 bits de key.
+            start: (h1, h2) para el tamaño actual, o None.
+        
+        Returns:
+            Igual que search.
+        """
+        key_filter = self.key_filter
+        if key_filter is not None and not key_filter.contains_hash(key_hash):
+            key_filter.negatives += 1
+            return None
+
+        pos = self._probe(self._store, key, key_hash, start)[0]
+        if pos is not None:
+            return self._store.values[pos]
+
+        old = self._old
+        if old is not None:
+            pos = self._probe(old, key, key_hash)[0]
+            if pos is not None:
+                return old.values[pos]
+
+        if key_filter is not None:
+            key_filter.false_positives += 1
+        return None
+
+    def probe_count(self, key: Union[int, str]) -> int:
+        """
+        Cuenta los slots que visita search(key) antes de terminar.
+        
+        Incluye el slot donde encuentra la clave o el EMPTY que detiene la
+        búsqueda. Durante un redimensionamiento suma los probes de ambas
+        generaciones si la clave no está en la actual.
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            Número de probes: 0 si el filtro de claves descarta key (search
+            no visita ningún slot), >= 1 en otro caso.
+        """
+        return self._trace_probes(key, self._hash(key))[0]
+
+    def _trace_probes(self, key: Union[int, str], key_hash: int,
+                      filtered: bool = True) -> Tuple[int, int]:
+        """
+        Recorre la secuencia de búsqueda de key sin modificar la tabla.
+        
+        Es el recorrido de search, que también hacen insert y delete antes
+        de escribir. Lo usan probe_count y la instrumentación.
+        
+        Args:
+            key: Clave a buscar.
+            key_hash: Hash de 64 bits de key.
+            filtered: Si es True y el filtro de claves descarta key_hash
+                      retorna (0, 0), como search, que entonces no recorre
+                      la tabla. insert y delete no consultan el filtro y
+                      lo trazan con False.
+        
+        Returns:
+            Tupla (probes, tombstones): slots visitados (incluido el que
+            detiene la búsqueda) y cuántos de ellos eran DELETED.
+        """
+        if filtered and self.key_filter is not None and not self.key_filter.contains_hash(key_hash):
+            return 0, 0
+        total = 0
+        tombstones = 0
+        for store in (self._store, self._old):
+            if store is None:
+                break
+            size = store.size
+            status = store.status
+            base_index = self._h1_for(key_hash, size)
+            step = self._h2_for(key_hash, size)
+            for i in range(size):
+                pos = (base_index + i * step) % size
+                total += 1
+                slot_status = status[pos]
+                if slot_status == EMPTY or (self._robin_hood and store.dist[pos] < i):
+                    break
+                if slot_status == DELETED:
+                    tombstones += 1
+                elif store.hashes[pos] == key_hash and store.keys[pos] == key:
+                    return total, tombstones
+        return total, tombstones
+
+    def _probe_distance(self, store: SlotStore, pos: int) -> int:
+        """
+        Recalcula el intento i en que la clave del slot pos cae en él.
+        
+        Args:
+            store: Generación que contiene el slot.
+            pos: Índice de un slot OCCUPIED.
+        
+        Returns:
+            El intento i (ver probe_attempt).
+        """
+        key_hash = store.hashes[pos]
+        return probe_attempt(pos, self._h1_for(key_hash, store.size),
+                             self._h2_for(key_hash, store.size), store.size)
+
+    # -------------------------
+    # Eliminación
+    # -------------------------
+    def delete(self, key: Union[int, str]) -> bool:
+        """
+        Elimina un elemento por key.
+        
+        Marca el slot como DELETED y lo agrega a la lista de espacios libres.
+        Mantiene la integridad de los cursores actualizando referencias. Si la
+        proporción de DELETED supera max_tombstone_ratio, inicia una
+        reconstrucción incremental de la tabla.
+        
+        Args:
+            key: Clave del elemento a eliminar.
+        
+        Returns:
+            True si se eliminó exitosamente, False si no se encontró.
+        """
+        return self._delete_hashed(key, self._hash(key))
+
+    def _delete_hashed(self, key: Union[int, str], key_hash: int,
+                       start: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Cuerpo de delete con el hash (y opcionalmente h1/h2) ya calculados.
+        
+        Args:
+            key: Clave a eliminar.
+            key_hash: Hash de 64 bits de key.
+            start: (h1, h2) para el tamaño actual, o None.
+        
+        Returns:
+            Igual que delete.
+        """
+        self._advance_migration()
+
+        store = self._store
+        pos = self._probe(store, key, key_hash, start)[0]
+        if pos is None:
+            if self._old is not None:
+                old_pos = self._probe(self._old, key, key_hash)[0]
+                if old_pos is not None:
+                    self._log_ahead(OP_DELETE, key)
+                    self._drain_old_slot(old_pos)
+                    if self.key_filter is not None:
+                        self.key_filter.remove_hash(key_hash)
+                    self._notify(OP_DELETE, key)
+                    return True
+            return False
+
+        self._log_ahead(OP_DELETE, key)
+
+        # Desenganchar pos de su cadena: el predecesor pasa a apuntar al sucesor
+        self._unlink_from_chain(pos)
+
+        # Marcar como DELETED y limpiar
+        store.status[pos] = DELETED
+        store.keys[pos] = None
+        store.values[pos] = None
+
+        # Insertar en lista de libres (al inicio)
+        self._push_free_list(pos)
+
+        store.occupied -= 1
+        store.deleted += 1
+        store.forget_probe(store.dist[pos] + 1)
+
+        if (self.max_tombstone_ratio is not None and self._old is None
+                and store.deleted > self.max_tombstone_ratio * self.size):
+            self.compact(incremental=True)
+
+        if self.key_filter is not None:
+            self.key_filter.remove_hash(key_hash)
+        self._notify(OP_DELETE, key)
+        return True
+
+    def _unlink_from_chain(self, pos: int) -> None:
+        """
+        Quita un elemento OCCUPIED de su cadena de cursores en O(1).
+        
+        El único cursor que puede apuntar a pos es el de back[pos]; se
+        redirige al sucesor de pos, como hacía el antiguo recorrido completo.
+        
+        Args:
+            pos: Posición que deja de estar ocupada.
+        """
+        store = self._store
+        prev_pos = store.back[pos]
+        next_pos = store.cursor[pos]
+        if prev_pos != NIL:
+            store.cursor[prev_pos] = next_pos
+        if next_pos != NIL:
+            store.back[next_pos] = prev_pos
+
+    # -------------------------
+    # Compactación
+    # -------------------------
+    def compact(self, incremental: bool = False) -> int:
+        """
+        Reconstruye la tabla sin slots DELETED.
+        
+        Reinserta las claves en una generación nueva del mismo tamaño, así
+        las secuencias de probes ya no atraviesan DELETED y la free_list y
+        los cursores empiezan de cero. Usa el mismo mecanismo que el
+        redimensionamiento: con incremental=True sólo lo inicia, y la
+        migración avanza con compact_step() o con los siguientes
+        insert/delete, sin bloquear la tabla durante la reconstrucción.
+        
+        Args:
+            incremental: Si es True, migra por lotes en lugar de todo de una vez.
+        
+        Returns:
+            Número de slots DELETED que se recuperan.
+        """
+        if self._old is not None:
+            self._advance_migration(self._old.size)
+        reclaimed = self._store.deleted
+        self._start_resize(self._rehash_size(grow=False))
+        if not incremental:
+            self._advance_migration(self._old.size)
+        return reclaimed
+
+    def compact_step(self, max_slots: Optional[int] = None) -> bool:
+        """
+        Avanza una compactación (o redimensionamiento) incremental en curso.
+        
+        Pensado para llamarse desde un bucle en segundo plano o en ratos
+        libres: cada llamada recorre como mucho max_slots slots antiguos.
+        
+        Args:
+            max_slots: Slots de la generación antigua a migrar; por defecto
+                       el ritmo calculado al iniciar la migración.
+        
+        Returns:
+            True si ya no queda nada por migrar.
+        """
+        self._advance_migration(max_slots)
+        return self._old is None
+
+    # -------------------------
+    # Persistencia
+    # -------------------------
+    def save(self, path: str) -> None:
+        """
+        Guarda un snapshot binario de la tabla (ver persistence).
+        
+        Conserva la disposición exacta de los slots, la free_list, los
+        cursores y una migración en curso. La escritura es atómica y el
+        fichero lleva un CRC-32.
+        
+        Args:
+            path: Ruta del snapshot.
+        
+        Raises:
+            ValueError: Si la función hash es un callable personalizado.
+        """
+        save_table(self, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'HashTable':
+        """
+        Carga una tabla guardada con save() sin rehashear ninguna clave.
+        
+        Args:
+            path: Ruta del snapshot.
+        
+        Returns:
+            Nueva tabla idéntica a la guardada.
+        
+        Raises:
+            ValueError: Si el fichero no es válido o el checksum no coincide.
+        """
+        return load_table(path, cls)
+
+    # -------------------------
+    # Write-ahead log
+    # -------------------------
+    def attach_wal(self, wal_path: str, snapshot_path: Optional[str] = None,
+                   sync_every: int = 1, sync_interval: Optional[float] = None,
+                   checkpoint_every: Optional[int] = None) -> int:
+        """
+        Reaplica el log de wal_path sobre la tabla y lo deja adjunto.
+        
+        A partir de aquí cada insert/delete con éxito añade un registro al
+        log (ver wal.WriteAheadLog).
+        
+        Args:
+            wal_path: Ruta del log (se crea si no existe).
+            snapshot_path: Snapshot que escribe checkpoint().
+            sync_every: Registros por fsync (group commit).
+            sync_interval: Segundos máximos entre fsync, o None.
+            checkpoint_every: Registros tras los que se hace un checkpoint
+                              automático (requiere snapshot_path), o None.
+        
+        Returns:
+            Número de registros reaplicados.
+        
+        Raises:
+            ValueError: Si ya hay un log adjunto o falta snapshot_path.
+        """
+        if self.wal is not None:
+            raise ValueError("La tabla ya tiene un write-ahead log adjunto")
+        if checkpoint_every is not None and snapshot_path is None:
+            raise ValueError("checkpoint_every requiere snapshot_path")
+        wal = WriteAheadLog(wal_path, sync_every=sync_every, sync_interval=sync_interval)
+        try:
+            replayed = wal.replay(self)
+        except BaseException:
+            wal.close()
+            raise
+        self.wal = wal
+        self.snapshot_path = snapshot_path
+        self.checkpoint_every = checkpoint_every
+        return replayed
+
+    def detach_wal(self) -> None:
+        """Sincroniza y cierra el log adjunto (si lo hay)."""
+        if self.wal is not None:
+            self.wal.close()
+            self.wal = None
+
+    def checkpoint(self) -> None:
+        """
+        Guarda un snapshot en snapshot_path y vacía el log.
+        
+        Si el proceso muere entre ambos pasos, el log se reaplica sobre el
+        snapshot nuevo, lo que deja la tabla con el mismo contenido.
+        
+        Raises:
+            ValueError: Si no hay log adjunto o no se indicó snapshot_path.
+        """
+        if self.wal is None or self.snapshot_path is None:
+            raise ValueError("checkpoint() requiere attach_wal(..., snapshot_path=...)")
+        self.wal.sync()
+        self.save(self.snapshot_path)
+        self.wal.truncate()
+
+    @classmethod
+    def recover(cls, snapshot_path: str, wal_path: str, sync_every: int = 1,
+                sync_interval: Optional[float] = None, checkpoint_every: Optional[int] = None,
+                **table_options: Any) -> 'HashTable':
+        """
+        Reconstruye la tabla tras un reinicio: último snapshot + log.
+        
+        Args:
+            snapshot_path: Snapshot de partida (si no existe se crea una
+                           tabla vacía con table_options).
+            wal_path: Log a reaplicar y adjuntar.
+            sync_every: Registros por fsync.
+            sync_interval: Segundos máximos entre fsync, o None.
+            checkpoint_every: Registros entre checkpoints automáticos, o None.
+            **table_options: Argumentos del constructor para una tabla nueva.
+        
+        Returns:
+            La tabla recuperada, con el log adjunto.
+        """
+        if os.path.exists(snapshot_path):
+            table = cls.load(snapshot_path)
+        else:
+            table = cls(**table_options)
+        table.attach_wal(wal_path, snapshot_path, sync_every=sync_every,
+                         sync_interval=sync_interval, checkpoint_every=checkpoint_every)
+        return table
+
+    def _log_ahead(self, op: int, key: Union[int, str], value: Any = None) -> None:
+        """
+        Registra una operación en el log adjunto antes de aplicarla.
+        
+        insert y delete la llaman antes de tocar los slots: si append falla
+        (un valor que pickle no serializa, disco lleno...) la excepción sale
+        con la tabla sin cambios y el log sin el registro, así que lo que hay
+        en memoria y lo que devuelve recover() siguen coincidiendo.
+        
+        Args:
+            op: OP_INSERT u OP_DELETE.
+            key: Clave de la operación.
+            value: Valor insertado.
+        """
+        if self.wal is not None:
+            self.wal.append(op, key, value)
+
+    def _notify(self, op: int, key: Union[int, str], value: Any = None) -> None:
+        """
+        Avisa a los listeners de una operación ya registrada y aplicada.
+        
+        Después hace el checkpoint automático si toca; va el último para que
+        un fallo al guardar el snapshot no deje a los listeners sin el aviso
+        de un cambio que la tabla y el log ya tienen.
+        
+        Args:
+            op: OP_INSERT u OP_DELETE.
+            key: Clave de la operación.
+            value: Valor insertado.
+        """
+        for listener in self._listeners:
+            listener(op, key, value)
+        wal = self.wal
+        if (wal is not None and self.checkpoint_every is not None
+                and wal.records >= self.checkpoint_every):
+            self.checkpoint()
 
     # -------------------------
-    # Utilidades para claves
+    # Filtro de claves ausentes
     # -------------------------
-    def string_to_int(self, text: str) -> int:
+    def enable_filter(self, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+                      bucket_size: int = DEFAULT_BUCKET_SIZE) -> None:
         """
-        Convierte un string a un entero de forma determinista sin librerías externas.
+        Crea un filtro cuckoo con las claves actuales y lo mantiene al día.
         
-        Utiliza la posición y el código ASCII de cada carácter para crear
-        un hash determinista que dispersa bien los valores.
+        Desde ese momento search (y search_many) consultan primero el
+        filtro: si la huella de la clave no está, devuelven None sin recorrer
+        ningún probe. insert y delete añaden y quitan huellas; cuando el
+        filtro se llena se reconstruye con el doble de capacidad a partir de
+        los hashes guardados en los slots. El filtro no se guarda en los
+        snapshots: tras load() hay que volver a activarlo.
         
         Args:
-            text: String a convertir.
+            false_positive_rate: Tasa de falsos positivos objetivo; fija los
+                                 bits por huella y con ellos la memoria.
+            bucket_size: Huellas por bucket (2, 4 u 8).
         
-        Returns:
-            Entero que representa el string.
+        Raises:
+            ValueError: Si algún parámetro no es válido.
         """
-        total = 0
-        for i, ch in enumerate(text):
-            total += (i + 1) * ord(ch)
-        return total
+        self.key_filter = self._build_filter(false_positive_rate, bucket_size)
 
-    def normalize_numeric_key(self, key: Union[int, str]) -> int:
+    def disable_filter(self) -> None:
+        """Descarta el filtro de claves ausentes."""
+        self.key_filter = None
+
+    def _stored_hashes(self) -> List[int]:
+        """Hashes de las claves de ambas generaciones, en orden de slot."""
+        hashes = []
+        for store in (self._store, self._old):
+            if store is not None:
+                status = store.status
+                stored = store.hashes
+                hashes.extend(stored[pos] for pos in range(store.size) if status[pos] == OCCUPIED)
+        return hashes
+
+    def _build_filter(self, false_positive_rate: float, bucket_size: int,
+                      min_capacity: int = 0) -> CuckooFilter:
         """
-        Devuelve la representación numérica de la clave.
+        Construye un filtro con todas las claves y margen para crecer.
         
         Args:
-            key: Clave que puede ser int o str.
+            false_positive_rate: Tasa objetivo.
+            bucket_size: Huellas por bucket.
+            min_capacity: Capacidad mínima.
         
         Returns:
-            Representación numérica de la clave.
-        
-        Raises:
-            TypeError: Si la clave no es int ni str.
+            Filtro con la huella de cada clave de la tabla.
         """
-        if isinstance(key, str):
-            return self.string_to_int(key)
-        elif isinstance(key, int):
-            return int(key)
-        else:
-            raise TypeError(f"La clave debe ser int o str. Recibido: {type(key).__name__}")
+        hashes = self._stored_hashes()
+        capacity = max(len(hashes) + len(hashes) // 4, min_capacity, 64)
+        while True:
+            key_filter = CuckooFilter(capacity, false_positive_rate, bucket_size)
+            if all(key_filter.add_hash(key_hash) for key_hash in hashes):
+                return key_filter
+            capacity = 2 * key_filter.max_count
+
+    def _rebuild_filter(self) -> None:
+        """Reconstruye el filtro lleno con el doble de capacidad (conserva los contadores)."""
+        old = self.key_filter
+        self.key_filter = self._build_filter(old.false_positive_rate, old.bucket_size,
+                                             min_capacity=2 * old.max_count)
+        self.key_filter.negatives = old.negatives
+        self.key_filter.false_positives = old.false_positives
 
     # -------------------------
-    # Funciones hash h1 y h2
+    # Instrumentación
     # -------------------------
-    def h1(self, key: Union[int, str]) -> int:
+    def enable_instrumentation(self, sample_every: int = 1,
+                               hooks: Optional[List[Hook]] = None) -> TableInstrumentation:
         """
-        Primera función hash que devuelve la posición base.
+        Empieza a medir probes, DELETED atravesados y tiempo de cada operación.
         
-        Calcula la posición inicial en la tabla usando el módulo del tamaño.
+        Cubre insert, search y delete en todas sus variantes (por lotes,
+        shards, ConcurrentHashTable). Desactivada no añade ningún coste
+        (ver instrumentation).
         
         Args:
-            key: Clave (int o str) a hashear.
+            sample_every: Mide una de cada sample_every llamadas.
+            hooks: Funciones (operación, probes, tombstones, ns) que reciben
+                   cada muestra, p. ej. para exportarla a un sistema de métricas.
         
         Returns:
-            Posición base en la tabla (0 a size-1).
+            La instrumentación: snapshot(), reset(), add_hook()...
+        
+        Raises:
+            ValueError: Si sample_every < 1.
         """
-        k = self.normalize_numeric_key(key)
-        return k % self.size
+        self.disable_instrumentation()
+        instrumentation = TableInstrumentation(sample_every, hooks)
+        instrumentation.install(self)
+        self.instrumentation = instrumentation
+        return instrumentation
 
-    def h2(self, key: Union[int, str]) -> int:
+    def disable_instrumentation(self) -> None:
+        """Deja de medir y restaura los métodos originales."""
+        if self.instrumentation is not None:
+            self.instrumentation.uninstall(self)
+            self.instrumentation = None
+
+    # -------------------------
+    # Listeners
+    # -------------------------
+    def add_listener(self, listener: Callable[[int, Union[int, str], Any], None]) -> None:
         """
-        Segunda función hash para obtener el salto (step) en caso de colisión.
+        Registra una función que se llama tras cada insert/delete con éxito.
         
-        Debe devolver un valor > 0 y preferiblemente coprimo con size.
-        Usa una fórmula que produce un número no nulo y preferentemente impar.
+        Recibe (op, key, value) con op = OP_INSERT u OP_DELETE (ver wal) y
+        value = None en los borrados. También la disparan insert_many,
+        delete_many y el log reaplicado por attach_wal; las migraciones y
+        compactaciones no, porque no cambian el contenido. Sirve para
+        invalidar cachés de valores derivados de la tabla.
         
         Args:
-            key: Clave (int o str) a hashear.
-        
-        Returns:
-            Valor del salto para resolver colisiones (siempre > 0).
+            listener: Función (op, key, value) -> None.
         """
-        k = self.normalize_numeric_key(key)
-        # Usamos un primo menor que self.size si es posible; aquí 7 es ejemplo
-        # Aseguramos que el resultado nunca sea 0.
-        step = 7 - (k % 7)
-        if step == 0:
-            step = 1
-        # Forzamos impar para mejorar el ciclo (opcional)
-        if step % 2 == 0:
-            step += 1
-            if step >= self.size:
-                # Ajustar si excede tamaño
-                step = 1
-        return step
+        self._listeners.append(listener)
 
-    def hash_key(self, key: Union[int, str], i: int) -> int:
+    def remove_listener(self, listener: Callable[[int, Union[int, str], Any], None]) -> None:
         """
-        Hash completo para doble hashing.
-        
-        Calcula la posición usando la fórmula:
-            h(key, i) = (h1(key) + i * h2(key)) % size
+        Deja de avisar a una función registrada con add_listener.
         
         Args:
-            key: Clave a hashear.
-            i: Número de intento (0 para posición inicial, 1, 2, ... para colisiones).
+            listener: Función registrada.
         
-        Returns:
-            Posición calculada en la tabla.
+        Raises:
+            ValueError: Si no estaba registrada.
         """
-        return (self.h1(key) + i * self.h2(key)) % self.size
+        self._listeners.remove(listener)
 
     # -------------------------
-    # Inserción
+    # Recorrido
     # -------------------------
-    def insert(self, key: Union[int, str], value: Any) -> bool:
+    def scan(self, cursor: int = 0, count: int = SCAN_PAGE) -> Tuple[int, List[Tuple[Union[int, str], Any]]]:
         """
-        Inserta (key, value) en la tabla usando double hashing y actualizando cursores.
+        Devuelve la siguiente página de entradas a partir de cursor.
         
-        Si la clave ya existe, actualiza el valor. Si hay colisiones, utiliza
-        doble hashing para encontrar una posición libre. Reutiliza espacios DELETED
-        cuando es posible.
+        Pensado para exportar por páginas sin copiar la tabla: cada llamada
+        recorre sólo los slots necesarios para llenar la página, y entre
+        llamadas la tabla puede modificarse. Garantías (como SCAN de Redis):
+        
+            - Una clave presente durante todo el recorrido se devuelve al
+              menos una vez.
+            - Una clave insertada o borrada durante el recorrido puede
+              aparecer o no.
+            - Una clave puede repetirse si la tabla crece o se compacta entre
+              dos páginas: el recorrido sigue por la generación antigua y
+              después recorre la nueva, adonde migran las claves.
+            - En modo Robin Hood una inserción puede desplazar claves dentro
+              de la tabla, así que con inserciones concurrentes una clave
+              también puede saltarse.
+        
+        El cursor codifica la generación y la posición. Si su generación ya
+        terminó de migrar, el recorrido vuelve a empezar por la generación
+        siguiente, que contiene todas sus claves. Si las compactaciones son
+        más frecuentes que un recorrido completo, éste puede no terminar:
+        usar páginas mayores o esperar a que acabe la migración en curso
+        (compact_step) antes de exportar.
         
         Args:
-            key: Clave del elemento (puede ser str o int).
-            value: Valor asociado a la clave.
+            cursor: 0 para empezar, o el cursor devuelto por la llamada anterior.
+            count: Máximo de entradas de la página (>= 1).
         
         Returns:
-            True si se insertó exitosamente, False si la tabla está llena.
+            Tupla (cursor, entradas): el cursor de la siguiente llamada (0 si
+            el recorrido terminó) y una lista de pares (clave, valor).
+        
+        Raises:
+            ValueError: Si count < 1 o cursor es negativo.
         """
-        numeric_key = self.normalize_numeric_key(key)
-        base_index = self.h1(numeric_key)
-        step = self.h2(numeric_key)
-
-        first_deleted_index = None
-
-        for i in range(self.size):
-            pos = (base_index + i * step) % self.size
-            entry = self.table[pos]
-
-            if entry['status'] == STATUS_OCCUPIED:
-                # Si la clave ya existe, actualizamos el valor
-                if entry['key'] == key:
-                    entry['value'] = value
-                    return True
-                # Si ocupado con otra clave, seguimos sondando
-                continue
+        if count < 1:
+            raise ValueError(f"count debe ser mayor a 0. Recibido: {count}")
+        if cursor < 0:
+            raise ValueError(f"cursor no puede ser negativo. Recibido: {cursor}")
 
-            # Si encontramos un espacio DELETED, lo recordamos
-            if entry['status'] == STATUS_DELETED and first_deleted_index is None:
-                first_deleted_index = pos
-
-            # Si encontramos un espacio EMPTY, insertamos
-            if entry['status'] == STATUS_EMPTY:
-                insert_pos = first_deleted_index if first_deleted_index is not None else pos
-
-                # Insertar en insert_pos
-                self.table[insert_pos] = {
-                    'key': key,
-                    'value': value,
-                    'status': STATUS_OCCUPIED,
-                    'cursor': None
-                }
-
-                # Si reusamos un DELETED, quitamoslo de la free_list si era el inicio
-                if first_deleted_index is not None:
-                    self._remove_from_free_list(insert_pos)
+        # Generaciones vivas en orden de recorrido: la antigua primero, para
+        # que una clave que migra mientras tanto se vea al recorrer la nueva
+        stores = [(self._generation, self._store)]
+        if self._old is not None:
+            stores.insert(0, (self._generation - 1, self._old))
 
-                # Actualizar cursor del elemento previo en la secuencia de probes (si existe)
-                if i > 0:
-                    self._update_previous_cursor(base_index, step, i, insert_pos)
+        index, pos = 0, 0
+        if cursor:
+            generation, pos = divmod(cursor - 1, 1 << _CURSOR_POS_BITS)
+            index = next((i for i, (number, _) in enumerate(stores) if number >= generation), None)
+            if index is None:
+                # Cursor de una generación posterior: la tabla se recargó
+                index, pos = 0, 0
+            elif stores[index][0] != generation:
+                pos = 0
 
-                return True
+        page = []
+        while index < len(stores):
+            generation, store = stores[index]
+            status, keys, values = store.status, store.keys, store.values
+            while len(page) < count:
+                pos = status.find(OCCUPIED, pos)
+                if pos < 0:
+                    break
+                page.append((keys[pos], values[pos]))
+                pos += 1
+            if len(page) == count and 0 <= pos < store.size:
+                return ((generation << _CURSOR_POS_BITS) | pos) + 1, page
+            index, pos = index + 1, 0
+            if len(page) == count and index < len(stores):
+                return (stores[index][0] << _CURSOR_POS_BITS) + 1, page
+        return 0, page
 
-        # Si llegamos acá, no encontramos EMPTY; pero si encontramos DELETED lo usamos
-        if first_deleted_index is not None:
-            insert_pos = first_deleted_index
-            self.table[insert_pos] = {
-                'key': key,
-                'value': value,
-                'status': STATUS_OCCUPIED,
-                'cursor': None
-            }
-            self._remove_from_free_list(insert_pos)
-            return True
+    def items(self) -> Iterator[Tuple[Union[int, str], Any]]:
+        """
+        Itera los pares (clave, valor) en orden de slot, sin copiar la tabla.
+        
+        Lee páginas de SCAN_PAGE entradas con scan, así que tolera que la
+        tabla se modifique entre una entrada y la siguiente con las mismas
+        garantías que scan.
+        
+        Yields:
+            Cada par (clave, valor).
+        """
+        cursor = 0
+        while True:
+            cursor, page = self.scan(cursor, SCAN_PAGE)
+            yield from page
+            if cursor == 0:
+                return
 
-        return False
+    def keys(self) -> Iterator[Union[int, str]]:
+        """
+        Itera las claves (ver items).
+        
+        Yields:
+            Cada clave almacenada.
+        """
+        for key, _ in self.items():
+            yield key
 
-    def _remove_from_free_list(self, pos: int) -> None:
+    def values(self) -> Iterator[Any]:
         """
-        Remueve un slot de la lista de espacios libres.
+        Itera los valores (ver items).
         
-        Args:
-            pos: Posición a remover de la free_list.
+        Yields:
+            Cada valor almacenado.
         """
-        if self.free_list == pos:
-            # Si es el inicio de la lista, actualizamos el inicio
-            self.free_list = self.table[pos]['cursor']
-        else:
-            # Si no es el inicio, buscamos el anterior en la lista
-            current = self.free_list
-            while current is not None:
-                if self.table[current]['cursor'] == pos:
-                    self.table[current]['cursor'] = self.table[pos]['cursor']
-                    break
-                current = self.table[current]['cursor']
+        for _, value in self.items():
+            yield value
 
-    def _update_previous_cursor(self, base_index: int, step: int, current_i: int, insert_pos: int) -> None:
+    def walk_chain(self, key: Union[int, str]) -> Iterator[Tuple[int, Union[int, str], Any]]:
         """
-        Actualiza el cursor del elemento previo en la secuencia de probes.
+        Sigue los cursores desde el slot de key hasta el final de su cadena.
+        
+        El cursor de un slot apunta a la siguiente clave cuya secuencia de
+        probes pasó por él (la que colisionó después). Cada paso lee la
+        tabla en ese momento: si se modifica durante el recorrido, la cadena
+        sigue los enlaces nuevos, y se detiene en el primer slot que ya no
+        esté OCCUPIED o tras visitar tantos slots como tiene la tabla.
         
         Args:
-            base_index: Índice base calculado con h1.
-            step: Paso calculado con h2.
-            current_i: Índice actual en la secuencia de probes.
-            insert_pos: Posición donde se insertó el nuevo elemento.
+            key: Clave por la que empieza la cadena.
+        
+        Yields:
+            Tuplas (posición, clave, valor), empezando por key. Nada si key
+            no está en la tabla.
         """
-        j = current_i - 1
-        while j >= 0:
-            prev_pos = (base_index + j * step) % self.size
-            if self.table[prev_pos]['status'] == STATUS_OCCUPIED:
-                self.table[prev_pos]['cursor'] = insert_pos
+        key_hash = self._hash(key)
+        for store in (self._store, self._old):
+            if store is None:
+                return
+            pos = self._probe(store, key, key_hash)[0]
+            if pos is not None:
                 break
-            j -= 1
+        else:
+            return
+
+        for _ in range(store.size):
+            if pos == NIL or store.status[pos] != OCCUPIED:
+                return
+            yield pos, store.keys[pos], store.values[pos]
+            pos = store.cursor[pos]
 
     # -------------------------
-    # Búsqueda
+    # Operaciones por lotes
     # -------------------------
-    def search(self, key: Union[int, str]) -> Optional[Any]:
+    def insert_many(self, items: Iterable[Tuple[Union[int, str], Any]]) -> List[bool]:
         """
-        Busca y retorna el value asociado a key.
+        Inserta muchos pares (key, value) de una vez.
         
-        Sigue la misma secuencia de probes que insert. Si encuentra un espacio
-        EMPTY, significa que la clave no está en la tabla.
+        Equivale a llamar insert para cada par en orden, pero hashea todas
+        las claves al principio (vectorizado con NumPy si las claves son int),
+        y reserva espacio para el lote completo con un único redimensionamiento
+        en lugar de crecer varias veces.
         
         Args:
-            key: Clave a buscar.
+            items: Pares (key, value).
         
         Returns:
-            El valor asociado a la clave si existe, None en caso contrario.
+            Lista con el resultado de insert para cada par, en el mismo orden.
         """
-        numeric_key = self.normalize_numeric_key(key)
-        base_index = self.h1(numeric_key)
-        step = self.h2(numeric_key)
-
-        for i in range(self.size):
-            pos = (base_index + i * step) % self.size
-            entry = self.table[pos]
-
-            # Si encontramos la clave ocupada, retornamos el valor
-            if entry['status'] == STATUS_OCCUPIED and entry['key'] == key:
-                return entry['value']
-
-            # Si llegamos a un EMPTY puro, la clave no está
-            if entry['status'] == STATUS_EMPTY:
-                return None
-
-            # Si es DELETED o OCCUPIED con otra clave, continuamos
-            # (el continue es implícito, pero lo dejamos para claridad)
+        items = list(items)
+        store = self._store
+        if (self.max_load_factor is not None and items
+                and store.occupied + store.deleted + len(items) > self.max_load_factor * self.size):
+            self._start_resize(self._rehash_size(grow=True, incoming=len(items)))
 
-        return None
+        values = [value for _, value in items]
+        return self._run_batch(
+            [key for key, _ in items],
+            lambda idx, key, key_hash, start: self._insert_hashed(key, values[idx], key_hash, start)
+        )
 
-    # -------------------------
-    # Eliminación
-    # -------------------------
-    def delete(self, key: Union[int, str]) -> bool:
+    def search_many(self, keys: Iterable[Union[int, str]]) -> List[Optional[Any]]:
         """
-        Elimina un elemento por key.
-        
-        Marca el slot como DELETED y lo agrega a la lista de espacios libres.
-        Mantiene la integridad de los cursores actualizando referencias.
+        Busca muchas claves de una vez.
         
         Args:
-            key: Clave del elemento a eliminar.
+            keys: Claves a buscar.
         
         Returns:
-            True si se eliminó exitosamente, False si no se encontró.
+            Lista con el valor de cada clave (None si no está), en el mismo orden.
         """
-        numeric_key = self.normalize_numeric_key(key)
-        base_index = self.h1(numeric_key)
-        step = self.h2(numeric_key)
-
-        for i in range(self.size):
-            pos = (base_index + i * step) % self.size
-            entry = self.table[pos]
-
-            # Si encontramos el elemento, lo eliminamos
-            if entry['status'] == STATUS_OCCUPIED and entry['key'] == key:
-                next_cursor = entry['cursor']
-                
-                # Marcar como DELETED y limpiar
-                self.table[pos]['status'] = STATUS_DELETED
-                self.table[pos]['key'] = None
-                self.table[pos]['value'] = None
-
-                # Insertar en lista de libres (al inicio)
-                self.table[pos]['cursor'] = self.free_list
-                self.free_list = pos
+        return self._run_batch(
+            list(keys),
+            lambda idx, key, key_hash, start: self._search_hashed(key, key_hash, start)
+        )
 
-                # Actualizar cualquier cursor que apuntara a pos
-                self._update_cursors_pointing_to(pos, next_cursor)
-
-                return True
-
-            # Si encontramos un EMPTY puro, no existe
-            if entry['status'] == STATUS_EMPTY:
-                return False
-
-        return False
+    def delete_many(self, keys: Iterable[Union[int, str]]) -> List[bool]:
+        """
+        Elimina muchas claves de una vez.
+        
+        Args:
+            keys: Claves a eliminar.
+        
+        Returns:
+            Lista con el resultado de delete para cada clave, en el mismo orden.
+        """
+        return self._run_batch(
+            list(keys),
+            lambda idx, key, key_hash, start: self._delete_hashed(key, key_hash, start)
+        )
 
-    def _update_cursors_pointing_to(self, old_pos: int, new_pos: Optional[int]) -> None:
+    def _run_batch(self, keys: List[Union[int, str]],
+                   operation: Callable[[int, Union[int, str], int, Tuple[int, int]], Any]) -> list:
         """
-        Actualiza todos los cursores que apuntaban a old_pos para que apunten a new_pos.
+        Aplica operation a cada clave con su hash y su (h1, h2) precalculados.
+        
+        h1 y h2 dependen del tamaño de la generación actual: si una operación
+        del lote la redimensiona, se recalculan para las claves restantes.
         
         Args:
-            old_pos: Posición antigua que ya no existe.
-            new_pos: Nueva posición a la que deben apuntar (puede ser None).
+            keys: Claves del lote.
+            operation: Función (índice, key, key_hash, (h1, h2)) -> resultado.
+        
+        Returns:
+            Lista con el resultado de cada operación, en orden.
         """
-        for entry in self.table:
-            if entry['cursor'] == old_pos:
-                entry['cursor'] = new_pos
+        hashes = self._hash_many(keys)
+        hash_list = hashes if isinstance(hashes, list) else hashes.tolist()
+
+        results = []
+        plan_size = 0
+        offset = 0
+        bases: List[int] = []
+        steps: List[int] = []
+        for idx, key in enumerate(keys):
+            if self.size != plan_size:
+                plan_size = self.size
+                offset = idx
+                bases, steps = probe_plan(hashes[idx:], plan_size)
+            j = idx - offset
+            results.append(operation(idx, key, hash_list[idx], (bases[j], steps[j])))
+        return results
 
     # -------------------------
     # Estadísticas y visualización
     # -------------------------
-    def get_statistics(self) -> dict:
+    def get_statistics(self, full_audit: bool = False) -> dict:
         """
-        Devuelve estadísticas de la tabla.
+        Devuelve estadísticas de la tabla en O(1).
+        
+        Los valores salen de los contadores que insert, delete y la migración
+        mantienen al día, sin recorrer los slots.
+        
+        Args:
+            full_audit: Si es True recorre además toda la tabla, recuenta los
+                        estados, la free_list y las distancias de probe, y
+                        añade el resultado en la clave 'audit' (O(n)).
         
         Returns:
             Diccionario con las siguientes claves:
@@ -401,58 +1784,279 @@ class HashTable:
                 - empty: Número de slots vacíos
                 - deleted: Número de slots eliminados
                 - load_factor: Factor de carga (occupied / total_slots)
+                - avg_probe_length: Probes medios de una búsqueda exitosa
+                - max_probe_length: Mayor número de probes de una clave
+                - resizing: True si hay una migración incremental en curso
+                - pending_migration: Claves que siguen en la generación antigua
+                - memory_bytes: Bytes de los arrays de slots (sin claves ni valores)
+                - memory_saved_bytes: Ahorro frente a un dict por slot
+                - key_filter: Sólo con el filtro activo (ver
+                  CuckooFilter.get_statistics)
+                - instrumentation: Sólo con la instrumentación activa (ver
+                  TableInstrumentation.snapshot)
+                - audit: Sólo con full_audit (ver _audit)
+        
+        occupied incluye las claves pendientes de migrar, para que refleje
+        el número real de elementos almacenados.
         """
-        occupied = sum(1 for entry in self.table if entry['status'] == STATUS_OCCUPIED)
-        empty = sum(1 for entry in self.table if entry['status'] == STATUS_EMPTY)
-        deleted = sum(1 for entry in self.table if entry['status'] == STATUS_DELETED)
+        store = self._store
+        occupied = store.occupied + self._pending
+        probe_sum = store.probe_sum
+        max_probe = store.max_probe
 
-        return {
+        memory = store.memory_bytes()
+        dict_layout = self.size * DICT_SLOT_BYTES
+        if self._old is not None:
+            probe_sum += self._old.probe_sum
+            max_probe = max(max_probe, self._old.max_probe)
+            memory += self._old.memory_bytes()
+            dict_layout += self._old.size * DICT_SLOT_BYTES
+
+        stats = {
             'total_slots': self.size,
             'occupied': occupied,
-            'empty': empty,
-            'deleted': deleted,
-            'load_factor': occupied / self.size if self.size > 0 else 0.0
+            'empty': self.size - store.occupied - store.deleted,
+            'deleted': store.deleted,
+            'load_factor': occupied / self.size if self.size > 0 else 0.0,
+            'avg_probe_length': probe_sum / occupied if occupied > 0 else 0.0,
+            'max_probe_length': max_probe,
+            'resizing': self._old is not None,
+            'pending_migration': self._pending,
+            'memory_bytes': memory,
+            'memory_saved_bytes': max(0, dict_layout - memory)
+        }
+        if self.key_filter is not None:
+            stats['key_filter'] = self.key_filter.get_statistics()
+        if self.instrumentation is not None:
+            stats['instrumentation'] = self.instrumentation.snapshot()
+        if full_audit:
+            stats['audit'] = self._audit(stats)
+        return stats
+
+    def _audit(self, stats: dict) -> dict:
+        """
+        Recalcula las estadísticas recorriendo los slots y las compara.
+        
+        Args:
+            stats: Estadísticas incrementales a verificar.
+        
+        Returns:
+            Diccionario con los recuentos reales ('occupied', 'empty',
+            'deleted', 'free_list_length', 'probe_sum', 'max_probe_length'
+            y, con filtro, 'filter_entries'), la lista 'mismatches' con los campos que no coinciden y
+            'consistent' (True si no hay ninguno).
+        """
+        store = self._store
+        status = store.status
+        occupied = status.count(OCCUPIED)
+        probe_sum = 0
+        max_probe = 0
+        for gen in (store, self._old):
+            if gen is None:
+                continue
+            for pos in range(gen.size):
+                if gen.status[pos] == OCCUPIED:
+                    length = self._probe_distance(gen, pos) + 1
+                    probe_sum += length
+                    max_probe = max(max_probe, length)
+        if self._old is not None:
+            occupied += self._old.status.count(OCCUPIED)
+
+        free_list_length = 0
+        cursor = store.free_head
+        while cursor != NIL and free_list_length <= store.size:
+            free_list_length += 1
+            cursor = store.cursor[cursor]
+
+        audit = {
+            'occupied': occupied,
+            'empty': status.count(EMPTY),
+            'deleted': status.count(DELETED),
+            'free_list_length': free_list_length,
+            'probe_sum': probe_sum,
+            'max_probe_length': max_probe,
         }
+        mismatches = [name for name in ('occupied', 'empty', 'deleted', 'max_probe_length')
+                      if audit[name] != stats[name]]
+        if free_list_length != audit['deleted']:
+            mismatches.append('free_list_length')
+        expected_sum = store.probe_sum + (self._old.probe_sum if self._old is not None else 0)
+        if probe_sum != expected_sum:
+            mismatches.append('probe_sum')
+        if self.key_filter is not None:
+            # Cada clave debe pasar el filtro y tener exactamente una huella
+            audit['filter_entries'] = self.key_filter.count
+            hashes = self._stored_hashes()
+            if (self.key_filter.count != len(hashes)
+                    or not all(self.key_filter.contains_hash(key_hash) for key_hash in hashes)):
+                mismatches.append('filter_entries')
+        audit['mismatches'] = mismatches
+        audit['consistent'] = not mismatches
+        return audit
+
+    def _display_positions(self, start: int, stop: Optional[int], only: str,
+                           limit: Optional[int]) -> Iterator[int]:
+        """
+        Valida los argumentos de una página y genera sus slots.
+        
+        Devuelve los slots de [start, stop) de la generación actual que
+        pasan el filtro. Con 'occupied' y 'collided' salta de un OCCUPIED al
+        siguiente con bytearray.find, así que recorrer una tabla grande casi
+        vacía no cuesta una iteración de Python por slot.
+        
+        Args:
+            start: Primer slot.
+            stop: Slot final (excluido), o None para llegar al final.
+            only: Uno de DISPLAY_FILTERS: 'all' (todos), 'occupied' o
+                  'collided' (claves fuera de su posición base).
+            limit: Filas por página (>= 1), o None.
+        
+        Returns:
+            Iterador de los índices de slot, en orden creciente.
+        
+        Raises:
+            ValueError: Si el filtro no existe o el rango o limit no son válidos.
+        """
+        if only not in DISPLAY_FILTERS:
+            raise ValueError(f"only debe ser uno de {DISPLAY_FILTERS}. Recibido: {only!r}")
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit debe ser mayor a 0 o None. Recibido: {limit}")
+        store = self._store
+        stop = store.size if stop is None else min(stop, store.size)
+        if start < 0 or stop < start:
+            raise ValueError(f"Rango de slots no válido: [{start}, {stop})")
+        if only == DISPLAY_ALL:
+            return iter(range(start, stop))
+        status = store.status
+        dist = store.dist
+        collided = only == DISPLAY_COLLIDED
+
+        def occupied() -> Iterator[int]:
+            pos = status.find(OCCUPIED, start, stop)
+            while pos != -1:
+                if not collided or dist[pos] > 0:
+                    yield pos
+                pos = status.find(OCCUPIED, pos + 1, stop)
+
+        return occupied()
+
+    @staticmethod
+    def _print_page(positions: Iterator[int], limit: Optional[int],
+                    print_row: Callable[[int], None]) -> Optional[int]:
+        """
+        Imprime filas a medida que llegan, hasta limit.
+        
+        Args:
+            positions: Slots a imprimir (ver _display_positions).
+            limit: Máximo de filas, o None para imprimirlas todas.
+            print_row: Imprime la fila de un slot.
+        
+        Returns:
+            El slot con el que empieza la página siguiente, o None si no quedan.
+        """
+        printed = 0
+        for pos in positions:
+            if printed == limit:
+                print(f"... página de {limit} filas completa; la siguiente empieza en start={pos}")
+                return pos
+            print_row(pos)
+            printed += 1
+        return None
 
-    def display(self) -> None:
+    def display(self, start: int = 0, stop: Optional[int] = None, only: str = DISPLAY_ALL,
+                limit: Optional[int] = DISPLAY_PAGE, summary_only: bool = False) -> Optional[int]:
         """
         Imprime el estado actual de la tabla hash de forma tabulada.
         
-        Muestra todas las entradas con su índice, clave, valor, estado y cursor.
-        También muestra información sobre la lista de espacios libres.
+        Muestra las entradas con su índice, clave, valor, estado y cursor
+        por páginas: cada fila se imprime según se lee, así que una tabla de
+        millones de slots se puede recorrer página a página pasando el valor
+        devuelto como start de la siguiente llamada. Al final resume los
+        estados del rango y la lista de espacios libres.
+        
+        Args:
+            start: Primer slot a mostrar.
+            stop: Slot final (excluido), o None para llegar al final.
+            only: Filtro de filas (ver DISPLAY_FILTERS).
+            limit: Filas por página, o None para mostrarlas todas.
+            summary_only: Si es True sólo imprime el resumen.
+        
+        Returns:
+            El start de la página siguiente, o None si no quedan filas.
+        
+        Raises:
+            ValueError: Si el filtro, el rango o limit no son válidos.
         """
+        positions = self._display_positions(start, stop, only, limit)
+        store = self._store
+        stop = store.size if stop is None else min(stop, store.size)
+
         print("\n" + "=" * 70)
         print("TABLA HASH CON DOBLE HASHING Y CURSORES")
         print("=" * 70)
-        print(f"{'Índice':<8} | {'Clave':<12} | {'Valor':<18} | {'Estado':<10} | {'Cursor':<8}")
-        print("-" * 70)
+        next_start = None
+        if not summary_only:
+            print(f"{'Índice':<8} | {'Clave':<12} | {'Valor':<18} | {'Estado':<10} | {'Cursor':<8}")
+            print("-" * 70)
 
-        for i, entry in enumerate(self.table):
-            key_str = str(entry['key']) if entry['key'] is not None else 'None'
-            value_str = str(entry['value']) if entry['value'] is not None else 'None'
-            cursor_str = str(entry['cursor']) if entry['cursor'] is not None else 'None'
+            def print_row(i: int) -> None:
+                key_str = str(store.keys[i]) if store.keys[i] is not None else 'None'
+                value_str = str(store.values[i]) if store.values[i] is not None else 'None'
+                cursor_str = str(store.cursor[i]) if store.cursor[i] != NIL else 'None'
+                status_str = STATUS_NAMES[store.status[i]]
+                print(f"{i:<8} | {key_str:<12} | {value_str:<18} | {status_str:<10} | {cursor_str:<8}")
 
-            print(f"{i:<8} | {key_str:<12} | {value_str:<18} | {entry['status']:<10} | {cursor_str:<8}")
+            next_start = self._print_page(positions, limit, print_row)
 
         print("-" * 70)
+        status = store.status
+        occupied = status.count(OCCUPIED, start, stop)
+        deleted = status.count(DELETED, start, stop)
+        print(f"Slots {start}..{stop - 1} de {store.size}: {occupied} OCCUPIED, {deleted} DELETED, "
+              f"{stop - start - occupied - deleted} EMPTY")
         if self.free_list is not None:
             print(f"Lista de espacios libres (cursor inicial): {self.free_list}")
         else:
             print("Lista de espacios libres: vacía")
+        if self._old is not None:
+            print(f"Redimensionamiento en curso: {self._pending} claves pendientes "
+                  f"en la generación anterior (tamaño {self._old.size})")
         print("=" * 70)
+        return next_start
 
-    def show_double_hashing_process(self, key: Union[int, str], value: Any = None) -> None:
+    def show_double_hashing_process(self, key: Union[int, str], value: Any = None, start: int = 0,
+                                    stop: Optional[int] = None, only: str = DISPLAY_ALL,
+                                    limit: Optional[int] = DISPLAY_PAGE,
+                                    summary_only: bool = False) -> Optional[int]:
         """
         Muestra visualmente el proceso de doble hashing para una clave.
         
         Muestra paso a paso cómo se calculan h1, h2 y las posiciones
         en caso de colisiones, ilustrando cómo funciona el doble hashing.
+        La secuencia de probes se imprime hasta limit intentos y la
+        visualización de la tabla es paginada como display: el intento de
+        cada slot sale del inverso modular de h2 (ver probe_attempt), sin
+        construir la secuencia completa.
         
         Args:
             key: Clave para la cual mostrar el proceso de hashing.
             value: Valor opcional para mostrar en el proceso.
+            start: Primer slot de la visualización en la tabla.
+            stop: Slot final (excluido) de la visualización, o None.
+            only: Filtro de filas de la visualización (ver DISPLAY_FILTERS).
+            limit: Filas por página de la secuencia y de la visualización,
+                   o None para mostrarlas todas.
+            summary_only: Si es True omite la secuencia y la visualización.
+        
+        Returns:
+            El start de la página siguiente de la visualización, o None si
+            no quedan filas.
+        
+        Raises:
+            ValueError: Si el filtro, el rango o limit no son válidos.
         """
-        numeric_key = self.normalize_numeric_key(key)
+        positions = self._display_positions(start, stop, only, limit)
+        numeric_key = self._hash(key)
         base_index = self.h1(key)
         step = self.h2(key)
         
@@ -462,7 +2066,7 @@ class HashTable:
         
         # Mostrar información de la clave
         print(f"\nClave: {key}")
-        print(f"Representación numérica: {numeric_key}")
+        print(f"Hash numérico ({self.hasher.name}): {numeric_key}")
         print(f"Tamaño de la tabla: {self.size}")
         
         # Calcular y mostrar h1
@@ -476,45 +2080,48 @@ class HashTable:
         print(f"\n{'─' * 70}")
         print("PASO 2: Calcular h2 (salto para colisiones)")
         print(f"{'─' * 70}")
-        k_mod_7 = numeric_key % 7
-        step_calc = 7 - k_mod_7
-        if step_calc == 0:
-            step_calc = 1
-        if step_calc % 2 == 0:
-            step_calc += 1
-            if step_calc >= self.size:
-                step_calc = 1
-        print(f"h2({key}) = 7 - ({numeric_key} % 7) = 7 - {k_mod_7} = {step_calc}")
-        if step_calc != step:
-            print(f"(Ajustado a impar si es necesario: {step})")
-        print(f"→ Salto (step): {step}")
+        if self.size <= 2:
+            print(f"h2({key}) = 1 (tabla de tamaño {self.size})")
+        else:
+            quotient = numeric_key // self.size
+            step_calc = 1 + quotient % (self.size - 1)
+            print(f"h2({key}) = 1 + ({numeric_key} // {self.size}) % ({self.size} - 1)"
+                  f" = 1 + {quotient % (self.size - 1)} = {step_calc}")
+            if step_calc != step:
+                print(f"(gcd({step_calc}, {self.size}) ≠ 1 → ajustado al siguiente coprimo: {step})")
+        print(f"→ Salto (step): {step}  (coprimo con {self.size}: recorre todos los slots)")
         
         # Mostrar secuencia de probes
-        print(f"\n{'─' * 70}")
-        print("PASO 3: Secuencia de posiciones (probes)")
-        print(f"{'─' * 70}")
-        print(f"Fórmula: pos = (h1 + i × h2) % size")
-        print(f"         pos = ({base_index} + i × {step}) % {self.size}")
-        print()
-        
-        print(f"{'Intento (i)':<12} | {'Cálculo':<25} | {'Posición':<12} | {'Estado':<15} | {'Acción'}")
-        print("-" * 70)
-        
+        if not summary_only:
+            print(f"\n{'─' * 70}")
+            print("PASO 3: Secuencia de posiciones (probes)")
+            print(f"{'─' * 70}")
+            print(f"Fórmula: pos = (h1 + i × h2) % size")
+            print(f"         pos = ({base_index} + i × {step}) % {self.size}")
+            print()
+
+            print(f"{'Intento (i)':<12} | {'Cálculo':<25} | {'Posición':<12} | {'Estado':<15} | {'Acción'}")
+            print("-" * 70)
+
+        # El recorrido sigue hasta el EMPTY aunque deje de imprimirse, para el resumen
+        store = self._store
         found = False
+        attempts = 0
         for i in range(self.size):
             pos = (base_index + i * step) % self.size
-            entry = self.table[pos]
+            slot_status = store.status[pos]
+            attempts = i + 1
             
             # Determinar estado y acción
-            if entry['status'] == STATUS_OCCUPIED:
-                if entry['key'] == key:
+            if slot_status == OCCUPIED:
+                if store.keys[pos] == key:
                     estado = "OCCUPIED (misma clave)"
                     accion = "Actualizar valor"
                     found = True
                 else:
-                    estado = f"OCCUPIED ({entry['key']})"
+                    estado = f"OCCUPIED ({store.keys[pos]})"
                     accion = "Colisión → siguiente"
-            elif entry['status'] == STATUS_EMPTY:
+            elif slot_status == EMPTY:
                 estado = "EMPTY"
                 accion = "✓ Insertar aquí" if not found else ""
                 if not found:
@@ -523,10 +2130,14 @@ class HashTable:
                 estado = "DELETED"
                 accion = "Puede reusar" if i == 0 or not found else ""
             
-            calculo = f"({base_index} + {i} × {step}) % {self.size}"
-            print(f"{i:<12} | {calculo:<25} | {pos:<12} | {estado:<15} | {accion}")
+            if not summary_only:
+                if limit is None or i < limit:
+                    calculo = f"({base_index} + {i} × {step}) % {self.size}"
+                    print(f"{i:<12} | {calculo:<25} | {pos:<12} | {estado:<15} | {accion}")
+                elif i == limit:
+                    print(f"... secuencia truncada tras {limit} intentos")
             
-            if found and entry['status'] == STATUS_EMPTY:
+            if found and slot_status == EMPTY:
                 break
         
         # Mostrar resumen
@@ -535,6 +2146,7 @@ class HashTable:
         print(f"{'─' * 70}")
         print(f"Posición base (h1): {base_index}")
         print(f"Salto (h2): {step}")
+        print(f"Intentos recorridos: {attempts}")
         print(f"Secuencia completa: ", end="")
         secuencia = [(base_index + i * step) % self.size for i in range(min(5, self.size))]
         print(" → ".join(map(str, secuencia)), end="")
@@ -542,6 +2154,9 @@ class HashTable:
             print(" → ...")
         else:
             print()
+        if summary_only:
+            print("=" * 70)
+            return None
         
         # Mostrar visualización de la tabla con la secuencia marcada
         print(f"\n{'─' * 70}")
@@ -550,33 +2165,35 @@ class HashTable:
         print(f"{'Índice':<8} | {'Estado':<12} | {'Clave':<15} | {'En secuencia?'}")
         print("-" * 70)
         
-        secuencia_completa = [(base_index + i * step) % self.size for i in range(self.size)]
-        for i in range(self.size):
-            entry = self.table[i]
-            estado = entry['status']
-            clave = str(entry['key']) if entry['key'] is not None else 'None'
-            
-            if i in secuencia_completa:
-                pos_en_secuencia = secuencia_completa.index(i)
-                en_secuencia = f"✓ (intento {pos_en_secuencia})"
-            else:
-                en_secuencia = ""
+        # step es coprimo con size: cada slot está en la secuencia una vez
+        inverse = pow(step, -1, self.size)
+
+        def print_row(i: int) -> None:
+            estado = STATUS_NAMES[store.status[i]]
+            clave = str(store.keys[i]) if store.keys[i] is not None else 'None'
+            en_secuencia = f"✓ (intento {(i - base_index) * inverse % self.size})"
             
             # Resaltar la posición base
             if i == base_index:
-                en_secuencia = f"★ BASE {en_secuencia}".strip()
+                en_secuencia = f"★ BASE {en_secuencia}"
             
             print(f"{i:<8} | {estado:<12} | {clave:<15} | {en_secuencia}")
-        
+
+        next_start = self._print_page(positions, limit, print_row)
         print("=" * 70)
+        return next_start
 
-    def demonstrate_collisions(self, keys: list) -> None:
+    def demonstrate_collisions(self, keys: list, pause: Optional[bool] = None) -> None:
         """
         Demuestra cómo se resuelven múltiples colisiones usando doble hashing.
         
         Args:
             keys: Lista de claves para insertar y mostrar el proceso de colisiones.
+            pause: Si es True, espera a que se pulse Enter entre inserciones.
+                   Por defecto sólo espera si la entrada estándar es una terminal.
         """
+        if pause is None:
+            pause = sys.stdin is not None and sys.stdin.isatty()
         print("\n" + "=" * 70)
         print("DEMOSTRACIÓN DE DOBLE HASHING CON COLISIONES")
         print("=" * 70)
@@ -603,8 +2220,11 @@ class HashTable:
             print(f"\nEstado actual de la tabla después de insertar {key}:")
             self.display()
             
-            if idx < len(keys):
-                input("\nPresiona Enter para continuar con la siguiente inserción...")
+            if pause and idx < len(keys):
+                try:
+                    input("\nPresiona Enter para continuar con la siguiente inserción...")
+                except EOFError:
+                    pause = False
         
         print(f"\n{'=' * 70}")
         print("DEMOSTRACIÓN COMPLETADA")
@@ -619,15 +2239,21 @@ class HashTable:
                 - collisions: Lista de colisiones detectadas
                 - total_collisions: Número total de colisiones
                 - collision_groups: Grupos de claves que colisionaron
+                - probing: Política de inserción ('double' o 'robin_hood')
+                - probe_distances: {distancia: claves}, donde la distancia es
+                  el intento i en que está cada clave (0 = posición base)
+                - mean_probe_distance: Distancia media
+                - probe_distance_variance: Varianza de la distancia
+                - max_probe_distance: Distancia máxima
         """
         collisions = []
         collision_groups = {}
         
         # Analizar cada elemento ocupado
-        for pos, entry in enumerate(self.table):
-            if entry['status'] == STATUS_OCCUPIED:
-                key = entry['key']
-                numeric_key = self.normalize_numeric_key(key)
+        store = self._store
+        for pos in range(store.size):
+            if store.status[pos] == OCCUPIED:
+                key = store.keys[pos]
                 base_index = self.h1(key)
                 
                 # Si la posición actual no es la posición base, hubo colisión
@@ -647,90 +2273,172 @@ class HashTable:
                         'position': pos
                     })
         
+        distances = self._probe_distance_histogram()
+        count = sum(distances.values())
+        mean = sum(d * n for d, n in distances.items()) / count if count else 0.0
+        variance = sum(n * (d - mean) ** 2 for d, n in distances.items()) / count if count else 0.0
+
         return {
             'collisions': collisions,
             'total_collisions': len(collisions),
-            'collision_groups': collision_groups
+            'collision_groups': collision_groups,
+            'probing': self.probing,
+            'probe_distances': distances,
+            'mean_probe_distance': mean,
+            'probe_distance_variance': variance,
+            'max_probe_distance': max(distances) if distances else 0
         }
 
-    def show_collisions(self) -> None:
+    def _probe_distance_histogram(self) -> dict:
+        """
+        Junta los histogramas de probes de las dos generaciones.
+        
+        Returns:
+            Diccionario ordenado {distancia: número de claves}, sin ceros.
+        """
+        hist = {}
+        for store in (self._store, self._old):
+            if store is None:
+                continue
+            for length, n in enumerate(store.probe_hist):
+                if n:
+                    hist[length - 1] = hist.get(length - 1, 0) + n
+        return dict(sorted(hist.items()))
+
+    def show_collisions(self, start: int = 0, stop: Optional[int] = None, only: str = DISPLAY_ALL,
+                        limit: Optional[int] = DISPLAY_PAGE, summary_only: bool = False) -> Optional[int]:
         """
         Muestra información detallada sobre las colisiones en la tabla hash.
         
-        Analiza la tabla y muestra qué claves tuvieron colisiones,
-        en qué posición base deberían estar y dónde están realmente.
+        Muestra la distribución de distancias de probe y qué claves tuvieron
+        colisiones, en qué posición base deberían estar y dónde están
+        realmente. Es paginado como display: cada llamada muestra una
+        página de la tabla detallada (limit filas desde start) y las
+        colisiones de los mismos slots, y devuelve el start de la página
+        siguiente. Las distancias y el resumen salen de los contadores de la
+        tabla (sin analyze_collisions, que construye la lista de todas las
+        colisiones) y sólo se imprimen en la primera página (start=0).
+        
+        Args:
+            start: Primer slot de la página.
+            stop: Slot final (excluido) del recorrido, o None.
+            only: Filtro de la tabla detallada (ver DISPLAY_FILTERS).
+            limit: Filas de la tabla detallada por página, o None para
+                   mostrarlas todas.
+            summary_only: Si es True sólo imprime las distancias y el
+                          resumen, en cualquier página.
+        
+        Returns:
+            El start de la página siguiente, o None si no quedan filas.
+        
+        Raises:
+            ValueError: Si el filtro, el rango o limit no son válidos.
         """
-        analysis = self.analyze_collisions()
+        positions = self._display_positions(start, stop, only, limit)
+        store = self._store
+        stop = store.size if stop is None else min(stop, store.size)
+        # Claves de la generación actual fuera de su posición base (distancia > 0)
+        total_collisions = sum(store.probe_hist[2:])
         
         print("\n" + "=" * 70)
         print("ANÁLISIS DE COLISIONES EN LA TABLA HASH")
         print("=" * 70)
+
+        if start == 0 or summary_only:
+            distances = self._probe_distance_histogram()
+            if distances:
+                total = sum(distances.values())
+                mean = sum(d * n for d, n in distances.items()) / total
+                variance = sum(n * (d - mean) ** 2 for d, n in distances.items()) / total
+                print(f"\n📏 DISTANCIA DE PROBE (modo {self.probing})")
+                print(f"{'─' * 70}")
+                print(f"Media: {mean:.2f}  |  Varianza: {variance:.2f}  |  Máxima: {max(distances)}")
+                for distance, n in distances.items():
+                    bar = '█' * max(1, round(40 * n / total))
+                    print(f"  i = {distance:<4} | {n:>7} ({n / total:>6.1%}) {bar}")
+
+            if total_collisions:
+                print(f"\n📊 RESUMEN")
+                print(f"{'─' * 70}")
+                print(f"Total de colisiones detectadas: {total_collisions}")
+                print(f"Claves con colisiones: {total_collisions}")
         
-        if analysis['total_collisions'] == 0:
+        if total_collisions == 0:
             print("\n✓ No se detectaron colisiones.")
             print("Todas las claves están en su posición base calculada por h1.")
-        else:
-            print(f"\n📊 RESUMEN")
+            print("=" * 70)
+            return None
+        if summary_only:
+            print("=" * 70)
+            return None
+
+        # Filas de la página: a lo sumo limit posiciones, más la primera de la siguiente
+        next_start = None
+        end = stop
+        if limit is not None:
+            page = []
+            for pos in positions:
+                if len(page) == limit:
+                    next_start = end = pos
+                    break
+                page.append(pos)
+            positions = iter(page)
+        
+        # Colisiones de los slots de la página, agrupadas por posición base
+        groups = {}
+        for pos in self._display_positions(start, end, DISPLAY_COLLIDED, None):
+            groups.setdefault(self._h1_for(store.hashes[pos], store.size), []).append(pos)
+        if groups:
+            print(f"\n📋 COLISIONES POR POSICIÓN BASE (slots {start}..{end - 1})")
             print(f"{'─' * 70}")
-            print(f"Total de colisiones detectadas: {analysis['total_collisions']}")
-            print(f"Claves con colisiones: {len(analysis['collisions'])}")
             
-            # Mostrar colisiones por grupo
-            if analysis['collision_groups']:
-                print(f"\n📋 COLISIONES POR POSICIÓN BASE")
-                print(f"{'─' * 70}")
+            for base_pos, group in sorted(groups.items()):
+                print(f"\nPosición base {base_pos} (h1 = {base_pos}):")
                 
-                for base_pos, keys in sorted(analysis['collision_groups'].items()):
-                    print(f"\nPosición base {base_pos} (h1 = {base_pos}):")
-                    
-                    # Encontrar la clave que está en la posición base
-                    base_key = None
-                    for pos, entry in enumerate(self.table):
-                        if pos == base_pos and entry['status'] == STATUS_OCCUPIED:
-                            base_key = entry['key']
-                            break
-                    
-                    if base_key:
-                        print(f"  ✓ Clave en posición base: {base_key}")
+                # Clave que está en la posición base
+                if store.status[base_pos] == OCCUPIED:
+                    print(f"  ✓ Clave en posición base: {store.keys[base_pos]}")
+                
+                # Mostrar claves que colisionaron
+                for actual_pos in group:
+                    key = store.keys[actual_pos]
+                    step = self._h2_for(store.hashes[actual_pos], store.size)
+                    offset = (actual_pos - base_pos) % self.size
                     
-                    # Mostrar claves que colisionaron
-                    for item in keys:
-                        key = item['key']
-                        actual_pos = item['position']
-                        step = self.h2(key)
-                        offset = (actual_pos - base_pos) % self.size
-                        
-                        print(f"  → Colisión: {key}")
-                        print(f"    - Debería estar en: {base_pos} (h1({key}) = {base_pos})")
-                        print(f"    - Está en: {actual_pos}")
-                        print(f"    - Salto usado (h2): {step}")
-                        print(f"    - Offset: {offset}")
-                        
-                        # Mostrar la secuencia de probes
-                        secuencia = []
-                        for i in range(min(5, self.size)):
-                            probe_pos = (base_pos + i * step) % self.size
-                            secuencia.append(f"{probe_pos}")
-                        print(f"    - Secuencia de probes: {' → '.join(secuencia)}...")
-            
-            # Mostrar tabla detallada
-            print(f"\n{'─' * 70}")
-            print("TABLA DETALLADA CON COLISIONES")
-            print(f"{'─' * 70}")
-            print(f"{'Índice':<8} | {'Clave':<15} | {'h1 (base)':<12} | {'h2 (step)':<12} | {'¿Colisión?':<12}")
-            print("-" * 70)
-            
-            for pos, entry in enumerate(self.table):
-                if entry['status'] == STATUS_OCCUPIED:
-                    key = entry['key']
-                    base_pos = self.h1(key)
-                    step = self.h2(key)
-                    tiene_colision = "✓ SÍ" if pos != base_pos else "✗ NO"
+                    print(f"  → Colisión: {key}")
+                    print(f"    - Debería estar en: {base_pos} (h1({key}) = {base_pos})")
+                    print(f"    - Está en: {actual_pos} (intento {store.dist[actual_pos]})")
+                    print(f"    - Salto usado (h2): {step}")
+                    print(f"    - Offset: {offset}")
                     
-                    print(f"{pos:<8} | {str(key):<15} | {base_pos:<12} | {step:<12} | {tiene_colision:<12}")
-                elif entry['status'] == STATUS_DELETED:
-                    print(f"{pos:<8} | {'[DELETED]':<15} | {'-':<12} | {'-':<12} | {'-':<12}")
-                else:
-                    print(f"{pos:<8} | {'[EMPTY]':<15} | {'-':<12} | {'-':<12} | {'-':<12}")
+                    # Mostrar la secuencia de probes
+                    secuencia = []
+                    for i in range(min(5, self.size)):
+                        probe_pos = (base_pos + i * step) % self.size
+                        secuencia.append(f"{probe_pos}")
+                    print(f"    - Secuencia de probes: {' → '.join(secuencia)}...")
         
+        # Mostrar tabla detallada
+        print(f"\n{'─' * 70}")
+        print("TABLA DETALLADA CON COLISIONES")
+        print(f"{'─' * 70}")
+        print(f"{'Índice':<8} | {'Clave':<15} | {'h1 (base)':<12} | {'h2 (step)':<12} | {'¿Colisión?':<12}")
+        print("-" * 70)
+
+        for pos in positions:
+            slot_status = store.status[pos]
+            if slot_status == OCCUPIED:
+                key_hash = store.hashes[pos]
+                base_pos = self._h1_for(key_hash, store.size)
+                step = self._h2_for(key_hash, store.size)
+                tiene_colision = "✓ SÍ" if pos != base_pos else "✗ NO"
+                print(f"{pos:<8} | {str(store.keys[pos]):<15} | {base_pos:<12} | {step:<12} | {tiene_colision:<12}")
+            elif slot_status == DELETED:
+                print(f"{pos:<8} | {'[DELETED]':<15} | {'-':<12} | {'-':<12} | {'-':<12}")
+            else:
+                print(f"{pos:<8} | {'[EMPTY]':<15} | {'-':<12} | {'-':<12} | {'-':<12}")
+        if next_start is not None:
+            print(f"... página de {limit} filas completa; la siguiente empieza en start={next_start}")
+
         print("=" * 70)
+        return next_start
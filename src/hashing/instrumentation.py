@@ -0,0 +1,273 @@
+"""
+Instrumentación de insert, search y delete: probes, DELETED y tiempo.
+
+analyze_collisions describe dónde está cada clave; esta instrumentación
+mide lo que cuestan las operaciones en ejecución. Por cada operación
+muestreada registra:
+
+    - probes: slots visitados hasta encontrar la clave o un EMPTY (0 si
+      el filtro de claves descarta la búsqueda sin recorrer la tabla)
+    - tombstones: slots DELETED atravesados por el camino
+    - ns: tiempo de la operación (time.perf_counter_ns)
+
+y los acumula en histogramas por operación. Los hooks reciben además cada
+muestra, para exportarla a un sistema de métricas.
+
+Coste: HashTable.enable_instrumentation instala envoltorios como
+atributos de la instancia sobre _insert_hashed, _search_hashed y
+_delete_hashed. Todas las variantes (insert, insert_many, los shards,
+ConcurrentHashTable...) pasan por ellos. Con la instrumentación
+desactivada esos atributos no existen y las operaciones ejecutan el
+código de siempre, sin ninguna comprobación añadida. Activada, cada
+muestra recorre otra vez la secuencia de probes (ver
+HashTable._trace_probes) antes de la operación; sample_every reduce ese
+coste midiendo una de cada N llamadas.
+
+Con varios hilos (ConcurrentHashTable) los contadores son aproximados: se
+actualizan sin lock.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Operaciones instrumentadas: (nombre, método, posición de key_hash en sus
+# argumentos, si la operación consulta antes el filtro de claves)
+_OPERATIONS = (
+    ('insert', '_insert_hashed', 2, False),
+    ('search', '_search_hashed', 1, True),
+    ('delete', '_delete_hashed', 1, False),
+)
+
+# Firma de un hook: (operación, probes, tombstones, ns) -> None
+Hook = Callable[[str, int, int, int], None]
+
+
+class OperationStats:
+    """
+    Contadores e histogramas de una operación (insert, search o delete).
+    
+    Attributes:
+        calls: Llamadas totales (muestreadas o no).
+        samples: Llamadas medidas.
+        probes: Histograma {probes: muestras}.
+        tombstones: DELETED atravesados en total por las muestras.
+        total_ns: Tiempo total de las muestras.
+        max_ns: Tiempo de la muestra más lenta.
+        latency: Histograma {k: muestras con 2^(k-1) <= ns < 2^k}.
+    """
+
+    __slots__ = ('calls', 'samples', 'probes', 'tombstones', 'total_ns', 'max_ns', 'latency')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.samples = 0
+        self.probes: Dict[int, int] = {}
+        self.tombstones = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.latency: Dict[int, int] = {}
+
+    def record(self, probes: int, tombstones: int, elapsed_ns: int) -> None:
+        """
+        Añade una muestra.
+        
+        Args:
+            probes: Slots visitados.
+            tombstones: DELETED atravesados.
+            elapsed_ns: Duración de la operación.
+        """
+        self.samples += 1
+        self.probes[probes] = self.probes.get(probes, 0) + 1
+        self.tombstones += tombstones
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        self.latency[bucket] = self.latency.get(bucket, 0) + 1
+
+    def probe_percentile(self, fraction: float) -> int:
+        """
+        Menor número de probes que cubre la fracción dada de las muestras.
+        
+        Args:
+            fraction: Fracción en (0, 1], p. ej. 0.99.
+        
+        Returns:
+            El percentil, o 0 si no hay muestras.
+        """
+        if not self.samples:
+            return 0
+        needed = fraction * self.samples
+        seen = 0
+        for probes in sorted(self.probes):
+            seen += self.probes[probes]
+            if seen >= needed:
+                return probes
+        return max(self.probes)
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve los contadores como diccionario.
+        
+        Returns:
+            Diccionario con calls, samples, mean_probes, p50_probes,
+            p99_probes, max_probes, probe_histogram, tombstones_skipped,
+            mean_tombstones, mean_ns, max_ns y latency_histogram (clave:
+            límite superior en ns de cada cubo de potencia de 2).
+        """
+        samples = self.samples
+        probe_sum = sum(probes * count for probes, count in self.probes.items())
+        return {
+            'calls': self.calls,
+            'samples': samples,
+            'mean_probes': probe_sum / samples if samples else 0.0,
+            'p50_probes': self.probe_percentile(0.5),
+            'p99_probes': self.probe_percentile(0.99),
+            'max_probes': max(self.probes, default=0),
+            'probe_histogram': dict(sorted(self.probes.items())),
+            'tombstones_skipped': self.tombstones,
+            'mean_tombstones': self.tombstones / samples if samples else 0.0,
+            'mean_ns': self.total_ns / samples if samples else 0.0,
+            'max_ns': self.max_ns,
+            'latency_histogram': {1 << bucket: count for bucket, count in sorted(self.latency.items())},
+        }
+
+
+class TableInstrumentation:
+    """
+    Mide insert, search y delete de una HashTable (ver HashTable.enable_instrumentation).
+    
+    Args:
+        sample_every: Mide una de cada sample_every llamadas (>= 1).
+        hooks: Funciones (operación, probes, tombstones, ns) que reciben
+               cada muestra.
+    
+    Raises:
+        ValueError: Si sample_every < 1.
+    """
+
+    def __init__(self, sample_every: int = 1, hooks: Optional[List[Hook]] = None):
+        """
+        Crea contadores vacíos.
+        
+        Args:
+            sample_every: Período de muestreo.
+            hooks: Hooks iniciales.
+        
+        Raises:
+            ValueError: Si sample_every < 1.
+        """
+        if sample_every < 1:
+            raise ValueError(f"sample_every debe ser mayor a 0. Recibido: {sample_every}")
+        self.sample_every = sample_every
+        self.hooks: List[Hook] = list(hooks or [])
+        self.operations: Dict[str, OperationStats] = {name: OperationStats() for name, _, _, _ in _OPERATIONS}
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Registra una función que recibe cada muestra.
+        
+        Args:
+            hook: Función (operación, probes, tombstones, ns) -> None.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """
+        Quita un hook registrado.
+        
+        Args:
+            hook: Función registrada.
+        
+        Raises:
+            ValueError: Si no estaba registrada.
+        """
+        self.hooks.remove(hook)
+
+    def reset(self) -> None:
+        """Pone a cero todos los contadores (conserva los hooks)."""
+        self.operations = {name: OperationStats() for name in self.operations}
+
+    def snapshot(self) -> dict:
+        """
+        Devuelve los contadores de cada operación.
+        
+        Returns:
+            {operación: OperationStats.snapshot()} más 'sample_every'.
+        """
+        report: Dict[str, Any] = {name: stats.snapshot() for name, stats in self.operations.items()}
+        report['sample_every'] = self.sample_every
+        return report
+
+    # -------------------------
+    # Instalación
+    # -------------------------
+    def install(self, table: Any) -> None:
+        """
+        Envuelve los métodos *_hashed de table con la medición.
+        
+        Args:
+            table: HashTable (o subclase) a instrumentar.
+        """
+        for name, method, hash_arg, filtered in _OPERATIONS:
+            setattr(table, method, self._wrap(name, getattr(table, method), table, hash_arg, filtered))
+
+    @staticmethod
+    def uninstall(table: Any) -> None:
+        """
+        Devuelve a table sus métodos sin instrumentar.
+        
+        Args:
+            table: Tabla instrumentada con install.
+        """
+        for _, method, _, _ in _OPERATIONS:
+            # delattr y no table.__dict__: en CPython 3.11+ leer __dict__
+            # convierte los atributos de la instancia en un dict aparte y
+            # todos los accesos self.x posteriores serían más lentos
+            try:
+                delattr(table, method)
+            except AttributeError:
+                pass
+
+    def _wrap(self, name: str, operation: Callable[..., Any], table: Any,
+              hash_arg: int, filtered: bool) -> Callable[..., Any]:
+        """
+        Construye el envoltorio de una operación.
+        
+        Args:
+            name: Nombre de la operación.
+            operation: Método original (ligado a table).
+            table: Tabla instrumentada.
+            hash_arg: Posición de key_hash en los argumentos de operation.
+            filtered: Si operation termina sin recorrer la tabla cuando el
+                      filtro de claves descarta el hash (ver
+                      HashTable._trace_probes).
+        
+        Returns:
+            Función con la misma firma que operation.
+        """
+        trace = table._trace_probes
+        clock = time.perf_counter_ns
+        every = self.sample_every
+
+        def instrumented(*args: Any) -> Any:
+            # Se busca en cada llamada para que reset() surta efecto
+            stats = self.operations[name]
+            stats.calls += 1
+            if stats.calls % every:
+                return operation(*args)
+            # La secuencia se recorre antes de que la operación la modifique
+            probes, tombstones = trace(args[0], args[hash_arg], filtered)
+            started = clock()
+            result = operation(*args)
+            elapsed = clock() - started
+            stats.record(probes, tombstones, elapsed)
+            for hook in self.hooks:
+                hook(name, probes, tombstones, elapsed)
+            return result
+
+        return instrumented
+
+
+__all__ = ['Hook', 'OperationStats', 'TableInstrumentation']
@@ -0,0 +1,332 @@
+"""
+Tabla hash de solo lectura sobre un fichero mapeado en memoria (mmap).
+
+MappedHashTable busca directamente sobre las páginas del fichero: abrirla
+sólo lee la cabecera (O(1), sin deserializar nada) y varios procesos que
+abran el mismo fichero comparten esas páginas a través de la caché del
+sistema operativo. Las escrituras van por otro camino: se construye el
+fichero a partir de una HashTable con MappedHashTable.build() y los
+lectores lo recargan con refresh() cuando se reemplaza.
+
+Formato (enteros little-endian):
+
+    cabecera (128 bytes) : magic 'HTMM', versión, modo de probing, hash_id,
+                           semilla, size, nº de claves, offsets y longitud
+                           del heap, CRC-32 de los slots y del heap
+    slots    (48 B/slot) : status, tipo de clave, dist, cursor, hash,
+                           offset y longitud de la clave y del valor
+    heap                 : bytes de las claves (ver persistence.encode_key)
+                           y valores serializados con pickle, uno tras otro
+
+Las secuencias de probes son las de la HashTable de origen: el fichero
+conserva la disposición exacta de sus slots.
+"""
+
+import mmap
+import os
+import pickle
+import struct
+import zlib
+from typing import Any, BinaryIO, Optional, Union
+
+from .hash_functions import MASK64, hasher_from_id
+from .hash_table_double_hashing import HashTable, probe_step
+from .persistence import decode_key, encode_key, write_atomically
+from .slot_store import EMPTY, OCCUPIED
+
+
+MAGIC = b'HTMM'
+VERSION = 1
+
+# magic, versión, robin_hood, hash_id, long. semilla, semilla, size, claves,
+# offset de los slots, offset del heap, longitud del heap, CRC slots, CRC heap
+_HEADER = struct.Struct('<4sHBbB16sQQQQQII')
+HEADER_BYTES = 128
+
+# status, tipo de clave, relleno, dist, cursor, hash,
+# offset de la clave, offset del valor, longitud de la clave y del valor
+_SLOT = struct.Struct('<BBHiqQQQII')
+SLOT_BYTES = _SLOT.size
+
+
+class MappedHashTable:
+    """
+    Vista de solo lectura de una tabla hash guardada con build().
+    
+    Args:
+        path: Fichero creado con MappedHashTable.build().
+    
+    Raises:
+        ValueError: Si el fichero no tiene el formato esperado.
+    """
+
+    def __init__(self, path: str):
+        """
+        Mapea el fichero y lee su cabecera.
+        
+        Args:
+            path: Ruta del fichero.
+        
+        Raises:
+            ValueError: Si el fichero no tiene el formato esperado.
+        """
+        self.path = path
+        self._file: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._open()
+
+    def _open(self) -> None:
+        """Abre y mapea self.path, y carga la cabecera."""
+        stream = open(self.path, 'rb')
+        try:
+            identity = os.fstat(stream.fileno())
+            if identity.st_size < HEADER_BYTES:
+                raise ValueError(f"{self.path} no es una tabla mapeada (demasiado corto)")
+            mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            stream.close()
+            raise
+
+        (magic, version, robin_hood, hash_id, seed_len, seed, size, count, slots_offset,
+         heap_offset, heap_length, slots_crc, heap_crc) = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            mapped.close()
+            stream.close()
+            raise ValueError(f"{self.path} no es una tabla mapeada compatible")
+        if heap_offset + heap_length > len(mapped) or slots_offset + size * SLOT_BYTES > heap_offset:
+            mapped.close()
+            stream.close()
+            raise ValueError(f"{self.path} está truncado")
+
+        self.close()
+        self._file = stream
+        self._map = mapped
+        self._identity = (identity.st_ino, identity.st_mtime_ns, identity.st_size)
+        self.hasher = hasher_from_id(hash_id, seed[:seed_len] if seed_len else None)
+        self.robin_hood = bool(robin_hood)
+        self._size = size
+        self._count = count
+        self._slots_offset = slots_offset
+        self._heap_offset = heap_offset
+        self._heap_length = heap_length
+        self._slots_crc = slots_crc
+        self._heap_crc = heap_crc
+
+    # -------------------------
+    # Escritura (fuera de línea)
+    # -------------------------
+    @staticmethod
+    def build(table: HashTable, path: str) -> None:
+        """
+        Escribe el contenido de una HashTable en formato mapeable.
+        
+        Si la tabla tiene un redimensionamiento en curso, se completa antes.
+        La escritura es atómica: los lectores ven el fichero anterior o el
+        nuevo completo, nunca uno a medias.
+        
+        Args:
+            table: Tabla de origen.
+            path: Ruta del fichero a crear o reemplazar.
+        
+        Raises:
+            ValueError: Si la tabla usa una función hash personalizada.
+        """
+        hasher = table.hasher
+        if hasher.hash_id < 0:
+            raise ValueError(f"No se puede exportar una tabla con función hash personalizada ({hasher.name})")
+        if table._old is not None:
+            table._advance_migration(table._old.size)
+
+        store = table._store
+        seed = hasher.seed or b''
+        heap_offset = HEADER_BYTES + store.size * SLOT_BYTES
+
+        def write(stream: BinaryIO) -> None:
+            slots = bytearray(store.size * SLOT_BYTES)
+            heap_crc = 0
+            heap_length = 0
+            stream.seek(heap_offset)
+            for pos in range(store.size):
+                status = store.status[pos]
+                key_kind = key_off = key_len = value_off = value_len = 0
+                if status == OCCUPIED:
+                    key_kind, key_data = encode_key(store.keys[pos])
+                    value_data = pickle.dumps(store.values[pos], protocol=pickle.HIGHEST_PROTOCOL)
+                    key_off, key_len = heap_length, len(key_data)
+                    value_off, value_len = key_off + key_len, len(value_data)
+                    chunk = key_data + value_data
+                    stream.write(chunk)
+                    heap_crc = zlib.crc32(chunk, heap_crc)
+                    heap_length += len(chunk)
+                _SLOT.pack_into(slots, pos * SLOT_BYTES, status, key_kind, 0, store.dist[pos],
+                                store.cursor[pos], store.hashes[pos], key_off, value_off,
+                                key_len, value_len)
+
+            header = _HEADER.pack(
+                MAGIC, VERSION, 1 if table._robin_hood else 0, hasher.hash_id, len(seed),
+                seed.ljust(16, b'\0'), store.size, store.occupied, HEADER_BYTES, heap_offset,
+                heap_length, zlib.crc32(slots), heap_crc
+            )
+            stream.seek(0)
+            stream.write(header.ljust(HEADER_BYTES, b'\0'))
+            stream.write(slots)
+
+        write_atomically(path, write)
+
+    # -------------------------
+    # Lectura
+    # -------------------------
+    @property
+    def size(self) -> int:
+        """Número de slots de la tabla."""
+        return self._size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _hash(self, key: Union[int, str]) -> int:
+        """
+        Hash de 64 bits de la clave, igual que HashTable._hash.
+        
+        Args:
+            key: Clave int o str.
+        
+        Returns:
+            Entero en [0, 2^64).
+        
+        Raises:
+            TypeError: Si la clave no es int ni str.
+        """
+        if isinstance(key, str):
+            return self.hasher(key) & MASK64
+        if isinstance(key, int):
+            return int(key) & MASK64
+        raise TypeError(f"La clave debe ser int o str. Recibido: {type(key).__name__}")
+
+    def _find(self, key: Union[int, str]) -> Optional[tuple]:
+        """
+        Recorre la secuencia de probes de key sobre el fichero mapeado.
+        
+        Args:
+            key: Clave buscada.
+        
+        Returns:
+            El registro del slot (ver _SLOT) si la clave está, o None.
+        """
+        key_hash = self._hash(key)
+        key_kind, key_data = encode_key(key)
+        size = self._size
+        base_index = key_hash % size
+        step = probe_step(key_hash, size)
+        mapped = self._map
+        unpack_from = _SLOT.unpack_from
+        slots_offset = self._slots_offset
+        heap_offset = self._heap_offset
+        robin_hood = self.robin_hood
+
+        for i in range(size):
+            pos = (base_index + i * step) % size
+            record = unpack_from(mapped, slots_offset + pos * SLOT_BYTES)
+            status = record[0]
+            if status == EMPTY or (robin_hood and record[3] < i):
+                return None
+            if (status == OCCUPIED and record[5] == key_hash and record[1] == key_kind
+                    and record[8] == len(key_data)):
+                start = heap_offset + record[6]
+                if mapped[start:start + record[8]] == key_data:
+                    return record
+        return None
+
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        """
+        Busca key y devuelve su valor, leyendo sólo los slots sondeados.
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            El valor asociado, o None si la clave no está.
+        """
+        record = self._find(key)
+        if record is None:
+            return None
+        start = self._heap_offset + record[7]
+        return pickle.loads(self._map[start:start + record[9]])
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        return self._find(key) is not None
+
+    def keys(self):
+        """
+        Itera las claves en orden de slot (recorre todo el fichero).
+        
+        Yields:
+            Cada clave almacenada.
+        """
+        mapped = self._map
+        for pos in range(self._size):
+            record = _SLOT.unpack_from(mapped, self._slots_offset + pos * SLOT_BYTES)
+            if record[0] == OCCUPIED:
+                start = self._heap_offset + record[6]
+                yield decode_key(record[1], mapped[start:start + record[8]])
+
+    def get_statistics(self) -> dict:
+        """
+        Estadísticas de la cabecera (O(1)).
+        
+        Returns:
+            Diccionario con total_slots, occupied, load_factor y file_bytes.
+        """
+        return {
+            'total_slots': self._size,
+            'occupied': self._count,
+            'load_factor': self._count / self._size if self._size else 0.0,
+            'file_bytes': len(self._map),
+        }
+
+    def verify(self) -> bool:
+        """
+        Comprueba los CRC-32 de los slots y del heap (lee todo el fichero).
+        
+        Returns:
+            True si el fichero está íntegro.
+        """
+        slots_end = self._slots_offset + self._size * SLOT_BYTES
+        heap_end = self._heap_offset + self._heap_length
+        view = memoryview(self._map)
+        try:
+            return (zlib.crc32(view[self._slots_offset:slots_end]) == self._slots_crc
+                    and zlib.crc32(view[self._heap_offset:heap_end]) == self._heap_crc)
+        finally:
+            view.release()
+
+    def refresh(self) -> bool:
+        """
+        Vuelve a mapear el fichero si build() lo ha reemplazado.
+        
+        Returns:
+            True si se cargó una versión nueva.
+        """
+        identity = os.stat(self.path)
+        if (identity.st_ino, identity.st_mtime_ns, identity.st_size) == self._identity:
+            return False
+        self._open()
+        return True
+
+    def close(self) -> None:
+        """Libera el mapeo y el fichero."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'MappedHashTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ['MAGIC', 'VERSION', 'SLOT_BYTES', 'MappedHashTable']
@@ -0,0 +1,388 @@
+"""
+Snapshots binarios de HashTable (save/load).
+
+Un snapshot guarda la disposición exacta de los slots (estados, cursores,
+back-cursors, free_list, hashes y distancias de probe) de la generación
+actual y, si hay un redimensionamiento en curso, también de la antigua.
+Cargarlo no rehashea nada: los arrays se leen tal cual.
+
+Formato (enteros little-endian):
+
+    cabecera   : magic 'HTDH', versión, modo de probing, hash_id, semilla,
+                 umbrales, estado de la migración, nº de claves y generaciones
+    generación : size, occupied, deleted, free_head, probe_sum, len(probe_hist)
+                 status   (1 byte por slot)
+                 cursor, back, dist (int64 por slot), hashes (uint64 por slot)
+                 probe_hist (uint64)
+                 claves de los slots OCCUPIED, en orden de posición:
+                     tipo de cada una (1 byte: 0 = int, 1 = str),
+                     longitud de cada una (uint32) y sus bytes concatenados
+                 valores de esos slots, serializados con pickle
+    cierre     : CRC-32 de todos los bytes anteriores
+
+La escritura es atómica: se escribe un fichero temporal en el mismo
+directorio, se hace fsync y se renombra sobre el destino con os.replace, de
+modo que un corte a mitad deja intacto el snapshot anterior.
+
+Los valores se guardan con pickle: cargar un snapshot de origen no fiable
+puede ejecutar código. El CRC detecta corrupción, no manipulación.
+"""
+
+import math
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, BinaryIO, Callable, Optional, Tuple, Type
+
+from .hash_functions import hasher_from_id
+from .slot_store import OCCUPIED, SlotStore
+
+
+MAGIC = b'HTDH'
+VERSION = 1
+
+# magic, versión, robin_hood, hash_id, long. semilla, semilla,
+# max_load_factor, max_tombstone_ratio (NaN = None), migration_batch,
+# migration_pos, migration_step, claves, generaciones
+_HEADER = struct.Struct('<4sHBbB16sddIQQQB')
+# size, occupied, deleted, free_head, probe_sum, len(probe_hist)
+_GENERATION = struct.Struct('<QQQqQQ')
+_LENGTH = struct.Struct('<Q')
+_CRC = struct.Struct('<I')
+
+KEY_INT = 0
+KEY_STR = 1
+
+
+class _ChecksumWriter:
+    """Envuelve un fichero binario y acumula el CRC-32 de lo escrito."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.crc = 0
+
+    def write(self, data: bytes) -> None:
+        self.crc = zlib.crc32(data, self.crc)
+        self.stream.write(data)
+
+
+class _Reader:
+    """Lee campos consecutivos de un buffer ya verificado."""
+
+    def __init__(self, data: memoryview):
+        self.data = data
+        self.offset = 0
+
+    def take(self, length: int) -> memoryview:
+        if self.offset + length > len(self.data):
+            raise ValueError("Snapshot truncado")
+        chunk = self.data[self.offset:self.offset + length]
+        self.offset += length
+        return chunk
+
+    def unpack(self, layout: struct.Struct) -> tuple:
+        return layout.unpack(self.take(layout.size))
+
+
+def _array_bytes(values: array, typecode: str) -> bytes:
+    """
+    Serializa un array de enteros con el formato typecode, little-endian.
+    
+    Args:
+        values: Array a serializar ('l', 'Q' o 'I').
+        typecode: Formato en el fichero: 'q', 'Q' (8 bytes) o 'I' (4 bytes).
+    
+    Returns:
+        Bytes del array.
+    """
+    if values.itemsize != array(typecode).itemsize:
+        values = array(typecode, values)
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(reader: _Reader, typecode: str, count: int, target: str) -> array:
+    """
+    Lee count enteros y los devuelve como array(target).
+    
+    Args:
+        reader: Lector posicionado al inicio del array.
+        typecode: Formato en el fichero ('q', 'Q' o 'I').
+        count: Número de elementos.
+        target: Typecode del array resultante ('l', 'Q' o 'I').
+    
+    Returns:
+        Array con los valores.
+    """
+    values = array(typecode)
+    values.frombytes(reader.take(values.itemsize * count))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    if target != typecode:
+        values = array(target, values)
+    return values
+
+
+def encode_key(key: Any) -> Tuple[int, bytes]:
+    """
+    Codifica una clave int o str.
+    
+    Args:
+        key: Clave almacenada en la tabla.
+    
+    Returns:
+        Tupla (tipo, bytes): UTF-8 para str, complemento a dos para int.
+    
+    Raises:
+        TypeError: Si la clave no es int ni str.
+    """
+    if isinstance(key, str):
+        return KEY_STR, key.encode('utf-8')
+    if isinstance(key, int):
+        return KEY_INT, int(key).to_bytes(key.bit_length() // 8 + 1, 'little', signed=True)
+    raise TypeError(f"La clave debe ser int o str. Recibido: {type(key).__name__}")
+
+
+def decode_key(kind: int, data: bytes) -> Any:
+    """
+    Inverso de encode_key.
+    
+    Args:
+        kind: Tipo devuelto por encode_key.
+        data: Bytes de la clave.
+    
+    Returns:
+        La clave int o str.
+    
+    Raises:
+        ValueError: Si el tipo es desconocido.
+    """
+    if kind == KEY_STR:
+        return data.decode('utf-8')
+    if kind == KEY_INT:
+        return int.from_bytes(data, 'little', signed=True)
+    raise ValueError(f"Tipo de clave desconocido en el snapshot: {kind}")
+
+
+def _write_generation(out: _ChecksumWriter, store: SlotStore) -> None:
+    """
+    Escribe una generación completa.
+    
+    Args:
+        out: Destino con checksum.
+        store: Generación a guardar.
+    """
+    out.write(_GENERATION.pack(store.size, store.occupied, store.deleted, store.free_head,
+                               store.probe_sum, len(store.probe_hist)))
+    out.write(bytes(store.status))
+    out.write(_array_bytes(store.cursor, 'q'))
+    out.write(_array_bytes(store.back, 'q'))
+    out.write(_array_bytes(store.dist, 'q'))
+    out.write(_array_bytes(store.hashes, 'Q'))
+    out.write(_array_bytes(array('Q', store.probe_hist), 'Q'))
+
+    occupied = [pos for pos in range(store.size) if store.status[pos] == OCCUPIED]
+    encoded = [encode_key(store.keys[pos]) for pos in occupied]
+    out.write(bytes(kind for kind, _ in encoded))
+    out.write(_array_bytes(array('I', [len(data) for _, data in encoded]), 'I'))
+    blob = b''.join(data for _, data in encoded)
+    out.write(_LENGTH.pack(len(blob)))
+    out.write(blob)
+    values = pickle.dumps([store.values[pos] for pos in occupied], protocol=pickle.HIGHEST_PROTOCOL)
+    out.write(_LENGTH.pack(len(values)))
+    out.write(values)
+
+
+def _read_generation(reader: _Reader) -> SlotStore:
+    """
+    Reconstruye una generación escrita con _write_generation.
+    
+    Args:
+        reader: Lector posicionado al inicio de la generación.
+    
+    Returns:
+        SlotStore con la misma disposición que al guardar.
+    """
+    size, occupied, deleted, free_head, probe_sum, hist_len = reader.unpack(_GENERATION)
+    store = SlotStore(0)
+    store.size = size
+    store.status = bytearray(reader.take(size))
+    store.cursor = _read_array(reader, 'q', size, 'l')
+    store.back = _read_array(reader, 'q', size, 'l')
+    store.dist = _read_array(reader, 'q', size, 'l')
+    store.hashes = _read_array(reader, 'Q', size, 'Q')
+    store.probe_hist = list(_read_array(reader, 'Q', hist_len, 'Q'))
+    store.free_head = free_head
+    store.occupied = occupied
+    store.deleted = deleted
+    store.probe_sum = probe_sum
+
+    occupied_pos = [pos for pos in range(size) if store.status[pos] == OCCUPIED]
+    if len(occupied_pos) != occupied:
+        raise ValueError("Snapshot inconsistente: el número de slots OCCUPIED no coincide")
+    kinds = bytes(reader.take(occupied))
+    lengths = _read_array(reader, 'I', occupied, 'I')
+    (blob_length,) = reader.unpack(_LENGTH)
+    blob = bytes(reader.take(blob_length))
+    keys = [None] * size
+    offset = 0
+    for pos, kind, length in zip(occupied_pos, kinds, lengths):
+        keys[pos] = decode_key(kind, blob[offset:offset + length])
+        offset += length
+    store.keys = keys
+    (length,) = reader.unpack(_LENGTH)
+    values = pickle.loads(reader.take(length))
+    store.values = [None] * size
+    for pos, value in zip(occupied_pos, values):
+        store.values[pos] = value
+    return store
+
+
+def _encode_threshold(value: Optional[float]) -> float:
+    return math.nan if value is None else value
+
+
+def _decode_threshold(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def save_table(table: Any, path: str) -> None:
+    """
+    Guarda la tabla en path de forma atómica.
+    
+    Args:
+        table: HashTable a guardar.
+        path: Ruta del snapshot (se sobrescribe si existe).
+    
+    Raises:
+        ValueError: Si la tabla usa una función hash personalizada, que no
+                    se puede reconstruir al cargar.
+    """
+    hasher = table.hasher
+    if hasher.hash_id < 0:
+        raise ValueError(f"No se puede guardar una tabla con función hash personalizada ({hasher.name})")
+    seed = hasher.seed or b''
+
+    generations = [table._store] if table._old is None else [table._store, table._old]
+    header = _HEADER.pack(
+        MAGIC, VERSION, 1 if table._robin_hood else 0, hasher.hash_id, len(seed),
+        seed.ljust(16, b'\0'), _encode_threshold(table.max_load_factor),
+        _encode_threshold(table.max_tombstone_ratio), table.migration_batch,
+        table._migration_pos, table._migration_step,
+        sum(store.occupied for store in generations), len(generations)
+    )
+
+    def write(stream: BinaryIO) -> None:
+        out = _ChecksumWriter(stream)
+        out.write(header)
+        for store in generations:
+            _write_generation(out, store)
+        stream.write(_CRC.pack(out.crc))
+
+    write_atomically(path, write)
+
+
+def write_atomically(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """
+    Escribe un fichero completo o no lo escribe.
+    
+    write recibe un fichero temporal del mismo directorio; al terminar se
+    hace fsync y se renombra sobre path con os.replace. Si algo falla, el
+    temporal se borra y path queda como estaba.
+    
+    Args:
+        path: Ruta destino.
+        write: Función que escribe el contenido en el stream binario.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as stream:
+            write(stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def load_table(path: str, table_cls: Type) -> Any:
+    """
+    Carga un snapshot escrito con save_table.
+    
+    Args:
+        path: Ruta del snapshot.
+        table_cls: Clase de tabla a construir (HashTable o una subclase).
+    
+    Returns:
+        La tabla, con la misma disposición de slots que al guardarla.
+    
+    Raises:
+        ValueError: Si el fichero no es un snapshot, es de otra versión,
+                    está truncado o el checksum no coincide.
+    """
+    with open(path, 'rb') as stream:
+        data = stream.read()
+    if len(data) < _HEADER.size + _CRC.size:
+        raise ValueError(f"{path} no es un snapshot de HashTable (demasiado corto)")
+    (expected,) = _CRC.unpack(data[-_CRC.size:])
+    if zlib.crc32(memoryview(data)[:-_CRC.size]) != expected:
+        raise ValueError(f"Checksum incorrecto en {path}: el snapshot está dañado")
+
+    reader = _Reader(memoryview(data)[:-_CRC.size])
+    (magic, version, robin_hood, hash_id, seed_len, seed, max_load_factor,
+     max_tombstone_ratio, migration_batch, migration_pos, migration_step,
+     _count, generation_count) = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError(f"{path} no es un snapshot de HashTable")
+    if version != VERSION:
+        raise ValueError(f"Versión de snapshot no soportada: {version}")
+
+    generations = [_read_generation(reader) for _ in range(generation_count)]
+    table = table_cls(
+        1,
+        max_load_factor=_decode_threshold(max_load_factor),
+        max_tombstone_ratio=_decode_threshold(max_tombstone_ratio),
+        migration_batch=migration_batch,
+        hash_function=hasher_from_id(hash_id, seed[:seed_len] if seed_len else None),
+        probing='robin_hood' if robin_hood else 'double'
+    )
+    table._store = generations[0]
+    table._old = generations[1] if len(generations) > 1 else None
+    table._migration_pos = migration_pos
+    table._migration_step = migration_step
+    return table
+
+
+def _fsync_directory(directory: str) -> None:
+    """
+    Sincroniza la entrada de directorio tras el rename (POSIX).
+    
+    Args:
+        directory: Directorio que contiene el snapshot.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+__all__ = [
+    'MAGIC', 'VERSION', 'KEY_INT', 'KEY_STR', 'save_table', 'load_table',
+    'write_atomically', 'encode_key', 'decode_key'
+]
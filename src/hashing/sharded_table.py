@@ -0,0 +1,603 @@
+"""
+Tabla hash repartida en N sub-tablas (shards) independientes.
+
+Cada clave se asigna a un shard según su hash de 64 bits, mezclado antes
+de reducirlo módulo N para que el reparto no dependa de los bits bajos
+que usa h1 dentro del shard. Todos los shards comparten la misma función
+hash (y semilla), así que el hash se calcula una vez por operación.
+
+Cada shard es una HashTable completa: crece, compacta y migra por su
+cuenta (un redimensionamiento sólo afecta a 1/N de las claves) y se
+guarda en su propio snapshot. Con table_class=ConcurrentHashTable cada
+shard tiene además su propio lock, de modo que escritores de shards
+distintos no se esperan entre sí.
+
+Formato en disco de save():
+
+    directorio/manifest            : magic 'HTSM', versión, nº de shards, CRC-32
+    directorio/shard-0000.snapshot : snapshot de cada shard (ver persistence)
+"""
+
+import os
+import struct
+import zlib
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from .hash_functions import MASK64
+from .hash_table_double_hashing import SCAN_PAGE, HashTable
+from .instrumentation import Hook, TableInstrumentation
+from .persistence import write_atomically
+
+
+MANIFEST_MAGIC = b'HTSM'
+MANIFEST_VERSION = 1
+
+_MANIFEST = struct.Struct('<4sHI')
+_CRC = struct.Struct('<I')
+MANIFEST_NAME = 'manifest'
+
+
+def shard_index(key_hash: int, shards: int) -> int:
+    """
+    Shard al que pertenece un hash de 64 bits.
+    
+    Aplica el mezclador final de MurmurHash3 (fmix64) antes del módulo:
+    las claves int se hashean a sí mismas, y sin mezclar, claves
+    consecutivas o con los mismos bits bajos caerían en los mismos shards.
+    
+    Args:
+        key_hash: Hash de la clave (ver HashTable._hash).
+        shards: Número de shards.
+    
+    Returns:
+        Índice en [0, shards).
+    """
+    x = key_hash
+    x ^= x >> 33
+    x = (x * 0xFF51AFD7ED558CCD) & MASK64
+    x ^= x >> 33
+    x = (x * 0xC4CEB9FE1A85EC53) & MASK64
+    x ^= x >> 33
+    return x % shards
+
+
+def shard_filename(index: int) -> str:
+    """Nombre del snapshot del shard index dentro del directorio."""
+    return f"shard-{index:04d}.snapshot"
+
+
+class ShardedHashTable:
+    """
+    N HashTable independientes detrás de la API de una sola.
+    
+    Args:
+        shards: Número de shards (>= 1).
+        size: Tamaño inicial de cada shard.
+        table_class: Clase de cada shard (HashTable o una subclase, p. ej.
+                     ConcurrentHashTable).
+        **table_options: Resto de argumentos del constructor de cada shard
+                         (max_load_factor, hash_function, probing...).
+    
+    Raises:
+        ValueError: Si shards < 1 o algún argumento de los shards no es válido.
+    """
+
+    def __init__(self, shards: int = 8, size: int = 11,
+                 table_class: Type[HashTable] = HashTable, **table_options: Any):
+        """
+        Crea los shards con una función hash común.
+        
+        Args:
+            shards: Número de shards.
+            size: Tamaño inicial de cada shard.
+            table_class: Clase de cada shard.
+            **table_options: Argumentos del constructor de cada shard.
+        
+        Raises:
+            ValueError: Si shards < 1 o algún argumento no es válido.
+        """
+        if shards < 1:
+            raise ValueError(f"El número de shards debe ser mayor a 0. Recibido: {shards}")
+        first = table_class(size, **table_options)
+        # El resto reutiliza la instancia de la función hash (misma semilla)
+        table_options['hash_function'] = first.hasher
+        self._set_shards([first] + [table_class(size, **table_options) for _ in range(shards - 1)])
+
+    def _set_shards(self, tables: List[HashTable]) -> None:
+        """
+        Instala la lista de shards.
+        
+        Si la clase de los shards no redefine insert/search/delete, las
+        operaciones llaman directamente a los cuerpos *_hashed con el hash ya
+        calculado; si los redefine (p. ej. para tomar un lock), se usan los
+        métodos públicos.
+        
+        Args:
+            tables: Shards, en orden.
+        """
+        self.shards = tables
+        self.hasher = tables[0].hasher
+        table_class = type(tables[0])
+        self._direct = (table_class.insert is HashTable.insert
+                        and table_class.search is HashTable.search
+                        and table_class.delete is HashTable.delete)
+
+    @property
+    def shard_count(self) -> int:
+        """Número de shards."""
+        return len(self.shards)
+
+    @property
+    def size(self) -> int:
+        """Suma de los slots de todos los shards."""
+        return sum(shard.size for shard in self.shards)
+
+    def shard_for(self, key: Union[int, str]) -> int:
+        """
+        Índice del shard que guarda (o guardaría) key.
+        
+        Args:
+            key: Clave int o str.
+        
+        Returns:
+            Índice en [0, shard_count).
+        """
+        return shard_index(self.shards[0]._hash(key), len(self.shards))
+
+    def _route(self, key: Union[int, str]) -> Tuple[HashTable, int]:
+        """
+        Shard de key y hash de la clave.
+        
+        Args:
+            key: Clave int o str.
+        
+        Returns:
+            Tupla (shard, key_hash).
+        """
+        key_hash = self.shards[0]._hash(key)
+        return self.shards[shard_index(key_hash, len(self.shards))], key_hash
+
+    # -------------------------
+    # Operaciones
+    # -------------------------
+    def insert(self, key: Union[int, str], value: Any) -> bool:
+        """
+        Inserta (key, value) en su shard (ver HashTable.insert).
+        
+        Args:
+            key: Clave del elemento.
+            value: Valor asociado.
+        
+        Returns:
+            True si se insertó, False si el shard está lleno.
+        """
+        shard, key_hash = self._route(key)
+        if self._direct:
+            return shard._insert_hashed(key, value, key_hash)
+        return shard.insert(key, value)
+
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        """
+        Busca key en su shard (ver HashTable.search).
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            El valor asociado, o None si no está.
+        """
+        shard, key_hash = self._route(key)
+        if self._direct:
+            return shard._search_hashed(key, key_hash)
+        return shard.search(key)
+
+    def delete(self, key: Union[int, str]) -> bool:
+        """
+        Elimina key de su shard (ver HashTable.delete).
+        
+        Args:
+            key: Clave a eliminar.
+        
+        Returns:
+            True si se eliminó, False si no se encontró.
+        """
+        shard, key_hash = self._route(key)
+        if self._direct:
+            return shard._delete_hashed(key, key_hash)
+        return shard.delete(key)
+
+    def insert_many(self, items: Iterable[Tuple[Union[int, str], Any]]) -> List[bool]:
+        """
+        Inserta un lote repartiéndolo por shards (ver HashTable.insert_many).
+        
+        Args:
+            items: Pares (key, value).
+        
+        Returns:
+            Resultado de insert para cada par, en el mismo orden.
+        """
+        items = list(items)
+        return self._scatter([key for key, _ in items], items,
+                             lambda shard, batch: shard.insert_many(batch))
+
+    def search_many(self, keys: Iterable[Union[int, str]]) -> List[Optional[Any]]:
+        """
+        Busca un lote repartiéndolo por shards (ver HashTable.search_many).
+        
+        Args:
+            keys: Claves a buscar.
+        
+        Returns:
+            Valor de cada clave (None si no está), en el mismo orden.
+        """
+        keys = list(keys)
+        return self._scatter(keys, keys, lambda shard, batch: shard.search_many(batch))
+
+    def delete_many(self, keys: Iterable[Union[int, str]]) -> List[bool]:
+        """
+        Elimina un lote repartiéndolo por shards (ver HashTable.delete_many).
+        
+        Args:
+            keys: Claves a eliminar.
+        
+        Returns:
+            Resultado de delete para cada clave, en el mismo orden.
+        """
+        keys = list(keys)
+        return self._scatter(keys, keys, lambda shard, batch: shard.delete_many(batch))
+
+    def _scatter(self, keys: List[Union[int, str]], entries: list,
+                 operation: Callable[[HashTable, list], list]) -> list:
+        """
+        Agrupa un lote por shard, lo ejecuta y recompone el orden original.
+        
+        Una misma clave siempre cae en el mismo shard y cada shard recibe
+        sus entradas en el orden original, así que el resultado es el mismo
+        que aplicar las operaciones una a una.
+        
+        Args:
+            keys: Clave de cada entrada.
+            entries: Entradas del lote (claves o pares), alineadas con keys.
+            operation: Función (shard, entradas del shard) -> resultados.
+        
+        Returns:
+            Lista de resultados en el orden de entries.
+        """
+        count = len(self.shards)
+        hashes = self.shards[0]._hash_many(keys)
+        hash_list = hashes if isinstance(hashes, list) else hashes.tolist()
+        positions: List[List[int]] = [[] for _ in range(count)]
+        for idx, key_hash in enumerate(hash_list):
+            positions[shard_index(key_hash, count)].append(idx)
+
+        results: list = [None] * len(entries)
+        for shard, indexes in zip(self.shards, positions):
+            if not indexes:
+                continue
+            for idx, result in zip(indexes, operation(shard, [entries[i] for i in indexes])):
+                results[idx] = result
+        return results
+
+    # -------------------------
+    # Recorrido
+    # -------------------------
+    def scan(self, cursor: int = 0, count: int = SCAN_PAGE) -> Tuple[int, List[Tuple[Union[int, str], Any]]]:
+        """
+        Devuelve la siguiente página de entradas, shard a shard (ver HashTable.scan).
+        
+        El cursor combina el shard en curso y el cursor dentro de él.
+        
+        Args:
+            cursor: 0 para empezar, o el cursor de la llamada anterior.
+            count: Máximo de entradas de la página (>= 1).
+        
+        Returns:
+            Tupla (cursor, entradas); el cursor es 0 al terminar el último shard.
+        
+        Raises:
+            ValueError: Si count < 1 o cursor es negativo.
+        """
+        if count < 1:
+            raise ValueError(f"count debe ser mayor a 0. Recibido: {count}")
+        if cursor < 0:
+            raise ValueError(f"cursor no puede ser negativo. Recibido: {cursor}")
+        shards = len(self.shards)
+        inner, index = divmod(cursor, shards)
+        page = []
+        while index < shards:
+            inner, part = self.shards[index].scan(inner, count - len(page))
+            page.extend(part)
+            if inner:
+                return inner * shards + index, page
+            index += 1
+            if len(page) == count:
+                return (index if index < shards else 0), page
+        return 0, page
+
+    def items(self) -> Iterator[Tuple[Union[int, str], Any]]:
+        """
+        Itera los pares (clave, valor) de todos los shards (ver HashTable.items).
+        
+        Yields:
+            Cada par (clave, valor).
+        """
+        cursor = 0
+        while True:
+            cursor, page = self.scan(cursor, SCAN_PAGE)
+            yield from page
+            if cursor == 0:
+                return
+
+    def keys(self) -> Iterator[Union[int, str]]:
+        """
+        Itera las claves de todos los shards.
+        
+        Yields:
+            Cada clave almacenada.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def values(self) -> Iterator[Any]:
+        """
+        Itera los valores de todos los shards.
+        
+        Yields:
+            Cada valor almacenado.
+        """
+        for _, value in self.items():
+            yield value
+
+    def walk_chain(self, key: Union[int, str]) -> Iterator[Tuple[int, Union[int, str], Any]]:
+        """
+        Cadena de cursores de key dentro de su shard (ver HashTable.walk_chain).
+        
+        Args:
+            key: Clave por la que empieza la cadena.
+        
+        Returns:
+            Iterador de tuplas (posición en el shard, clave, valor).
+        """
+        return self._route(key)[0].walk_chain(key)
+
+    # -------------------------
+    # Mantenimiento
+    # -------------------------
+    def compact(self, incremental: bool = False) -> int:
+        """
+        Compacta cada shard (ver HashTable.compact).
+        
+        Args:
+            incremental: Si es True, sólo inicia la reconstrucción de cada shard.
+        
+        Returns:
+            Total de slots DELETED que se recuperan.
+        """
+        return sum(shard.compact(incremental) for shard in self.shards)
+
+    def compact_step(self, max_slots: Optional[int] = None) -> bool:
+        """
+        Avanza las migraciones en curso de todos los shards.
+        
+        Args:
+            max_slots: Slots antiguos a migrar en cada shard.
+        
+        Returns:
+            True si ningún shard tiene nada pendiente.
+        """
+        done = True
+        for shard in self.shards:
+            done = shard.compact_step(max_slots) and done
+        return done
+
+    def enable_filter(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Activa un filtro de claves ausentes en cada shard (ver HashTable.enable_filter).
+        
+        Args:
+            *args: Argumentos de HashTable.enable_filter.
+            **kwargs: Argumentos con nombre de HashTable.enable_filter.
+        """
+        for shard in self.shards:
+            shard.enable_filter(*args, **kwargs)
+
+    def disable_filter(self) -> None:
+        """Descarta el filtro de cada shard."""
+        for shard in self.shards:
+            shard.disable_filter()
+
+    def enable_instrumentation(self, sample_every: int = 1,
+                               hooks: Optional[List[Hook]] = None) -> TableInstrumentation:
+        """
+        Mide las operaciones de todos los shards con contadores comunes.
+        
+        Args:
+            sample_every: Mide una de cada sample_every llamadas (ver
+                          HashTable.enable_instrumentation).
+            hooks: Funciones (operación, probes, tombstones, ns) que reciben
+                   cada muestra.
+        
+        Returns:
+            La instrumentación compartida por los shards.
+        
+        Raises:
+            ValueError: Si sample_every < 1.
+        """
+        self.disable_instrumentation()
+        instrumentation = TableInstrumentation(sample_every, hooks)
+        for shard in self.shards:
+            instrumentation.install(shard)
+            shard.instrumentation = instrumentation
+        return instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """Deja de medir las operaciones de cada shard."""
+        for shard in self.shards:
+            shard.disable_instrumentation()
+
+    def add_listener(self, listener: Callable[[int, Union[int, str], Any], None]) -> None:
+        """
+        Registra listener en todos los shards (ver HashTable.add_listener).
+        
+        Args:
+            listener: Función (op, key, value) -> None.
+        """
+        for shard in self.shards:
+            shard.add_listener(listener)
+
+    def remove_listener(self, listener: Callable[[int, Union[int, str], Any], None]) -> None:
+        """
+        Quita listener de todos los shards (ver HashTable.remove_listener).
+        
+        Args:
+            listener: Función registrada.
+        
+        Raises:
+            ValueError: Si no estaba registrada.
+        """
+        for shard in self.shards:
+            shard.remove_listener(listener)
+
+    # -------------------------
+    # Persistencia
+    # -------------------------
+    def save(self, directory: str) -> None:
+        """
+        Guarda un snapshot por shard y, al final, el manifiesto.
+        
+        Cada snapshot se escribe de forma atómica; el manifiesto se
+        reemplaza el último, cuando todos los shards ya están en disco.
+        
+        Args:
+            directory: Directorio destino (se crea si no existe).
+        
+        Raises:
+            ValueError: Si la función hash es un callable personalizado.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for index, shard in enumerate(self.shards):
+            shard.save(os.path.join(directory, shard_filename(index)))
+        body = _MANIFEST.pack(MANIFEST_MAGIC, MANIFEST_VERSION, len(self.shards))
+        write_atomically(os.path.join(directory, MANIFEST_NAME),
+                         lambda stream: stream.write(body + _CRC.pack(zlib.crc32(body))))
+
+    @classmethod
+    def load(cls, directory: str, table_class: Type[HashTable] = HashTable) -> 'ShardedHashTable':
+        """
+        Carga una tabla guardada con save().
+        
+        Args:
+            directory: Directorio con el manifiesto y los snapshots.
+            table_class: Clase con la que cargar cada shard.
+        
+        Returns:
+            Nueva tabla con los mismos shards.
+        
+        Raises:
+            ValueError: Si el manifiesto o algún snapshot no es válido, o los
+                        shards no comparten función hash.
+        """
+        path = os.path.join(directory, MANIFEST_NAME)
+        with open(path, 'rb') as stream:
+            data = stream.read()
+        if len(data) != _MANIFEST.size + _CRC.size:
+            raise ValueError(f"{path} no es un manifiesto de ShardedHashTable")
+        magic, version, count = _MANIFEST.unpack_from(data)
+        (crc,) = _CRC.unpack_from(data, _MANIFEST.size)
+        if magic != MANIFEST_MAGIC or zlib.crc32(data[:_MANIFEST.size]) != crc:
+            raise ValueError(f"{path} no es un manifiesto de ShardedHashTable válido")
+        if version != MANIFEST_VERSION:
+            raise ValueError(f"Versión de manifiesto no soportada: {version}")
+
+        tables = [table_class.load(os.path.join(directory, shard_filename(index)))
+                  for index in range(count)]
+        first = tables[0].hasher
+        for table in tables[1:]:
+            if table.hasher.hash_id != first.hash_id or table.hasher.seed != first.seed:
+                raise ValueError(f"Los shards de {directory} no comparten función hash")
+            table.hasher = first
+
+        table = cls.__new__(cls)
+        table._set_shards(tables)
+        return table
+
+    # -------------------------
+    # Estadísticas
+    # -------------------------
+    def get_statistics(self, full_audit: bool = False) -> dict:
+        """
+        Estadísticas agregadas, por shard y de desequilibrio.
+        
+        Args:
+            full_audit: Si es True, audita cada shard (ver HashTable.get_statistics).
+        
+        Returns:
+            Las mismas claves que HashTable.get_statistics con los totales
+            de todos los shards (avg_probe_length ponderado por claves),
+            más:
+                - shards: Número de shards
+                - per_shard: Lista con las estadísticas de cada shard
+                - min_shard_occupied / max_shard_occupied: Claves en el shard
+                  menos y más cargado
+                - imbalance: max_shard_occupied / media (1.0 = reparto perfecto)
+                - occupied_cv: Coeficiente de variación de las claves por shard
+                - instrumentation: Sólo con la instrumentación activa; los
+                  contadores son comunes a todos los shards
+                - audit: Sólo con full_audit; consistent si lo son todos los shards
+        """
+        per_shard = [shard.get_statistics(full_audit) for shard in self.shards]
+        total_slots = sum(stats['total_slots'] for stats in per_shard)
+        occupied = sum(stats['occupied'] for stats in per_shard)
+        counts = [stats['occupied'] for stats in per_shard]
+        mean = occupied / len(counts)
+        variance = sum((count - mean) ** 2 for count in counts) / len(counts)
+
+        stats = {
+            'total_slots': total_slots,
+            'occupied': occupied,
+            'empty': sum(s['empty'] for s in per_shard),
+            'deleted': sum(s['deleted'] for s in per_shard),
+            'load_factor': occupied / total_slots if total_slots > 0 else 0.0,
+            'avg_probe_length': (sum(s['avg_probe_length'] * s['occupied'] for s in per_shard) / occupied
+                                 if occupied > 0 else 0.0),
+            'max_probe_length': max(s['max_probe_length'] for s in per_shard),
+            'resizing': any(s['resizing'] for s in per_shard),
+            'pending_migration': sum(s['pending_migration'] for s in per_shard),
+            'memory_bytes': sum(s['memory_bytes'] for s in per_shard),
+            'memory_saved_bytes': sum(s['memory_saved_bytes'] for s in per_shard),
+            'shards': len(per_shard),
+            'per_shard': per_shard,
+            'min_shard_occupied': min(counts),
+            'max_shard_occupied': max(counts),
+            'imbalance': max(counts) / mean if mean > 0 else 1.0,
+            'occupied_cv': variance ** 0.5 / mean if mean > 0 else 0.0,
+        }
+        instrumentation = self.shards[0].instrumentation
+        if instrumentation is not None:
+            stats['instrumentation'] = instrumentation.snapshot()
+        if full_audit:
+            stats['audit'] = {
+                'consistent': all(s['audit']['consistent'] for s in per_shard),
+                'mismatches': {index: s['audit']['mismatches']
+                               for index, s in enumerate(per_shard) if s['audit']['mismatches']},
+            }
+        return stats
+
+    def show_shards(self) -> None:
+        """Imprime el tamaño, la carga y los probes de cada shard."""
+        stats = self.get_statistics()
+        print(f"\n{'='*70}")
+        print(f"SHARDS: {stats['shards']} | claves: {stats['occupied']} | "
+              f"desequilibrio: {stats['imbalance']:.3f} (CV {stats['occupied_cv']:.3f})")
+        print(f"{'='*70}")
+        print(f"{'Shard':<6} | {'Slots':>9} | {'Claves':>9} | {'Carga':>6} | "
+              f"{'Probes':>6} | {'DELETED':>8} | {'Migrando':<8}")
+        print(f"{'-'*70}")
+        for index, shard_stats in enumerate(stats['per_shard']):
+            print(f"{index:<6} | {shard_stats['total_slots']:>9} | {shard_stats['occupied']:>9} | "
+                  f"{shard_stats['load_factor']:>6.2f} | {shard_stats['avg_probe_length']:>6.2f} | "
+                  f"{shard_stats['deleted']:>8} | {'sí' if shard_stats['resizing'] else 'no':<8}")
+        print(f"{'='*70}\n")
+
+
+__all__ = ['MANIFEST_MAGIC', 'MANIFEST_VERSION', 'ShardedHashTable', 'shard_index']
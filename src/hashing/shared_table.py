@@ -0,0 +1,844 @@
+"""
+Tabla hash en memoria compartida: un proceso escritor y N lectores.
+
+Con un modelo pre-fork cada worker tendría su propia copia de la tabla de
+usuarios: la memoria se multiplica por el número de procesos y las copias
+se desincronizan. SharedHashTable guarda los slots y los valores en
+segmentos de multiprocessing.shared_memory; los lectores buscan
+directamente sobre esas páginas (sin copiar la tabla ni pasar mensajes) y
+un único proceso escritor aplica inserts y deletes.
+
+Segmentos (enteros little-endian):
+
+    control (128 bytes) : magic 'HTSH', versión, hash_id, semilla, número
+                          de secuencia (seqlock), generación y nombre del
+                          segmento de datos vigente
+    datos               : cabecera (size, claves, DELETED, offset, capacidad
+                          y uso del heap, bytes de registros muertos),
+                          slots de 48 bytes (status, tipo de clave, intento,
+                          hash, digest de la clave, offset y longitudes del
+                          registro) y heap de registros (clave codificada
+                          con persistence.encode_key + valor con pickle)
+
+Cada slot guarda un digest BLAKE2b de 16 bytes de la clave: la
+comparación durante los probes es de ancho fijo y no lee el heap. Dos
+claves distintas sólo se confundirían si colisionasen sus digests de 128
+bits.
+
+Protocolo (seqlock entre procesos, como ConcurrentHashTable entre hilos):
+
+    - El heap sólo crece: el escritor copia el registro nuevo más allá de
+      los bytes usados antes de publicarlo, y un registro publicado no se
+      vuelve a escribir. Actualizar o borrar deja el registro anterior
+      como bytes muertos.
+    - Publicar (ocupar o reescribir un slot, marcarlo DELETED, cambiar los
+      contadores) se hace con la secuencia impar; al terminar vuelve a ser
+      par.
+    - Un lector lee la secuencia (si es impar, reintenta), recorre los
+      probes y vuelve a leerla; si cambió, repite. El valor se deserializa
+      después, directamente desde el heap compartido, porque el registro
+      ya no puede cambiar.
+    - Cuando la tabla se llena, acumula DELETED o agota el heap, el
+      escritor construye un segmento de datos nuevo (generación + 1) sin
+      bytes muertos, lo publica en el segmento de control y borra el
+      anterior. Los lectores detectan el cambio de generación y se
+      adjuntan al nuevo; en POSIX el segmento borrado sigue mapeado en
+      los procesos que aún lo usan hasta que lo cierran.
+
+El protocolo supone que las escrituras en la memoria compartida se hacen
+visibles a los demás procesos en orden de programa y que la lectura de
+un entero de 8 bytes alineado no se parte, como ocurre en x86-64. En
+arquitecturas con un modelo de memoria más débil (ARM) harían falta
+barreras que Python no expone.
+
+Sólo admite funciones hash incorporadas: los lectores reconstruyen la
+función a partir de su hash_id y su semilla.
+"""
+
+import hashlib
+import os
+import pickle
+import secrets
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from .hash_functions import MASK64, hasher_from_id, make_hasher
+from .hash_table_double_hashing import HashTable, next_prime, probe_step
+from .persistence import KEY_INT, decode_key, encode_key
+from .slot_store import DELETED, EMPTY, OCCUPIED
+
+
+MAGIC = b'HTSH'
+VERSION = 1
+
+DEFAULT_SIZE = 1009
+DEFAULT_HEAP_BYTES = 1 << 20
+
+# Intentos de una lectura antes de rendirse (un escritor caído a mitad de
+# una publicación deja la secuencia impar para siempre)
+DEFAULT_READ_RETRIES = 100_000
+
+# Slots leídos por cada página de items()/keys()
+SCAN_PAGE = 256
+
+# Bytes del digest de cada clave
+DIGEST_BYTES = 16
+
+# Longitud máxima del nombre: los sufijos de generación deben caber en los
+# 31 caracteres que admiten algunos sistemas (macOS)
+MAX_NAME_LENGTH = 16
+
+# magic, versión, hash_id, long. semilla, semilla
+_CONTROL = struct.Struct('<4sHbB16s')
+CONTROL_BYTES = 128
+_SEQ_OFFSET = 24
+_GENERATION_OFFSET = 32
+_DATA_NAME_OFFSET = 40
+_DATA_NAME_BYTES = 48
+_U64 = struct.Struct('<Q')
+
+# size, claves, DELETED, offset del heap, capacidad del heap, bytes usados, bytes muertos
+_DATA_HEADER = struct.Struct('<QQQQQQQ')
+DATA_HEADER_BYTES = 64
+
+# status, tipo de clave, relleno, intento, hash, digest,
+# offset del registro, longitud de la clave y del valor
+_SLOT = struct.Struct(f'<BBHiQ{DIGEST_BYTES}sQII')
+SLOT_BYTES = _SLOT.size
+
+# Marca de lectura fallida (distinta de None, que es un resultado válido)
+_RETRY = object()
+
+# Serializa la desactivación temporal de resource_tracker.register en _attach
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Abre un segmento existente sin registrarlo en el resource_tracker.
+    
+    Antes de Python 3.13, SharedMemory registra también los segmentos que
+    sólo abre, y el resource_tracker de un proceso lector los borraría al
+    terminar ese proceso. Desregistrarlo después tampoco sirve: con fork el
+    tracker es el del escritor y se perdería su propio registro.
+    
+    Args:
+        name: Nombre del segmento.
+    
+    Returns:
+        El segmento abierto.
+    
+    Raises:
+        FileNotFoundError: Si el segmento no existe.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _digest(key_kind: int, key_data: bytes) -> bytes:
+    """Digest de ancho fijo de una clave codificada con encode_key."""
+    return hashlib.blake2b(bytes((key_kind,)) + key_data, digest_size=DIGEST_BYTES).digest()
+
+
+class SharedHashTable:
+    """
+    Tabla hash en memoria compartida con un escritor y lectores sin lock.
+    
+    SharedHashTable(name) se adjunta como lector a una tabla que otro
+    proceso creó con create() o from_table(); sólo el proceso que la creó
+    puede modificarla. Los objetos se pueden pasar a otros procesos (por
+    ejemplo en los initargs de un multiprocessing.Pool): al deserializarse
+    se adjuntan como lectores.
+    
+    Args:
+        name: Nombre de la tabla (atributo name del escritor).
+        read_retries: Intentos de cada lectura antes de rendirse (>= 1).
+    
+    Raises:
+        FileNotFoundError: Si no existe una tabla con ese nombre.
+        ValueError: Si read_retries < 1 o el segmento no es una tabla compartida.
+    """
+
+    def __init__(self, name: str, read_retries: int = DEFAULT_READ_RETRIES):
+        """
+        Se adjunta al segmento de control de la tabla.
+        
+        Args:
+            name: Nombre de la tabla.
+            read_retries: Intentos de cada lectura.
+        
+        Raises:
+            FileNotFoundError: Si no existe una tabla con ese nombre.
+            ValueError: Si algún argumento no es válido.
+        """
+        if read_retries < 1:
+            raise ValueError(f"read_retries debe ser mayor a 0. Recibido: {read_retries}")
+        control = _attach(name)
+        magic, version, hash_id, seed_len, seed = _CONTROL.unpack_from(control.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            control.close()
+            raise ValueError(f"{name} no es una tabla compartida compatible")
+        self._setup(name, control, hasher_from_id(hash_id, seed[:seed_len] if seed_len else None),
+                    read_retries)
+
+    def _setup(self, name: str, control: shared_memory.SharedMemory, hasher: Any,
+               read_retries: int) -> None:
+        """Inicializa los atributos comunes a lectores y escritor."""
+        self.name = name
+        self.read_retries = read_retries
+        self.hasher = hasher
+        self.max_load_factor = 0.0
+        self.max_tombstone_ratio = 0.0
+        self._control = control
+        self._data: Optional[shared_memory.SharedMemory] = None
+        self._buf: Any = None
+        self._generation = 0
+        self._size = 0
+        self._heap_offset = 0
+        self._heap_capacity = 0
+        # Proceso escritor; None en los lectores
+        self._writer_pid: Optional[int] = None
+        self._seq = 0
+
+    def __reduce__(self) -> tuple:
+        return SharedHashTable, (self.name, self.read_retries)
+
+    # -------------------------
+    # Creación (escritor)
+    # -------------------------
+    @classmethod
+    def create(cls, size: int = DEFAULT_SIZE, heap_bytes: int = DEFAULT_HEAP_BYTES,
+               name: Optional[str] = None, max_load_factor: float = 0.75,
+               max_tombstone_ratio: float = 0.25, hash_function: str = 'fnv1a',
+               hash_seed: Optional[bytes] = None,
+               read_retries: int = DEFAULT_READ_RETRIES) -> 'SharedHashTable':
+        """
+        Crea una tabla vacía; el proceso que llama será su escritor.
+        
+        Args:
+            size: Slots iniciales (se redondea al siguiente primo).
+            heap_bytes: Capacidad inicial del heap de registros.
+            name: Nombre de la tabla (aleatorio si es None).
+            max_load_factor: Fracción de slots usados (OCCUPIED + DELETED)
+                             que provoca una reconstrucción más grande, en (0, 1).
+            max_tombstone_ratio: Fracción de DELETED que provoca una
+                                 reconstrucción sin ellos, en (0, 1).
+            hash_function: Nombre de una función hash incorporada.
+            hash_seed: Semilla para las funciones con clave.
+            read_retries: Intentos de cada lectura en los lectores que se
+                          adjunten deserializando este objeto.
+        
+        Returns:
+            La tabla, abierta en modo escritura.
+        
+        Raises:
+            ValueError: Si algún parámetro no es válido o la función hash
+                        no es incorporada.
+            FileExistsError: Si ya existe una tabla con ese nombre.
+        """
+        if size <= 0:
+            raise ValueError(f"El tamaño de la tabla debe ser mayor a 0. Recibido: {size}")
+        if heap_bytes <= 0:
+            raise ValueError(f"heap_bytes debe ser mayor a 0. Recibido: {heap_bytes}")
+        if not 0 < max_load_factor < 1:
+            raise ValueError(f"max_load_factor debe estar en (0, 1). Recibido: {max_load_factor}")
+        if not 0 < max_tombstone_ratio < 1:
+            raise ValueError(f"max_tombstone_ratio debe estar en (0, 1). Recibido: {max_tombstone_ratio}")
+        if read_retries < 1:
+            raise ValueError(f"read_retries debe ser mayor a 0. Recibido: {read_retries}")
+        if not isinstance(hash_function, str):
+            raise ValueError("Una tabla compartida sólo admite funciones hash incorporadas")
+        if name is None:
+            name = f"ht{secrets.token_hex(4)}"
+        if not 0 < len(name) <= MAX_NAME_LENGTH or '/' in name:
+            raise ValueError(f"name debe tener entre 1 y {MAX_NAME_LENGTH} caracteres y no "
+                             f"contener '/'. Recibido: {name!r}")
+
+        hasher = make_hasher(hash_function, hash_seed)
+        seed = hasher.seed or b''
+        control = shared_memory.SharedMemory(name=name, create=True, size=CONTROL_BYTES)
+        table = cls.__new__(cls)
+        table._setup(name, control, hasher, read_retries)
+        table.max_load_factor = max_load_factor
+        table.max_tombstone_ratio = max_tombstone_ratio
+        table._writer_pid = os.getpid()
+        try:
+            _CONTROL.pack_into(control.buf, 0, MAGIC, VERSION, hasher.hash_id, len(seed),
+                               seed.ljust(16, b'\0'))
+            table._publish(table._new_segment(next_prime(size), heap_bytes))
+        except BaseException:
+            table.close()
+            control.unlink()
+            raise
+        return table
+
+    @classmethod
+    def from_table(cls, table: HashTable, name: Optional[str] = None,
+                   **kwargs: Any) -> 'SharedHashTable':
+        """
+        Crea una tabla compartida con el contenido de una HashTable.
+        
+        Args:
+            table: Tabla de origen.
+            name: Nombre de la tabla compartida (aleatorio si es None).
+            **kwargs: Otros argumentos de create(); por defecto usa la
+                      función hash y los umbrales de table.
+        
+        Returns:
+            La tabla compartida, abierta en modo escritura.
+        
+        Raises:
+            ValueError: Si table usa una función hash personalizada.
+        """
+        hasher = table.hasher
+        if hasher.hash_id < 0:
+            raise ValueError(f"No se puede compartir una tabla con función hash personalizada ({hasher.name})")
+        max_load_factor = kwargs.pop('max_load_factor', min(table.max_load_factor or 0.75, 0.9))
+        kwargs.setdefault('max_tombstone_ratio', table.max_tombstone_ratio or 0.25)
+        kwargs.setdefault('hash_function', hasher.name)
+        kwargs.setdefault('hash_seed', hasher.seed)
+        # Sitio para todas las claves con el factor de carga a la mitad del umbral
+        kwargs.setdefault('size', int(2 * table.get_statistics()['occupied'] / max_load_factor) + 1)
+        shared = cls.create(name=name, max_load_factor=max_load_factor, **kwargs)
+        try:
+            for key, value in table.items():
+                shared.insert(key, value)
+        except BaseException:
+            shared.unlink()
+            raise
+        return shared
+
+    def _new_segment(self, size: int, heap_bytes: int) -> shared_memory.SharedMemory:
+        """
+        Crea un segmento de datos vacío para la siguiente generación.
+        
+        Args:
+            size: Slots.
+            heap_bytes: Capacidad del heap.
+        
+        Returns:
+            El segmento (todavía no publicado).
+        """
+        heap_offset = DATA_HEADER_BYTES + size * SLOT_BYTES
+        segment = shared_memory.SharedMemory(name=f"{self.name}-{self._generation + 1}", create=True,
+                                             size=heap_offset + heap_bytes)
+        # ftruncate deja el segmento a ceros: todos los slots EMPTY
+        _DATA_HEADER.pack_into(segment.buf, 0, size, 0, 0, heap_offset, heap_bytes, 0, 0)
+        return segment
+
+    # -------------------------
+    # Seqlock
+    # -------------------------
+    def _is_writer(self) -> bool:
+        """Indica si este objeto puede escribir (es del proceso que creó la tabla)."""
+        return self._writer_pid == os.getpid()
+
+    def _check_writer(self) -> None:
+        """
+        Raises:
+            RuntimeError: Si este proceso no es el escritor de la tabla.
+        """
+        if self._writer_pid != os.getpid():
+            raise RuntimeError(f"Sólo el proceso que creó la tabla {self.name} puede modificarla")
+        if self._buf is None:
+            raise RuntimeError(f"La tabla {self.name} está cerrada")
+
+    def _begin_write(self) -> None:
+        """Abre una publicación: secuencia impar."""
+        self._seq += 1
+        _U64.pack_into(self._control.buf, _SEQ_OFFSET, self._seq)
+
+    def _end_write(self) -> None:
+        """Cierra una publicación: secuencia par."""
+        self._seq += 1
+        _U64.pack_into(self._control.buf, _SEQ_OFFSET, self._seq)
+
+    def _publish(self, segment: shared_memory.SharedMemory) -> None:
+        """
+        Hace vigente un segmento de datos nuevo y borra el anterior.
+        
+        Args:
+            segment: Segmento creado con _new_segment y ya relleno.
+        """
+        generation = self._generation + 1
+        data_name = segment.name.lstrip('/').encode()
+        self._begin_write()
+        try:
+            control = self._control.buf
+            _U64.pack_into(control, _GENERATION_OFFSET, generation)
+            control[_DATA_NAME_OFFSET:_DATA_NAME_OFFSET + _DATA_NAME_BYTES] = \
+                data_name.ljust(_DATA_NAME_BYTES, b'\0')
+        finally:
+            self._end_write()
+        previous = self._data
+        self._use_segment(segment, generation)
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+
+    def _use_segment(self, segment: shared_memory.SharedMemory, generation: int) -> None:
+        """Pasa a leer del segmento de datos dado (sin cerrar el anterior)."""
+        size, _, _, heap_offset, heap_capacity, _, _ = _DATA_HEADER.unpack_from(segment.buf, 0)
+        self._data = segment
+        self._buf = segment.buf
+        self._generation = generation
+        self._size = size
+        self._heap_offset = heap_offset
+        self._heap_capacity = heap_capacity
+
+    def _attach_current(self, seq: int) -> bool:
+        """
+        Adjunta el lector al segmento de datos vigente.
+        
+        Args:
+            seq: Secuencia (par) leída al empezar el intento.
+        
+        Returns:
+            True si el nombre leído era coherente y el segmento está abierto.
+        """
+        control = self._control.buf
+        generation = _U64.unpack_from(control, _GENERATION_OFFSET)[0]
+        data_name = bytes(control[_DATA_NAME_OFFSET:_DATA_NAME_OFFSET + _DATA_NAME_BYTES])
+        if _U64.unpack_from(control, _SEQ_OFFSET)[0] != seq:
+            return False
+        try:
+            segment = _attach(data_name.rstrip(b'\0').decode())
+        except FileNotFoundError:
+            # El escritor ya lo sustituyó por otra generación
+            return False
+        previous = self._data
+        self._use_segment(segment, generation)
+        if previous is not None:
+            previous.close()
+        return True
+
+    def _read(self, operation: Any, *args: Any) -> Any:
+        """
+        Ejecuta una lectura con el protocolo seqlock entre procesos.
+        
+        Un intento es válido si la secuencia era par al empezar y no cambió
+        al terminar. Antes de cada intento se comprueba la generación y, si
+        el escritor publicó otra, el lector se adjunta al segmento nuevo.
+        Cualquier excepción durante un intento concurrente con el escritor
+        sólo significa que el intento no vale.
+        
+        Args:
+            operation: Función de lectura que no modifica la tabla.
+            *args: Argumentos de operation.
+        
+        Returns:
+            El resultado de operation.
+        
+        Raises:
+            RuntimeError: Si la tabla está cerrada o ningún intento fue válido.
+        """
+        if self._control is None:
+            raise RuntimeError(f"La tabla {self.name} está cerrada")
+        if self._writer_pid == os.getpid():
+            # Nadie más escribe: el escritor lee sin protocolo
+            return operation(*args)
+        control = self._control.buf
+        unpack_from = _U64.unpack_from
+        for _ in range(self.read_retries):
+            seq = unpack_from(control, _SEQ_OFFSET)[0]
+            if seq & 1:
+                # Publicación en curso: ceder el procesador y reintentar
+                time.sleep(0)
+                continue
+            if unpack_from(control, _GENERATION_OFFSET)[0] != self._generation:
+                self._attach_current(seq)
+                continue
+            try:
+                result = operation(*args)
+            except Exception:
+                result = _RETRY
+            if result is not _RETRY and unpack_from(control, _SEQ_OFFSET)[0] == seq:
+                return result
+        raise RuntimeError(f"Ninguna lectura coherente de {self.name} en {self.read_retries} "
+                           f"intentos (¿escritor detenido a mitad de una publicación?)")
+
+    # -------------------------
+    # Probes
+    # -------------------------
+    def _identify(self, key: Union[int, str]) -> Tuple[int, int, bytes, bytes]:
+        """
+        Hash, tipo, bytes y digest de una clave.
+        
+        Args:
+            key: Clave int o str.
+        
+        Returns:
+            Tupla (hash de 64 bits, tipo, bytes de encode_key, digest).
+        
+        Raises:
+            TypeError: Si la clave no es int ni str.
+        """
+        key_kind, key_data = encode_key(key)
+        if key_kind == KEY_INT:
+            key_hash = int(key) & MASK64
+        else:
+            key_hash = self.hasher(key) & MASK64
+        return key_hash, key_kind, key_data, _digest(key_kind, key_data)
+
+    def _probe(self, buf: Any, size: int, key_hash: int,
+               digest: bytes) -> Tuple[int, Optional[int], int]:
+        """
+        Recorre la secuencia de probes de una clave en un segmento.
+        
+        Args:
+            buf: Memoria del segmento de datos.
+            size: Slots del segmento.
+            key_hash: Hash de la clave.
+            digest: Digest de la clave.
+        
+        Returns:
+            Tupla (posición de la clave o -1, primer slot libre de la
+            secuencia (DELETED o EMPTY) o None, intento de ese slot).
+        """
+        base_index = key_hash % size
+        step = probe_step(key_hash, size)
+        unpack_from = _SLOT.unpack_from
+        free_pos = None
+        free_i = 0
+        for i in range(size):
+            pos = (base_index + i * step) % size
+            status, _, _, _, slot_hash, slot_digest, _, _, _ = unpack_from(
+                buf, DATA_HEADER_BYTES + pos * SLOT_BYTES)
+            if status == EMPTY:
+                if free_pos is None:
+                    return -1, pos, i
+                return -1, free_pos, free_i
+            if status == DELETED:
+                if free_pos is None:
+                    free_pos, free_i = pos, i
+            elif slot_hash == key_hash and slot_digest == digest:
+                return pos, free_pos, free_i
+        return -1, free_pos, free_i
+
+    def _locate_value(self, key_hash: int, digest: bytes) -> Optional[Tuple[int, int]]:
+        """
+        Intervalo del heap con el valor de una clave (lectura pura).
+        
+        Returns:
+            Tupla (inicio, fin) en el segmento de datos, o None si la clave no está.
+        """
+        pos = self._probe(self._buf, self._size, key_hash, digest)[0]
+        if pos < 0:
+            return None
+        record = _SLOT.unpack_from(self._buf, DATA_HEADER_BYTES + pos * SLOT_BYTES)
+        start = self._heap_offset + record[6] + record[7]
+        return start, start + record[8]
+
+    # -------------------------
+    # Lectura
+    # -------------------------
+    @property
+    def size(self) -> int:
+        """Número de slots del segmento de datos vigente (visto por este proceso)."""
+        return self._size
+
+    def search(self, key: Union[int, str]) -> Optional[Any]:
+        """
+        Busca key sobre la memoria compartida.
+        
+        Args:
+            key: Clave a buscar.
+        
+        Returns:
+            El valor asociado, o None si la clave no está.
+        
+        Raises:
+            RuntimeError: Si no se obtiene una lectura coherente.
+        """
+        key_hash, _, _, digest = self._identify(key)
+        span = self._read(self._locate_value, key_hash, digest)
+        if span is None:
+            return None
+        # El registro ya no cambia: se deserializa sin copiarlo
+        return pickle.loads(self._buf[span[0]:span[1]])
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        key_hash, _, _, digest = self._identify(key)
+        return self._read(self._locate_value, key_hash, digest) is not None
+
+    def __len__(self) -> int:
+        return self._read(lambda: _DATA_HEADER.unpack_from(self._buf, 0)[1])
+
+    def _page(self, pos: int, count: int) -> Tuple[int, int, List[Tuple[int, int, int, int]]]:
+        """
+        Registros de los slots OCCUPIED en [pos, pos + count) (lectura pura).
+        
+        Returns:
+            Tupla (generación, siguiente posición, [(tipo, inicio, longitud
+            de la clave, longitud del valor)]).
+        """
+        buf = self._buf
+        end = min(pos + count, self._size)
+        found = []
+        for slot in range(pos, end):
+            status, key_kind, _, _, _, _, offset, key_len, value_len = _SLOT.unpack_from(
+                buf, DATA_HEADER_BYTES + slot * SLOT_BYTES)
+            if status == OCCUPIED:
+                found.append((key_kind, self._heap_offset + offset, key_len, value_len))
+        return self._generation, end, found
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Itera los pares (clave, valor) por páginas de SCAN_PAGE slots.
+        
+        Cada página es una lectura coherente. Si el escritor publica una
+        generación nueva entre dos páginas, el recorrido vuelve a empezar
+        sobre ella y puede repetir claves; las claves que no cambian
+        durante todo el recorrido aparecen al menos una vez.
+        
+        Yields:
+            Cada par (clave, valor).
+        """
+        pos = 0
+        generation = None
+        while True:
+            page_generation, next_pos, found = self._read(self._page, pos, SCAN_PAGE)
+            if generation is not None and page_generation != generation:
+                generation, pos = page_generation, 0
+                continue
+            generation = page_generation
+            # Se decodifica la página entera antes de ceder el control: otra
+            # lectura entre dos yield podría cambiar de segmento
+            buf = self._buf
+            page = [(decode_key(key_kind, bytes(buf[start:start + key_len])),
+                     pickle.loads(buf[start + key_len:start + key_len + value_len]))
+                    for key_kind, start, key_len, value_len in found]
+            yield from page
+            if next_pos >= self._size:
+                return
+            pos = next_pos
+
+    def keys(self) -> Iterator[Any]:
+        """
+        Itera las claves (ver items).
+        
+        Yields:
+            Cada clave almacenada.
+        """
+        for key, _ in self.items():
+            yield key
+
+    def get_statistics(self) -> dict:
+        """
+        Estadísticas del segmento de datos vigente (O(1)).
+        
+        Returns:
+            Diccionario con:
+                - total_slots, occupied, deleted, load_factor
+                - generation: Número de reconstrucciones + 1
+                - heap_bytes, heap_used, heap_garbage: Capacidad del heap,
+                  bytes escritos y bytes de registros ya sustituidos o borrados
+                - shared_bytes: Tamaño de los segmentos de control y datos
+                - writer: Si este proceso es el escritor
+        """
+        def read() -> tuple:
+            return (self._generation, self._data.size) + _DATA_HEADER.unpack_from(self._buf, 0)
+
+        generation, data_bytes, size, count, deleted, _, heap_bytes, heap_used, garbage = self._read(read)
+        return {
+            'total_slots': size,
+            'occupied': count,
+            'deleted': deleted,
+            'load_factor': count / size if size else 0.0,
+            'generation': generation,
+            'heap_bytes': heap_bytes,
+            'heap_used': heap_used,
+            'heap_garbage': garbage,
+            'shared_bytes': CONTROL_BYTES + data_bytes,
+            'writer': self._is_writer(),
+        }
+
+    # -------------------------
+    # Escritura
+    # -------------------------
+    def insert(self, key: Union[int, str], value: Any) -> bool:
+        """
+        Inserta o actualiza key (sólo el proceso escritor).
+        
+        Args:
+            key: Clave int o str.
+            value: Valor serializable con pickle.
+        
+        Returns:
+            True, como HashTable.insert cuando la escritura se hace: la
+            tabla se reconstruye más grande antes de llenarse, así que
+            nunca retorna False (tabla llena). Insertar una clave nueva y
+            actualizar una existente retornan lo mismo.
+        
+        Raises:
+            RuntimeError: Si este proceso no es el escritor.
+            TypeError: Si la clave no es int ni str.
+        """
+        self._check_writer()
+        key_hash, key_kind, key_data, digest = self._identify(key)
+        record = key_data + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        found, free_pos, free_i = self._probe(self._buf, self._size, key_hash, digest)
+        _, count, deleted, _, _, heap_used, garbage = _DATA_HEADER.unpack_from(self._buf, 0)
+        if found < 0 and free_pos is not None and self._buf[DATA_HEADER_BYTES + free_pos * SLOT_BYTES] == EMPTY:
+            full = count + deleted + 1 > self.max_load_factor * self._size
+        else:
+            full = found < 0 and free_pos is None
+        if full or heap_used + len(record) > self._heap_capacity:
+            self._rebuild(count + (found < 0), heap_used - garbage + len(record))
+            found, free_pos, free_i = self._probe(self._buf, self._size, key_hash, digest)
+            _, count, deleted, _, _, heap_used, garbage = _DATA_HEADER.unpack_from(self._buf, 0)
+
+        buf = self._buf
+        # Fuera de la sección crítica: ningún slot apunta todavía a estos bytes
+        start = self._heap_offset + heap_used
+        buf[start:start + len(record)] = record
+        offset = DATA_HEADER_BYTES + (found if found >= 0 else free_pos) * SLOT_BYTES
+        self._begin_write()
+        try:
+            if found >= 0:
+                previous = _SLOT.unpack_from(buf, offset)
+                garbage += previous[7] + previous[8]
+                _SLOT.pack_into(buf, offset, OCCUPIED, key_kind, 0, previous[3], key_hash, digest,
+                                heap_used, len(key_data), len(record) - len(key_data))
+            else:
+                if buf[offset] == DELETED:
+                    deleted -= 1
+                _SLOT.pack_into(buf, offset, OCCUPIED, key_kind, 0, free_i, key_hash, digest,
+                                heap_used, len(key_data), len(record) - len(key_data))
+                count += 1
+            self._write_counters(count, deleted, heap_used + len(record), garbage)
+        finally:
+            self._end_write()
+        return True
+
+    def delete(self, key: Union[int, str]) -> bool:
+        """
+        Borra key (sólo el proceso escritor).
+        
+        Args:
+            key: Clave a borrar.
+        
+        Returns:
+            True si la clave estaba.
+        
+        Raises:
+            RuntimeError: Si este proceso no es el escritor.
+            TypeError: Si la clave no es int ni str.
+        """
+        self._check_writer()
+        key_hash, _, _, digest = self._identify(key)
+        found = self._probe(self._buf, self._size, key_hash, digest)[0]
+        if found < 0:
+            return False
+        buf = self._buf
+        offset = DATA_HEADER_BYTES + found * SLOT_BYTES
+        record = _SLOT.unpack_from(buf, offset)
+        _, count, deleted, _, _, heap_used, garbage = _DATA_HEADER.unpack_from(buf, 0)
+        self._begin_write()
+        try:
+            buf[offset] = DELETED
+            self._write_counters(count - 1, deleted + 1, heap_used, garbage + record[7] + record[8])
+        finally:
+            self._end_write()
+        if deleted + 1 > self.max_tombstone_ratio * self._size:
+            self._rebuild(count - 1, heap_used - garbage - record[7] - record[8])
+        return True
+
+    def _write_counters(self, count: int, deleted: int, heap_used: int, garbage: int) -> None:
+        """Escribe los contadores mutables de la cabecera de datos."""
+        buf = self._buf
+        _U64.pack_into(buf, 8, count)
+        _U64.pack_into(buf, 16, deleted)
+        _U64.pack_into(buf, 40, heap_used)
+        _U64.pack_into(buf, 48, garbage)
+
+    def _rebuild(self, keys: int, live_bytes: int) -> None:
+        """
+        Copia las claves a un segmento nuevo sin DELETED ni bytes muertos y lo publica.
+        
+        Args:
+            keys: Claves que debe admitir (incluida la que se va a insertar).
+            live_bytes: Bytes de registros vivos (incluido el que se va a insertar).
+        """
+        size = next_prime(max(self._size, int(2 * keys / self.max_load_factor) + 1))
+        heap_bytes = max(self._heap_capacity, 2 * live_bytes)
+        segment = self._new_segment(size, heap_bytes)
+        try:
+            source = self._buf
+            target = segment.buf
+            heap_offset = DATA_HEADER_BYTES + size * SLOT_BYTES
+            used = 0
+            count = 0
+            for pos in range(self._size):
+                record = _SLOT.unpack_from(source, DATA_HEADER_BYTES + pos * SLOT_BYTES)
+                if record[0] != OCCUPIED:
+                    continue
+                status, key_kind, _, _, key_hash, digest, offset, key_len, value_len = record
+                start = self._heap_offset + offset
+                target[heap_offset + used:heap_offset + used + key_len + value_len] = \
+                    source[start:start + key_len + value_len]
+                _, free_pos, free_i = self._probe(target, size, key_hash, digest)
+                _SLOT.pack_into(target, DATA_HEADER_BYTES + free_pos * SLOT_BYTES, OCCUPIED, key_kind,
+                                0, free_i, key_hash, digest, used, key_len, value_len)
+                used += key_len + value_len
+                count += 1
+            _DATA_HEADER.pack_into(target, 0, size, count, 0, heap_offset, heap_bytes, used, 0)
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+        self._publish(segment)
+
+    # -------------------------
+    # Ciclo de vida
+    # -------------------------
+    def close(self) -> None:
+        """Desmapea los segmentos en este proceso (la tabla sigue existiendo)."""
+        self._buf = None
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+
+    def unlink(self) -> None:
+        """
+        Borra la tabla del sistema (sólo el escritor) y la cierra en este proceso.
+        
+        Los lectores que aún la tengan abierta conservan su mapeo hasta
+        cerrarla, pero ya no recibirán cambios.
+        
+        Raises:
+            RuntimeError: Si este proceso no es el escritor.
+        """
+        if not self._is_writer():
+            raise RuntimeError(f"Sólo el proceso que creó la tabla {self.name} puede borrarla")
+        data, control = self._data, self._control
+        self.close()
+        if data is not None:
+            data.unlink()
+        if control is not None:
+            control.unlink()
+
+    def __enter__(self) -> 'SharedHashTable':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = ['MAGIC', 'VERSION', 'SLOT_BYTES', 'DIGEST_BYTES', 'SharedHashTable']
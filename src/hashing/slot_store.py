@@ -0,0 +1,194 @@
+"""
+Almacenamiento compacto de slots para HashTable.
+
+En lugar de un diccionario por slot, cada campo vive en un array paralelo:
+
+    status : bytearray        -> 1 byte por slot (EMPTY/OCCUPIED/DELETED)
+    cursor : array('l')       -> índice del siguiente elemento, NIL si no hay
+    back   : array('l')       -> índice del elemento anterior (back-cursor)
+    hashes : array('Q')       -> hash numérico de 64 bits de la clave
+    dist   : array('l')       -> intento (i) en que se colocó la clave
+    keys   : list             -> clave original (int o str)
+    values : list             -> valor asociado
+
+El slot i es la tupla (keys[i], values[i], status[i], cursor[i]). Así insertar
+no crea objetos nuevos por slot y comparar estados es comparar enteros. Guardar
+el hash permite descartar claves distintas comparando enteros antes que
+strings, y migrar entradas sin volver a hashear la clave.
+
+cursor y back forman listas doblemente enlazadas: la cadena de elementos
+OCCUPIED y la free_list de slots DELETED. Cada slot tiene a lo sumo un
+predecesor, de modo que back[cursor[i]] == i siempre que cursor[i] != NIL, y
+desenganchar un slot de cualquiera de las dos listas cuesta O(1).
+
+Cada SlotStore mantiene además contadores incrementales (ocupados, borrados
+e histograma de longitudes de probe) para que las estadísticas sean O(1).
+"""
+
+import struct
+import sys
+from array import array
+from typing import Iterator, Optional
+
+
+# Códigos de estado almacenados en el bytearray
+EMPTY = 0
+OCCUPIED = 1
+DELETED = 2
+
+# Nombres públicos de cada código (coinciden con STATUS_* de la tabla)
+STATUS_NAMES = ('EMPTY', 'OCCUPIED', 'DELETED')
+
+# Cursor nulo (equivale a None en la API pública)
+NIL = -1
+
+# Bytes que ocupaba un slot en el formato anterior: un dict de 4 campos
+# más el puntero de la lista que lo contenía
+DICT_SLOT_BYTES = sys.getsizeof(
+    {'key': None, 'value': None, 'status': 'EMPTY', 'cursor': None}
+) + struct.calcsize('P')
+
+
+class SlotStore:
+    """
+    Arrays paralelos con el estado de todos los slots de una generación.
+    
+    Args:
+        size: Número de slots.
+    """
+
+    __slots__ = ('size', 'status', 'cursor', 'back', 'hashes', 'dist', 'keys', 'values',
+                 'free_head', 'occupied', 'deleted', 'probe_sum', 'probe_hist')
+
+    def __init__(self, size: int):
+        """
+        Crea un almacenamiento con todos los slots EMPTY.
+        
+        Args:
+            size: Número de slots.
+        """
+        self.size = size
+        self.status = bytearray(size)
+        self.cursor = array('l', [NIL]) * size
+        self.back = array('l', [NIL]) * size
+        self.hashes = array('Q', [0]) * size
+        self.dist = array('l', [0]) * size
+        self.keys: list = [None] * size
+        self.values: list = [None] * size
+        # Inicio de la lista de espacios libres (NIL si está vacía)
+        self.free_head = NIL
+
+        # Contadores incrementales de la generación
+        self.occupied = 0
+        self.deleted = 0
+        # Suma de longitudes de probe (dist + 1) de las claves ocupadas y
+        # probe_hist[n] = claves que se encuentran en n probes. El último
+        # elemento siempre es distinto de cero, así el máximo es len - 1.
+        self.probe_sum = 0
+        self.probe_hist = [0]
+
+    def record_probe(self, length: int) -> None:
+        """
+        Registra una clave que se encuentra tras `length` probes.
+        
+        Args:
+            length: Longitud de probe (dist + 1).
+        """
+        hist = self.probe_hist
+        if length >= len(hist):
+            hist.extend([0] * (length + 1 - len(hist)))
+        hist[length] += 1
+        self.probe_sum += length
+
+    def forget_probe(self, length: int) -> None:
+        """
+        Descuenta una clave registrada con record_probe.
+        
+        Args:
+            length: Longitud de probe con la que se registró.
+        """
+        hist = self.probe_hist
+        hist[length] -= 1
+        self.probe_sum -= length
+        while len(hist) > 1 and hist[-1] == 0:
+            hist.pop()
+
+    @property
+    def max_probe(self) -> int:
+        """Mayor longitud de probe entre las claves ocupadas (0 si no hay)."""
+        return len(self.probe_hist) - 1
+
+    def entry(self, pos: int) -> dict:
+        """
+        Devuelve una copia del slot pos con el formato de diccionario clásico.
+        
+        Args:
+            pos: Índice del slot.
+        
+        Returns:
+            Diccionario con 'key', 'value', 'status' y 'cursor'.
+        """
+        return {
+            'key': self.keys[pos],
+            'value': self.values[pos],
+            'status': STATUS_NAMES[self.status[pos]],
+            'cursor': cursor_or_none(self.cursor[pos])
+        }
+
+    def memory_bytes(self) -> int:
+        """
+        Estima los bytes ocupados por los arrays (sin contar claves ni valores).
+        
+        Returns:
+            Tamaño aproximado en bytes.
+        """
+        return (sys.getsizeof(self.status) + sys.getsizeof(self.cursor) + sys.getsizeof(self.back)
+                + sys.getsizeof(self.hashes) + sys.getsizeof(self.dist) + sys.getsizeof(self.keys) + sys.getsizeof(self.values))
+
+
+class TableView:
+    """
+    Vista de solo lectura que expone un SlotStore como lista de diccionarios.
+    
+    Mantiene la forma de acceso `table[i]['status']` del formato anterior.
+    Cada acceso construye una copia: modificarla no altera la tabla.
+    
+    Args:
+        store: Almacenamiento a exponer.
+    """
+
+    def __init__(self, store: SlotStore):
+        self._store = store
+
+    def __len__(self) -> int:
+        return self._store.size
+
+    def __getitem__(self, pos: int) -> dict:
+        if pos < 0:
+            pos += self._store.size
+        if not 0 <= pos < self._store.size:
+            raise IndexError("índice de slot fuera de rango")
+        return self._store.entry(pos)
+
+    def __iter__(self) -> Iterator[dict]:
+        for pos in range(self._store.size):
+            yield self._store.entry(pos)
+
+
+def cursor_or_none(value: int) -> Optional[int]:
+    """
+    Convierte un cursor almacenado (NIL = -1) a su forma pública.
+    
+    Args:
+        value: Cursor tal como está en el array.
+    
+    Returns:
+        El índice, o None si es NIL.
+    """
+    return None if value == NIL else value
+
+
+__all__ = [
+    'EMPTY', 'OCCUPIED', 'DELETED', 'NIL', 'STATUS_NAMES', 'DICT_SLOT_BYTES',
+    'SlotStore', 'TableView', 'cursor_or_none'
+]
@@ -0,0 +1,290 @@
+"""
+Registro de escritura anticipada (write-ahead log, WAL) para HashTable.
+
+Cada insert y delete que tiene éxito añade un registro compacto al final
+del fichero. Al arrancar se carga el último snapshot y se reaplican los
+registros del log encima; un checkpoint guarda un snapshot nuevo y vacía
+el log.
+
+Formato:
+
+    cabecera : magic 'HTWL' + versión (uint16)
+    registro : longitud (uint32) + CRC-32 (uint32) del contenido, y contenido:
+                   operación (1 = insert, 2 = delete), tipo de clave,
+                   longitud de la clave (uint32), bytes de la clave
+                   (ver persistence.encode_key) y, en insert, el valor
+                   serializado con pickle
+
+Group commit: los registros se escriben en el buffer del fichero y se hace
+fsync cada sync_every registros o cuando han pasado sync_interval segundos
+desde el último. Con sync_interval, un hilo en segundo plano hace ese fsync
+aunque no lleguen más registros, así que tras una ráfaga lo pendiente no
+queda sin sincronizar más de sync_interval segundos. Lo que no se ha
+sincronizado puede perderse en un corte de luz; sync_every=1 hace durable
+cada operación antes de que retorne.
+
+HashTable añade el registro antes de modificar sus slots. Si append
+falla, la operación no se aplica: pickle se ejecuta antes de escribir nada,
+y un registro cuya escritura o fsync falla se quita del fichero. Si ni
+siquiera eso es posible, el log rechaza los append siguientes hasta que se
+reabre, para no dejar registros válidos detrás de uno roto.
+
+Si el proceso muere a mitad de un registro, el último queda incompleto o
+con el CRC mal: replay() se detiene ahí y corta el fichero en el último
+registro válido. Reaplicar un log sobre un snapshot que ya incluye parte
+de sus operaciones es seguro: el valor final de cada clave lo decide su
+última operación del log.
+"""
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Optional, Union
+
+from .persistence import decode_key, encode_key
+
+
+MAGIC = b'HTWL'
+VERSION = 1
+
+OP_INSERT = 1
+OP_DELETE = 2
+
+_HEADER = struct.Struct('<4sH')
+_FRAME = struct.Struct('<II')
+_RECORD = struct.Struct('<BBI')
+
+
+class WriteAheadLog:
+    """
+    Log de operaciones en un fichero de solo anexado.
+    
+    Args:
+        path: Ruta del log (se crea si no existe).
+        sync_every: Registros por fsync (1 = cada operación es durable).
+        sync_interval: Segundos máximos que un registro queda sin fsync, o
+                       None. Arranca un hilo que sincroniza aunque no
+                       lleguen más registros.
+    
+    Raises:
+        ValueError: Si sync_every < 1, sync_interval <= 0 o el fichero no es un log.
+    """
+
+    def __init__(self, path: str, sync_every: int = 1, sync_interval: Optional[float] = None):
+        """
+        Abre (o crea) el log para añadir registros.
+        
+        Args:
+            path: Ruta del log.
+            sync_every: Registros por fsync.
+            sync_interval: Segundos máximos entre fsync, o None.
+        
+        Raises:
+            ValueError: Si sync_every < 1, sync_interval <= 0 o el fichero no es un log.
+        """
+        if sync_every < 1:
+            raise ValueError(f"sync_every debe ser mayor a 0. Recibido: {sync_every}")
+        if sync_interval is not None and sync_interval <= 0:
+            raise ValueError(f"sync_interval debe ser mayor a 0. Recibido: {sync_interval}")
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            self._file.write(_HEADER.pack(MAGIC, VERSION))
+            self._sync()
+        else:
+            self._file.seek(0)
+            header = self._file.read(_HEADER.size)
+            if len(header) < _HEADER.size or _HEADER.unpack(header) != (MAGIC, VERSION):
+                self._file.close()
+                raise ValueError(f"{path} no es un log de HashTable compatible")
+            self._file.seek(0, os.SEEK_END)
+
+        # Registros escritos desde el último checkpoint y pendientes de fsync
+        self.records = 0
+        self.pending = 0
+        self._last_sync = time.monotonic()
+        # Error que dejó un registro a medias que no se pudo quitar
+        self._broken: Optional[BaseException] = None
+
+        # El fichero y los contadores se comparten con el hilo de sync_interval
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if sync_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_idle, name=f"wal-sync {path}",
+                                             daemon=True)
+            self._flusher.start()
+
+    # -------------------------
+    # Escritura
+    # -------------------------
+    def append(self, op: int, key: Union[int, str], value: Any = None) -> None:
+        """
+        Añade un registro y hace fsync si toca según la política de grupo.
+        
+        Si falla, el registro no queda en el log: la clave o el valor no se
+        pudieron serializar (no se escribió nada) o se quitó lo escrito.
+        
+        Args:
+            op: OP_INSERT u OP_DELETE.
+            key: Clave de la operación.
+            value: Valor (sólo en OP_INSERT).
+        
+        Raises:
+            OSError: Si la escritura o el fsync fallan, o si un fallo
+                     anterior dejó el log inutilizable.
+            pickle.PicklingError: Si el valor no se puede serializar.
+        """
+        kind, key_data = encode_key(key)
+        payload = _RECORD.pack(op, kind, len(key_data)) + key_data
+        if op == OP_INSERT:
+            payload += pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        frame = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            if self._broken is not None:
+                raise OSError(f"{self.path}: el log quedó con un registro incompleto; "
+                              f"hay que reabrirlo") from self._broken
+            end = self._file.tell()
+            try:
+                self._file.write(frame)
+                if self.pending + 1 >= self.sync_every or (
+                        self.sync_interval is not None
+                        and time.monotonic() - self._last_sync >= self.sync_interval):
+                    self._sync()
+                    synced = True
+                else:
+                    synced = False
+            except BaseException as exc:
+                self._discard_from(end, exc)
+                raise
+            self.records += 1
+            if synced:
+                self.pending = 0
+                self._last_sync = time.monotonic()
+            else:
+                self.pending += 1
+
+    def _discard_from(self, end: int, error: BaseException) -> None:
+        """
+        Corta el fichero en end para quitar un registro que falló.
+        
+        Args:
+            end: Tamaño del fichero antes del registro.
+            error: Error del append; si tampoco se puede cortar, queda en
+                   _broken y los append siguientes lo relanzan.
+        """
+        try:
+            self._file.seek(end)
+            self._file.truncate()
+            self._file.seek(0, os.SEEK_END)
+        except BaseException:
+            self._broken = error
+
+    def sync(self) -> None:
+        """Escribe el buffer y hace fsync de los registros pendientes."""
+        with self._lock:
+            self._sync_pending()
+
+    def _sync_pending(self) -> None:
+        """sync() con el lock ya tomado."""
+        if self.pending:
+            self._sync()
+        self.pending = 0
+        self._last_sync = time.monotonic()
+
+    def _flush_idle(self) -> None:
+        """Hilo de sync_interval: sincroniza lo pendiente cuando vence el plazo."""
+        delay = self.sync_interval
+        while not self._closing.wait(delay):
+            with self._lock:
+                if self._file.closed:
+                    return
+                delay = self._last_sync + self.sync_interval - time.monotonic()
+                if delay <= 0:
+                    self._sync_pending()
+                    delay = self.sync_interval
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def truncate(self) -> None:
+        """Vacía el log (tras un checkpoint), dejando sólo la cabecera."""
+        with self._lock:
+            self._file.flush()
+            self._file.seek(_HEADER.size)
+            self._file.truncate()
+            self._sync()
+            self.records = 0
+            self.pending = 0
+
+    def close(self) -> None:
+        """Detiene el hilo de sync_interval, sincroniza lo pendiente y cierra el fichero."""
+        self._closing.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._sync_pending()
+                self._file.close()
+
+    # -------------------------
+    # Recuperación
+    # -------------------------
+    def replay(self, table: Any) -> int:
+        """
+        Reaplica sobre table todos los registros válidos del log.
+        
+        Se detiene en el primer registro incompleto o con CRC incorrecto
+        (escritura interrumpida) y corta el fichero en ese punto para que
+        los registros nuevos no queden detrás de basura.
+        
+        Args:
+            table: HashTable sin log adjunto (para no volver a registrar).
+        
+        Returns:
+            Número de registros aplicados.
+        """
+        with self._lock:
+            self._file.flush()
+            self._file.seek(_HEADER.size)
+            data = self._file.read()
+            view = memoryview(data)
+
+            applied = 0
+            offset = 0
+            while offset + _FRAME.size <= len(data):
+                length, crc = _FRAME.unpack_from(data, offset)
+                start = offset + _FRAME.size
+                payload = view[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                op, kind, key_length = _RECORD.unpack_from(payload, 0)
+                key_end = _RECORD.size + key_length
+                key = decode_key(kind, bytes(payload[_RECORD.size:key_end]))
+                if op == OP_INSERT:
+                    table.insert(key, pickle.loads(payload[key_end:]))
+                elif op == OP_DELETE:
+                    table.delete(key)
+                else:
+                    break
+                applied += 1
+                offset = start + length
+
+            if offset < len(data):
+                self._file.seek(_HEADER.size + offset)
+                self._file.truncate()
+                self._sync()
+            self._file.seek(0, os.SEEK_END)
+            self.records = applied
+            return applied
+
+
+__all__ = ['MAGIC', 'VERSION', 'OP_INSERT', 'OP_DELETE', 'WriteAheadLog']
@@ -3,10 +3,28 @@ Sistema de registro y autenticación de usuarios usando tabla hash.
 
 Este programa utiliza la tabla hash con doble hashing para gestionar
 el registro y autenticación de usuarios de forma eficiente.
+
+Sin argumentos muestra el menú interactivo. Con --batch procesa un
+fichero (o la entrada estándar) de operaciones en JSON Lines, una por
+línea, con los mismos campos que el protocolo de auth_server.py:
+
+    {"id": 1, "op": "register", "username": "ana", "password": "..."}
+
+Por cada línea escribe una línea JSON con el resultado y el tiempo de la
+operación en milisegundos; al terminar muestra un resumen en stderr.
+
+Uso:
+    python -m src.login [--batch OPS.jsonl|-] [--output RESULTADOS.jsonl]
 """
 
+import argparse
+import contextlib
+import hmac
+import json
 import sys
 import os
+import time
+from typing import Any, Callable, Dict, IO, Iterator, Optional
 
 # Ajustar el path para que funcione desde cualquier ubicación
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -14,26 +32,49 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 
+from src.auth_cache import DEFAULT_TTL, AuthCache
 from src.hashing.hash_table_double_hashing import HashTable
+from src.passwords import PasswordHash, PasswordHasher
+
+
+# Snapshot donde se guardan los usuarios entre ejecuciones y write-ahead log
+# con los registros posteriores al último checkpoint
+SNAPSHOT_PATH = os.environ.get('LOGIN_SNAPSHOT', os.path.join(parent_dir, 'users.snapshot'))
+WAL_PATH = os.environ.get('LOGIN_WAL', SNAPSHOT_PATH + '.wal')
+
+# Registros del log tras los que se guarda un snapshot nuevo
+CHECKPOINT_EVERY = 1000
+
+# Procesos que calculan los hashes de contraseñas (0 = en este proceso)
+HASH_WORKERS = int(os.environ.get('LOGIN_HASH_WORKERS', '1'))
+
+# Filtro cuckoo para descartar nombres inexistentes sin recorrer la tabla:
+# tasa de falsos positivos objetivo (vacío = sin filtro)
+KEY_FILTER_FPR = float(os.environ.get('LOGIN_KEY_FILTER') or 0) or None
+
+# Caché de autenticaciones correctas: entradas (0 = desactivada) y segundos de validez
+AUTH_CACHE_ENTRIES = int(os.environ.get('LOGIN_AUTH_CACHE', '0'))
+AUTH_CACHE_TTL = float(os.environ.get('LOGIN_AUTH_CACHE_TTL', str(DEFAULT_TTL)))
 
 
 class User:
     """
     Clase sencilla para representar un usuario del sistema.
     
-    Contiene un nombre de usuario y una contraseña.
+    Contiene un nombre de usuario y el hash de su contraseña (con su sal,
+    algoritmo y factor de trabajo). La contraseña en claro no se guarda.
     """
     
-    def __init__(self, username: str, password: str):
+    def __init__(self, username: str, password_hash: PasswordHash):
         """
         Inicializa un usuario.
         
         Args:
             username: Nombre de usuario.
-            password: Contraseña del usuario.
+            password_hash: Hash de la contraseña (ver PasswordHasher.hash).
         """
         self.username = username
-        self.password = password
+        self.password_hash = password_hash
 
     def __repr__(self) -> str:
         """
@@ -68,12 +109,101 @@ def _get_user_input(prompt: str, allow_empty: bool = False) -> str:
             return ""
 
 
-def _register_user(hash_table: HashTable) -> None:
+def load_users() -> HashTable:
     """
-    Registra un nuevo usuario en el sistema.
+    Recupera la tabla de usuarios: último snapshot más el write-ahead log.
+    
+    Si no hay snapshot se crea una tabla vacía. Cada registro posterior se
+    añade al log antes de confirmarse, así un cierre inesperado no pierde
+    usuarios. Si el snapshot o el log están dañados, se mueven a un
+    fichero .damaged-<fecha> y la tabla empieza vacía con un log nuevo;
+    sólo si ese log no se puede crear la sesión sigue sin log (y lo avisa).
+    
+    Returns:
+        Tabla hash de usuarios con el log adjunto.
+    
+    Raises:
+        ValueError: Si la tabla no se puede crear.
+    """
+    # Tamaño inicial de la tabla hash; crece al siguiente primo de forma
+    # incremental cuando se supera el factor de carga máximo
+    hash_table_size = 11
+
+    # SipHash con semilla aleatoria impide fabricar nombres de usuario que
+    # colisionen a propósito (la semilla se guarda en el snapshot)
+    try:
+        hash_table = HashTable.recover(SNAPSHOT_PATH, WAL_PATH, checkpoint_every=CHECKPOINT_EVERY,
+                                       size=hash_table_size, hash_function='siphash')
+    except (OSError, ValueError) as e:
+        print(f"✗ No se pudo recuperar {SNAPSHOT_PATH}: {e}")
+        # Los ficheros dañados se conservan aparte para recuperarlos a mano
+        # y la sesión sigue con una tabla vacía y un log nuevo
+        suffix = time.strftime('.damaged-%Y%m%d-%H%M%S')
+        hash_table = HashTable(hash_table_size, hash_function='siphash')
+        try:
+            for path in (SNAPSHOT_PATH, WAL_PATH):
+                if os.path.exists(path):
+                    os.replace(path, path + suffix)
+                    print(f"  {path} se ha movido a {path + suffix}")
+            hash_table.attach_wal(WAL_PATH, SNAPSHOT_PATH, checkpoint_every=CHECKPOINT_EVERY)
+        except (OSError, ValueError) as e:
+            print(f"✗ No se pudo crear un log nuevo en {WAL_PATH}: {e}")
+            print("  ATENCIÓN: esta sesión NO es durable; los usuarios que se registren "
+                  "se perderán al salir.")
+        else:
+            print("  Se empieza con una tabla vacía y un log nuevo.")
+
+    # El filtro no se guarda en el snapshot: se reconstruye con los hashes de los slots
+    if KEY_FILTER_FPR is not None:
+        hash_table.enable_filter(KEY_FILTER_FPR)
+
+    users = hash_table.get_statistics()['occupied']
+    if users:
+        print(f"✓ {users} usuarios recuperados de {SNAPSHOT_PATH}")
+    return hash_table
+
+
+def close_users(hash_table: HashTable) -> None:
+    """
+    Guarda un checkpoint (snapshot nuevo y log vacío) y cierra el log.
+    
+    Args:
+        hash_table: Tabla hash de usuarios.
+    """
+    if hash_table.wal is None:
+        return
+    try:
+        hash_table.checkpoint()
+    except OSError as e:
+        print(f"✗ No se pudo guardar {SNAPSHOT_PATH}: {e}")
+    hash_table.detach_wal()
+
+
+def make_auth_cache(hash_table: HashTable, entries: int = AUTH_CACHE_ENTRIES,
+                    ttl: float = AUTH_CACHE_TTL) -> Optional[AuthCache]:
+    """
+    Crea la caché de autenticaciones y la suscribe a los cambios de la tabla.
+    
+    Args:
+        hash_table: Tabla hash de usuarios.
+        entries: Entradas máximas (0 = sin caché).
+        ttl: Segundos de validez de cada autenticación.
+    
+    Returns:
+        La caché, o None si entries es 0.
+    """
+    if entries <= 0:
+        return None
+    return AuthCache(max_entries=entries, ttl=ttl).attach(hash_table)
+
+
+def _register_user(hash_table: HashTable, hasher: PasswordHasher) -> None:
+    """
+    Registra un nuevo usuario en el sistema (queda en el write-ahead log).
     
     Args:
         hash_table: Instancia de HashTable para almacenar usuarios.
+        hasher: Calcula el hash de la contraseña.
     """
     username = _get_user_input("Ingrese el nombre de usuario: ")
     if not username:
@@ -88,8 +218,8 @@ def _register_user(hash_table: HashTable) -> None:
     if not password:
         return
     
-    # Registrar nuevo usuario
-    user = User(username, password)
+    # Registrar nuevo usuario (sólo se guarda el hash de la contraseña)
+    user = User(username, hasher.hash(password))
     inserted = hash_table.insert(username, user)
     
     if inserted:
@@ -98,12 +228,98 @@ def _register_user(hash_table: HashTable) -> None:
         print("✗ Error: La tabla hash está llena.")
 
 
-def _authenticate_user(hash_table: HashTable) -> None:
+def _check_password(hash_table: HashTable, hasher: PasswordHasher,
+                    username: str, password: str, cache: Optional[AuthCache] = None) -> bool:
+    """
+    Comprueba la contraseña de un usuario y actualiza su hash si hace falta.
+    
+    Si el usuario no existe se verifica igualmente contra un hash de
+    relleno, para que el tiempo de respuesta no revele qué nombres están
+    registrados. Tras un login correcto, un hash con algoritmo o factor de
+    trabajo antiguos (o una contraseña en claro de versiones anteriores)
+    se reemplaza por uno nuevo.
+    
+    Con caché, un par (usuario, contraseña) verificado hace poco se acepta
+    sin buscarlo ni recalcular el hash.
+    
+    Args:
+        hash_table: Tabla hash de usuarios.
+        hasher: Verifica y calcula los hashes.
+        username: Nombre de usuario.
+        password: Contraseña en claro.
+        cache: Caché de autenticaciones correctas, o None.
+    
+    Returns:
+        True si el usuario existe y la contraseña es correcta.
+    """
+    if cache is not None and cache.check(username, password):
+        return True
+
+    stored_user = hash_table.search(username)
+    if not isinstance(stored_user, User):
+        hasher.verify(password, _dummy_hash(hasher))
+        return False
+
+    record = getattr(stored_user, 'password_hash', None)
+    if record is None:
+        # Usuario guardado por una versión que almacenaba la contraseña
+        legacy = getattr(stored_user, 'password', '')
+        valid = hmac.compare_digest(legacy.encode('utf-8'), password.encode('utf-8'))
+    else:
+        valid = hasher.verify(password, record)
+
+    if valid and (record is None or hasher.needs_upgrade(record)):
+        hash_table.insert(username, User(username, hasher.hash(password)))
+    if valid and cache is not None:
+        cache.put(username, password)
+    return valid
+
+
+# Hash de relleno por configuración de PasswordHasher (ver _check_password)
+_dummy_hashes: dict = {}
+
+
+def _dummy_hash(hasher: PasswordHasher) -> PasswordHash:
+    """
+    Hash de una contraseña aleatoria con el algoritmo y factor del hasher.
+    
+    make_hasher lo calcula al crear el hasher: si se calculase en la primera
+    búsqueda de un usuario inexistente, esa respuesta tardaría el doble y
+    delataría que el nombre no está registrado.
+    
+    Args:
+        hasher: PasswordHasher en uso.
+    
+    Returns:
+        PasswordHash que ninguna contraseña verifica en la práctica.
+    """
+    key = (hasher.algorithm, hasher.work_factor)
+    if key not in _dummy_hashes:
+        _dummy_hashes[key] = hasher.hash(os.urandom(16).hex())
+    return _dummy_hashes[key]
+
+
+def make_hasher() -> PasswordHasher:
+    """
+    Crea el PasswordHasher del sistema con su hash de relleno ya calculado.
+    
+    Returns:
+        PasswordHasher con HASH_WORKERS procesos (ver _dummy_hash).
+    """
+    hasher = PasswordHasher(workers=HASH_WORKERS)
+    _dummy_hash(hasher)
+    return hasher
+
+
+def _authenticate_user(hash_table: HashTable, hasher: PasswordHasher,
+                       cache: Optional[AuthCache] = None) -> None:
     """
     Autentica un usuario existente.
     
     Args:
         hash_table: Instancia de HashTable para buscar usuarios.
+        hasher: Verifica la contraseña.
+        cache: Caché de autenticaciones correctas, o None.
     """
     username = _get_user_input("Ingrese el nombre de usuario: ")
     if not username:
@@ -113,22 +329,193 @@ def _authenticate_user(hash_table: HashTable) -> None:
     if not password:
         return
     
-    # Buscar el usuario en la tabla hash
-    stored_user = hash_table.search(username)
-    
-    # Si se encontró y la contraseña coincide, autenticación correcta
-    if stored_user and isinstance(stored_user, User) and stored_user.password == password:
+    # Buscar el usuario en la tabla hash y verificar el hash de la contraseña
+    if _check_password(hash_table, hasher, username, password, cache):
         print(f"✓ Autenticación exitosa. Bienvenido, {username}.")
     else:
         print("✗ Autenticación fallida. Usuario o contraseña incorrectos.")
 
 
-def _show_statistics(hash_table: HashTable) -> None:
+# -------------------------
+# Modo batch
+# -------------------------
+# Errores de la propia línea (no del resultado de la operación); si hay
+# alguno el programa termina con código 1
+_MALFORMED = ('invalid_json', 'bad_request', 'unknown_op')
+
+
+def run_operation(hash_table: HashTable, hasher: PasswordHasher, request: Any,
+                  cache: Optional[AuthCache] = None) -> Dict[str, Any]:
+    """
+    Ejecuta una operación del modo batch (mismas que auth_server.py).
+    
+    Operaciones: register, authenticate, delete (con la contraseña) y stats.
+    
+    Args:
+        hash_table: Tabla hash de usuarios.
+        hasher: Calcula y verifica los hashes de contraseñas.
+        request: Objeto JSON de la operación.
+        cache: Caché de autenticaciones correctas, o None.
+    
+    Returns:
+        Diccionario con "ok" y, si la operación no se pudo hacer, "error".
+    """
+    if not isinstance(request, dict):
+        return {'ok': False, 'error': 'bad_request'}
+    op = request.get('op')
+    if op == 'stats':
+        response = {'ok': True, 'stats': hash_table.get_statistics()}
+        if cache is not None:
+            response['cache'] = cache.get_statistics()
+        return response
+    if op not in ('register', 'authenticate', 'delete'):
+        return {'ok': False, 'error': 'unknown_op'}
+
+    username = request.get('username')
+    password = request.get('password')
+    if not isinstance(username, str) or not username or not isinstance(password, str) or not password:
+        return {'ok': False, 'error': 'bad_request'}
+
+    if op == 'register':
+        if hash_table.search(username) is not None:
+            return {'ok': False, 'error': 'exists'}
+        if not hash_table.insert(username, User(username, hasher.hash(password))):
+            return {'ok': False, 'error': 'full'}
+        return {'ok': True}
+    if op == 'authenticate':
+        return {'ok': _check_password(hash_table, hasher, username, password, cache)}
+    return {'ok': _check_password(hash_table, hasher, username, password, cache)
+            and hash_table.delete(username)}
+
+
+def run_batch(hash_table: HashTable, hasher: PasswordHasher, lines: Iterator[str],
+              output: IO[str], cache: Optional[AuthCache] = None) -> Dict[str, Any]:
+    """
+    Procesa operaciones en JSON Lines, escribiendo cada resultado al terminarla.
+    
+    Se lee y se escribe línea a línea, así que la memoria no depende del
+    tamaño de la entrada. Cada resultado lleva el número de línea, el "id"
+    de la petición (si tenía), la operación, "ok", "error" si lo hay y "ms".
+    
+    Args:
+        hash_table: Tabla hash de usuarios.
+        hasher: Calcula y verifica los hashes de contraseñas.
+        lines: Líneas de entrada (las vacías se ignoran).
+        output: Flujo en el que escribir los resultados.
+        cache: Caché de autenticaciones correctas, o None.
+    
+    Returns:
+        Resumen: operations, seconds, per_second, ok, failed, malformed y
+        by_op ({op: {'count', 'ok', 'ms'}}).
+    """
+    summary: Dict[str, Any] = {'operations': 0, 'ok': 0, 'failed': 0, 'malformed': 0, 'by_op': {}}
+    clock = time.perf_counter
+    started = clock()
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        op_started = clock()
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+            result: Dict[str, Any] = {'ok': False, 'error': 'invalid_json'}
+        else:
+            result = run_operation(hash_table, hasher, request, cache)
+        elapsed = clock() - op_started
+
+        op = request.get('op') if isinstance(request, dict) else None
+        record: Dict[str, Any] = {'line': number}
+        if isinstance(request, dict) and 'id' in request:
+            record['id'] = request['id']
+        record['op'] = op
+        record.update(result)
+        record['ms'] = round(elapsed * 1000, 3)
+        output.write(json.dumps(record, separators=(',', ':'), default=str) + '\n')
+
+        summary['operations'] += 1
+        if result['ok']:
+            summary['ok'] += 1
+        else:
+            summary['failed'] += 1
+        if result.get('error') in _MALFORMED:
+            summary['malformed'] += 1
+        else:
+            totals = summary['by_op'].setdefault(op, {'count': 0, 'ok': 0, 'ms': 0.0})
+            totals['count'] += 1
+            totals['ok'] += bool(result['ok'])
+            totals['ms'] += elapsed * 1000
+    output.flush()
+
+    summary['seconds'] = clock() - started
+    summary['per_second'] = summary['operations'] / summary['seconds'] if summary['seconds'] else 0.0
+    return summary
+
+
+def _print_summary(summary: Dict[str, Any], stream: IO[str]) -> None:
+    """
+    Muestra el resumen de run_batch.
+    
+    Args:
+        summary: Resumen devuelto por run_batch.
+        stream: Flujo en el que escribir.
+    """
+    print("=" * 70, file=stream)
+    print(f"Operaciones: {summary['operations']} en {summary['seconds']:.2f} s "
+          f"({summary['per_second']:.1f} op/s)", file=stream)
+    print(f"  Correctas: {summary['ok']}  Fallidas: {summary['failed']}  "
+          f"Mal formadas: {summary['malformed']}", file=stream)
+    for op, totals in summary['by_op'].items():
+        average = totals['ms'] / totals['count']
+        print(f"  {op:<13} {totals['count']:>9} op  {totals['ok']:>9} ok  "
+              f"{average:>9.2f} ms/op", file=stream)
+    if 'cache' in summary:
+        cache = summary['cache']
+        print(f"  Caché: {cache['hits']} aciertos, {cache['misses']} fallos "
+              f"({cache['hit_rate']:.1%}), {cache['evictions']} expulsiones", file=stream)
+    print("=" * 70, file=stream)
+
+
+def batch_main(source: str, output_path: Optional[str] = None) -> int:
+    """
+    Modo batch: carga los usuarios, procesa source y guarda un checkpoint.
+    
+    Los mensajes de carga y el resumen van a stderr para que la salida
+    sólo contenga resultados.
+    
+    Args:
+        source: Fichero de operaciones, o '-' para la entrada estándar.
+        output_path: Fichero de resultados; por defecto la salida estándar.
+    
+    Returns:
+        Código de salida: 0, o 1 si alguna línea estaba mal formada.
+    """
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if source == '-' else stack.enter_context(open(source, encoding='utf-8'))
+        output = (sys.stdout if output_path is None
+                  else stack.enter_context(open(output_path, 'w', encoding='utf-8')))
+        with contextlib.redirect_stdout(sys.stderr):
+            hash_table = load_users()
+        hasher = stack.enter_context(make_hasher())
+        cache = make_auth_cache(hash_table)
+        try:
+            summary = run_batch(hash_table, hasher, lines, output, cache)
+        finally:
+            with contextlib.redirect_stdout(sys.stderr):
+                close_users(hash_table)
+    if cache is not None:
+        summary['cache'] = cache.get_statistics()
+    _print_summary(summary, sys.stderr)
+    return 1 if summary['malformed'] else 0
+
+
+def _show_statistics(hash_table: HashTable, cache: Optional[AuthCache] = None) -> None:
     """
-    Muestra las estadísticas de la tabla hash.
+    Muestra las estadísticas de la tabla hash y, si la hay, de la caché.
     
     Args:
         hash_table: Instancia de HashTable.
+        cache: Caché de autenticaciones, o None.
     """
     stats = hash_table.get_statistics()
     print("\n" + "=" * 70)
@@ -139,30 +526,81 @@ def _show_statistics(hash_table: HashTable) -> None:
     print(f"  Vacíos: {stats['empty']}")
     print(f"  Eliminados: {stats['deleted']}")
     print(f"  Factor de carga: {stats['load_factor']:.2%}")
+    print(f"  Probes por búsqueda (media / máx): "
+          f"{stats['avg_probe_length']:.2f} / {stats['max_probe_length']}")
+    if 'key_filter' in stats:
+        key_filter = stats['key_filter']
+        print(f"  Filtro de nombres: {key_filter['memory_bytes']} bytes "
+              f"({key_filter['bits_per_entry']:.1f} bits por usuario), "
+              f"{key_filter['negatives']} búsquedas descartadas")
+        print(f"  Falsos positivos (observados / esperados): "
+              f"{key_filter['observed_false_positive_rate']:.3%} / "
+              f"{key_filter['expected_false_positive_rate']:.3%}")
+    if cache is not None:
+        cache_stats = cache.get_statistics()
+        print(f"  Caché de autenticaciones: {cache_stats['entries']} entradas, "
+              f"{cache_stats['hits']} aciertos / {cache_stats['misses']} fallos "
+              f"({cache_stats['hit_rate']:.1%})")
+        print(f"  Expulsiones LRU / caducadas / invalidadas: {cache_stats['evictions']} / "
+              f"{cache_stats['expirations']} / {cache_stats['invalidations']}")
     print("=" * 70)
 
 
-def main() -> None:
+def _show_pages(show: Callable[..., Optional[int]]) -> None:
+    """
+    Muestra una página de un diagnóstico tras otra mientras el usuario lo pida.
+    
+    Args:
+        show: Método paginado de la tabla (display, show_collisions) que
+              recibe start y devuelve el start de la página siguiente o None.
+    """
+    start = show(start=0)
+    while start is not None:
+        try:
+            answer = input("Enter para la página siguiente, 'q' para volver: ").strip().lower()
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        if answer == 'q':
+            return
+        start = show(start=start)
+
+
+def main(argv: Optional[list] = None) -> None:
     """
     Función principal del programa.
     
     Permite registrar usuarios y autenticar usando una tabla hash
-    implementada con doble hashing y manejo de cursores.
+    implementada con doble hashing y manejo de cursores. Con --batch
+    procesa un fichero de operaciones sin menú (ver batch_main).
+    
+    Args:
+        argv: Argumentos de la línea de órdenes; por defecto sys.argv[1:].
     """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--batch', metavar='OPS',
+                        help="fichero de operaciones en JSON Lines ('-' = entrada estándar)")
+    parser.add_argument('--output', metavar='RESULTADOS',
+                        help='fichero de resultados del modo batch (por defecto la salida estándar)')
+    args = parser.parse_args(argv)
+    if args.batch is not None:
+        sys.exit(batch_main(args.batch, args.output))
+    if args.output is not None:
+        parser.error('--output sólo se usa con --batch')
+
     print("=" * 70)
     print("Sistema de Registro y Autenticación de Usuarios")
     print("Usando Hash Table con Doble Hashing y Cursores")
     print("=" * 70)
 
-    # Tamaño de la tabla hash
-    hash_table_size = 11
-
     try:
-        # Crear instancia de la tabla hash
-        hash_table = HashTable(hash_table_size)
+        # Cargar los usuarios guardados o crear una tabla nueva
+        hash_table = load_users()
     except ValueError as e:
         print(f"Error al inicializar la tabla hash: {e}")
         return
+    hasher = make_hasher()
+    cache = make_auth_cache(hash_table)
 
     # Menú principal del sistema
     while True:
@@ -181,27 +619,29 @@ def main() -> None:
 
             # OPCIÓN 1: Registrar un nuevo usuario
             if option == '1':
-                _register_user(hash_table)
+                _register_user(hash_table, hasher)
 
             # OPCIÓN 2: Autenticación de usuario
             elif option == '2':
-                _authenticate_user(hash_table)
+                _authenticate_user(hash_table, hasher, cache)
 
             # OPCIÓN 3: Mostrar contenido de la tabla hash
             elif option == '3':
-                hash_table.display()
+                _show_pages(hash_table.display)
 
             # OPCIÓN 4: Mostrar estadísticas de la tabla
             elif option == '4':
-                _show_statistics(hash_table)
+                _show_statistics(hash_table, cache)
 
             # OPCIÓN 5: Mostrar análisis de colisiones
             elif option == '5':
-                hash_table.show_collisions()
+                _show_pages(hash_table.show_collisions)
 
             # OPCIÓN 6: Salir del programa
             elif option == '6':
                 print("\nSaliendo del sistema...")
+                close_users(hash_table)
+                hasher.close()
                 print("¡Hasta luego!")
                 break
 
@@ -211,6 +651,8 @@ def main() -> None:
 
         except (EOFError, KeyboardInterrupt):
             print("\n\nOperación cancelada. Saliendo...")
+            close_users(hash_table)
+            hasher.close()
             break
         except Exception as e:
             print(f"\n✗ Error inesperado: {e}")
@@ -0,0 +1,313 @@
+"""
+Almacenamiento de contraseñas con funciones hash lentas (PBKDF2 y scrypt).
+
+Nunca se guarda la contraseña: cada usuario tiene un PasswordHash con el
+algoritmo, el factor de trabajo, una sal aleatoria y el resultado. Ambas
+funciones son caras a propósito (cientos de milisegundos por contraseña),
+así que PasswordHasher las ejecuta en un ProcessPoolExecutor: varias
+verificaciones avanzan en paralelo en distintos núcleos y quien llama
+puede esperar el resultado o recibir un Future.
+
+Factor de trabajo:
+    - pbkdf2_sha256: número de iteraciones de HMAC-SHA256
+    - scrypt: log2 del parámetro de coste N (r=8, p=1)
+
+El factor queda guardado con cada hash. Si se sube el factor del
+PasswordHasher, needs_upgrade() detecta los hashes antiguos y el login
+puede recalcularlos con la contraseña que el usuario acaba de escribir.
+"""
+
+import hashlib
+import hmac
+import os
+import signal
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+PBKDF2_SHA256 = 'pbkdf2_sha256'
+SCRYPT = 'scrypt'
+
+# Factores de trabajo por defecto (recomendaciones de OWASP)
+DEFAULT_WORK_FACTORS = {
+    PBKDF2_SHA256: 600_000,
+    SCRYPT: 17,
+}
+
+SALT_BYTES = 16
+DIGEST_BYTES = 32
+
+# Parámetros fijos de scrypt: tamaño de bloque y paralelismo
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+class PasswordHash:
+    """
+    Hash de una contraseña junto con los parámetros para verificarla.
+
+    Args:
+        algorithm: PBKDF2_SHA256 o SCRYPT.
+        work_factor: Iteraciones (PBKDF2) o log2(N) (scrypt).
+        salt: Sal aleatoria.
+        digest: Resultado de la función hash.
+    """
+
+    __slots__ = ('algorithm', 'work_factor', 'salt', 'digest')
+
+    def __init__(self, algorithm: str, work_factor: int, salt: bytes, digest: bytes):
+        self.algorithm = algorithm
+        self.work_factor = work_factor
+        self.salt = salt
+        self.digest = digest
+
+    def __getstate__(self) -> tuple:
+        return self.algorithm, self.work_factor, self.salt, self.digest
+
+    def __setstate__(self, state: tuple) -> None:
+        self.algorithm, self.work_factor, self.salt, self.digest = state
+
+    def __repr__(self) -> str:
+        return f"PasswordHash(algorithm={self.algorithm}, work_factor={self.work_factor}, digest=***)"
+
+
+def _derive(password: str, algorithm: str, work_factor: int, salt: bytes) -> bytes:
+    """
+    Calcula la función hash lenta.
+
+    Args:
+        password: Contraseña en claro.
+        algorithm: PBKDF2_SHA256 o SCRYPT.
+        work_factor: Factor de trabajo del algoritmo.
+        salt: Sal.
+
+    Returns:
+        DIGEST_BYTES bytes derivados de la contraseña.
+
+    Raises:
+        ValueError: Si el algoritmo no existe.
+    """
+    data = password.encode('utf-8')
+    if algorithm == PBKDF2_SHA256:
+        return hashlib.pbkdf2_hmac('sha256', data, salt, work_factor, DIGEST_BYTES)
+    if algorithm == SCRYPT:
+        n = 1 << work_factor
+        # scrypt necesita unos 128 * r * N bytes; el margen cubre el resto
+        maxmem = 129 * SCRYPT_R * n + (1 << 20)
+        return hashlib.scrypt(data, salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                              maxmem=maxmem, dklen=DIGEST_BYTES)
+    raise ValueError(f"Algoritmo de contraseñas desconocido: {algorithm!r}. "
+                     f"Opciones: {', '.join(DEFAULT_WORK_FACTORS)}")
+
+
+def hash_password(password: str, algorithm: str = PBKDF2_SHA256,
+                  work_factor: Optional[int] = None) -> PasswordHash:
+    """
+    Genera una sal nueva y calcula el hash de la contraseña.
+
+    Args:
+        password: Contraseña en claro.
+        algorithm: PBKDF2_SHA256 o SCRYPT.
+        work_factor: Factor de trabajo; por defecto el de DEFAULT_WORK_FACTORS.
+
+    Returns:
+        PasswordHash listo para guardar.
+
+    Raises:
+        ValueError: Si el algoritmo no existe.
+    """
+    if work_factor is None:
+        if algorithm not in DEFAULT_WORK_FACTORS:
+            raise ValueError(f"Algoritmo de contraseñas desconocido: {algorithm!r}")
+        work_factor = DEFAULT_WORK_FACTORS[algorithm]
+    salt = os.urandom(SALT_BYTES)
+    return PasswordHash(algorithm, work_factor, salt, _derive(password, algorithm, work_factor, salt))
+
+
+def verify_password(password: str, record: PasswordHash) -> bool:
+    """
+    Comprueba una contraseña contra su hash en tiempo constante.
+
+    Args:
+        password: Contraseña en claro.
+        record: Hash guardado.
+
+    Returns:
+        True si la contraseña es correcta.
+    """
+    candidate = _derive(password, record.algorithm, record.work_factor, record.salt)
+    return hmac.compare_digest(candidate, record.digest)
+
+
+def _ignore_interrupts() -> None:
+    """Inicializador del pool: Ctrl+C lo gestiona sólo el proceso principal."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _verify_pair(attempt: Tuple[str, PasswordHash]) -> bool:
+    """verify_password sobre una tupla (contraseña, hash), para pool.map."""
+    return verify_password(*attempt)
+
+
+class PasswordHasher:
+    """
+    Calcula y verifica hashes de contraseñas en un pool de procesos.
+
+    Args:
+        workers: Procesos del pool; None usa os.cpu_count() y 0 calcula en
+                 el propio proceso (sin pool).
+        algorithm: Algoritmo para los hashes nuevos.
+        work_factor: Factor de trabajo para los hashes nuevos; por defecto
+                     el de DEFAULT_WORK_FACTORS.
+
+    Raises:
+        ValueError: Si workers < 0 o el algoritmo no existe.
+    """
+
+    def __init__(self, workers: Optional[int] = None, algorithm: str = PBKDF2_SHA256,
+                 work_factor: Optional[int] = None):
+        """
+        Crea el pool de procesos.
+
+        Args:
+            workers: Procesos del pool (0 = sin pool).
+            algorithm: Algoritmo para los hashes nuevos.
+            work_factor: Factor de trabajo para los hashes nuevos.
+
+        Raises:
+            ValueError: Si workers < 0 o el algoritmo no existe.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 0:
+            raise ValueError(f"workers no puede ser negativo. Recibido: {workers}")
+        if algorithm not in DEFAULT_WORK_FACTORS:
+            raise ValueError(f"Algoritmo de contraseñas desconocido: {algorithm!r}. "
+                             f"Opciones: {', '.join(DEFAULT_WORK_FACTORS)}")
+        self.workers = workers
+        self.algorithm = algorithm
+        self.work_factor = work_factor if work_factor is not None else DEFAULT_WORK_FACTORS[algorithm]
+        self._pool: Optional[ProcessPoolExecutor] = (ProcessPoolExecutor(workers, initializer=_ignore_interrupts)
+                                                       if workers else None)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """
+        Envía fn(*args) al pool, o la ejecuta ya si no hay pool.
+
+        Args:
+            fn: Función de nivel de módulo (serializable).
+            *args: Argumentos de fn.
+
+        Returns:
+            Future con el resultado.
+        """
+        if self._pool is not None:
+            return self._pool.submit(fn, *args)
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    # -------------------------
+    # API con Future
+    # -------------------------
+    def submit_hash(self, password: str) -> Future:
+        """
+        Calcula en el pool el hash de una contraseña nueva.
+
+        Args:
+            password: Contraseña en claro.
+
+        Returns:
+            Future con el PasswordHash.
+        """
+        return self._submit(hash_password, password, self.algorithm, self.work_factor)
+
+    def submit_verify(self, password: str, record: PasswordHash) -> Future:
+        """
+        Verifica en el pool una contraseña.
+
+        Args:
+            password: Contraseña en claro.
+            record: Hash guardado.
+
+        Returns:
+            Future con True si la contraseña es correcta.
+        """
+        return self._submit(verify_password, password, record)
+
+    # -------------------------
+    # API bloqueante
+    # -------------------------
+    def hash(self, password: str) -> PasswordHash:
+        """
+        Calcula el hash de una contraseña nueva (espera al pool).
+
+        Args:
+            password: Contraseña en claro.
+
+        Returns:
+            PasswordHash con el algoritmo y el factor actuales.
+        """
+        return self.submit_hash(password).result()
+
+    def verify(self, password: str, record: PasswordHash) -> bool:
+        """
+        Verifica una contraseña (espera al pool).
+
+        Args:
+            password: Contraseña en claro.
+            record: Hash guardado.
+
+        Returns:
+            True si la contraseña es correcta.
+        """
+        return self.submit_verify(password, record).result()
+
+    def verify_many(self, attempts: Iterable[Tuple[str, PasswordHash]]) -> List[bool]:
+        """
+        Verifica un lote de intentos repartiéndolo entre los procesos.
+
+        Args:
+            attempts: Pares (contraseña, hash guardado).
+
+        Returns:
+            Resultado de cada intento, en el mismo orden.
+        """
+        attempts = list(attempts)
+        if self._pool is None:
+            return [verify_password(password, record) for password, record in attempts]
+        chunksize = max(1, len(attempts) // (self.workers * 4))
+        return list(self._pool.map(_verify_pair, attempts, chunksize=chunksize))
+
+    def needs_upgrade(self, record: PasswordHash) -> bool:
+        """
+        Indica si un hash usa un algoritmo o un factor de trabajo anteriores.
+
+        Args:
+            record: Hash guardado.
+
+        Returns:
+            True si conviene recalcularlo en el próximo login correcto.
+        """
+        return record.algorithm != self.algorithm or record.work_factor < self.work_factor
+
+    def close(self) -> None:
+        """Termina los procesos del pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> 'PasswordHasher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+__all__ = [
+    'PBKDF2_SHA256', 'SCRYPT', 'DEFAULT_WORK_FACTORS', 'PasswordHash', 'PasswordHasher',
+    'hash_password', 'verify_password'
+]